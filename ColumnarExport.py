@@ -0,0 +1,159 @@
+"""
+Desc: Columnar export of author and venue statistics for analytics. Results of the dump scans (venue statistics of
+generateVenueBasedAuthorStats, papers of the topic searches) are written as Parquet or Arrow IPC tables whose author
+and venue columns are dictionary encoded. Arrow files are loaded memory-mapped, without copying the columns, and
+rankings over millions of author-venue rows are computed with vectorized group-bys.
+"""
+
+import logging
+import os
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from CompactProfile import NO_YEAR
+
+
+EXPORT_DIR = os.environ.get('DBLP_EXPORT_DIR', os.path.join(os.getcwd(), 'DataStore', 'exports'))
+
+logger = logging.getLogger(__name__)
+
+
+def _yearOf(year):
+    # Publication year as an integer, NO_YEAR if missing or malformed
+    year = str(year).strip() if year is not None else ''
+    return int(year) if year.isdigit() else NO_YEAR
+
+
+def _dictionaryColumn(values):
+    # Dictionary encoded column of strings (indices in order of first occurrence)
+    codes = dict()
+    indices = np.fromiter((codes.setdefault(value, len(codes)) for value in values), dtype=np.int32)
+    return pa.DictionaryArray.from_arrays(pa.array(indices, type=pa.int32()), pa.array(list(codes), type=pa.string()))
+
+
+"""
+Desc: Table of the venue statistics of authors
+Input: Dictionary author -> list of (venue, year) (see generateVenueBasedAuthorStats)
+Output: Arrow table with the columns author and venue (dictionary encoded) and year (int16, NO_YEAR if missing), one
+row per paper of an author
+"""
+
+
+def venueStatsTable(author_hist_dict):
+
+    authors = list(author_hist_dict.keys())
+    lengths = np.fromiter((len(author_hist_dict[author]) for author in authors), dtype=np.int64, count=len(authors))
+    author_column = pa.DictionaryArray.from_arrays(
+        pa.array(np.repeat(np.arange(len(authors), dtype=np.int32), lengths), type=pa.int32()),
+        pa.array(authors, type=pa.string()))
+    venue_column = _dictionaryColumn(venue for author in authors for venue, _ in author_hist_dict[author])
+    years = np.fromiter((_yearOf(year) for author in authors for _, year in author_hist_dict[author]),
+                        dtype=np.int16, count=int(lengths.sum()))
+    return pa.table({'author': author_column, 'venue': venue_column, 'year': pa.array(years, type=pa.int16())})
+
+
+"""
+Desc: Table of the papers found by a topic search
+Input: Dictionaries title -> venue and title -> set of authors (see searchDBLPAuthors), optional dictionary title -> set
+of keywords (see searchDBLPAuthorsByKeywords)
+Output: Arrow table with the columns author, venue and title (dictionary encoded), one row per author of a paper, and
+keywords (list of strings) if the keywords are given
+"""
+
+
+def candidatePapersTable(title_venue_dict, title_authors_dict, title_keywords_dict=None):
+
+    rows = [(title, author) for title in title_authors_dict for author in sorted(title_authors_dict[title])]
+    columns = {'author': _dictionaryColumn(author for _, author in rows),
+               'venue': _dictionaryColumn(title_venue_dict[title] for title, _ in rows),
+               'title': _dictionaryColumn(title for title, _ in rows)}
+    if title_keywords_dict is not None:
+        columns['keywords'] = pa.array([sorted(title_keywords_dict[title]) for title, _ in rows],
+                                       type=pa.list_(pa.string()))
+    return pa.table(columns)
+
+
+"""
+Desc: Write a table, as Parquet if the path ends with .parquet and as an uncompressed Arrow IPC file otherwise (the
+format loaded memory-mapped without copy)
+Input: Arrow table, path of the file
+Output: Path of the file
+"""
+
+
+def writeTable(table, path):
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = path + '.tmp'
+    if path.endswith('.parquet'):
+        pq.write_table(table, temp_path, compression='zstd', use_dictionary=True)
+    else:
+        with pa.OSFile(temp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    os.replace(temp_path, path)
+    logger.info("Wrote %d rows to %s", table.num_rows, path)
+    return path
+
+
+"""
+Desc: Read a table written by writeTable. Arrow files are memory-mapped: the columns point into the file and are only
+paged in when used.
+Input: Path of the file
+Output: Arrow table
+"""
+
+
+def readTable(path):
+
+    if path.endswith('.parquet'):
+        return pq.read_table(path, memory_map=True)
+    return pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+
+
+"""
+Desc: Load a table written by writeTable into a DataFrame. Dictionary columns become categoricals sharing the
+dictionary, and numeric columns of Arrow files reference the mapped file instead of being copied.
+Input: Path of the file
+Output: pandas DataFrame
+"""
+
+
+def loadDataFrame(path):
+
+    return readTable(path).to_pandas(split_blocks=True)
+
+
+"""
+Desc: Rank the authors of a venue statistics table
+Input: DataFrame or Arrow table of venueStatsTable or candidatePapersTable, optional range of years (inclusive)
+Output: DataFrame indexed by author with the columns papers, venues (number of distinct venues), first_year and
+last_year (if the table has years), sorted by papers and venues, descending
+"""
+
+
+def rankAuthors(data, first_year=None, last_year=None):
+
+    frame = data.to_pandas(split_blocks=True) if isinstance(data, pa.Table) else data
+    if 'year' in frame.columns and (first_year is not None or last_year is not None):
+        years = frame['year']
+        keep = (years != NO_YEAR) & (years >= (first_year or 0)) & (years <= (last_year or np.iinfo(years.dtype).max))
+        frame = frame[keep]
+    aggregations = {'papers': ('venue', 'size'), 'venues': ('venue', 'nunique')}
+    if 'year' in frame.columns:
+        aggregations['first_year'] = ('year', 'min')
+        aggregations['last_year'] = ('year', 'max')
+    ranking = frame.groupby('author', observed=True, sort=False).agg(**aggregations)
+    return ranking.sort_values(['papers', 'venues'], ascending=False, kind='stable')
+
+
+"""
+Desc: Export the venue statistics of all authors (see generateVenueBasedAuthorStats)
+Input: Dictionary author -> list of (venue, year), name of the file in EXPORT_DIR (or path)
+Output: Path of the file
+"""
+
+
+def exportVenueStats(author_hist_dict, file_name='venue_stats.arrow'):
+
+    return writeTable(venueStatsTable(author_hist_dict), os.path.join(EXPORT_DIR, file_name))
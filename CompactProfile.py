@@ -0,0 +1,170 @@
+"""
+Desc: Compact in-memory representation of the coauthor profile of a DBLP author. Names are interned to integer ids
+in a string table shared by all profiles, years are kept as small integers and the coauthor histograms live in flat
+arrays of (year, count) pairs, so the profiles of a whole candidate pool fit in memory.
+"""
+
+import threading
+from array import array
+
+
+NO_YEAR = 0  # stored for a paper whose year element is empty
+
+
+"""
+Desc: Table interning names to integer ids. Each distinct name is stored once, whatever the number of profiles
+referring to it. Profiles are parsed in several threads at once, so new names are added under a lock. The table only
+grows: an id must stay valid as long as any profile, conflict matrix or selection graph refers to it, so the names of
+profiles evicted from the caches are kept (one string per distinct name seen by the process, reported as
+dblp_name_table_entries on /metrics).
+"""
+
+
+class NameTable:
+
+    def __init__(self):
+        self._ids = dict()  # name -> id
+        self._names = []  # id -> name
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._names)
+
+    """
+    Desc: Id of a name, added to the table if it is new
+    """
+
+    def intern(self, name):
+
+        name_id = self._ids.get(name)
+        if name_id is None:
+            with self._lock:
+                name_id = self._ids.get(name)  # added by another thread in the meantime
+                if name_id is None:
+                    name_id = len(self._names)
+                    self._names.append(name)
+                    self._ids[name] = name_id
+        return name_id
+
+    """
+    Desc: Id of a name, or None if the name is not in the table
+    """
+
+    def lookup(self, name):
+
+        return self._ids.get(name)
+
+    """
+    Desc: Name of an id
+    """
+
+    def name(self, name_id):
+
+        return self._names[name_id]
+
+
+name_table = NameTable()  # shared by all profiles of the process
+
+
+def _yearToInt(year):
+    return int(year) if year else NO_YEAR
+
+
+def _yearToStr(year):
+    return str(year) if year != NO_YEAR else None
+
+
+"""
+Desc: Coauthor profile of a DBLP author (see readAuthorDBLP) in compact form. The coauthors are kept in order of
+first appearance; the histogram of coauthor i is years[offsets[i]:offsets[i + 1]] with the matching counts.
+Input: Profile tuple returned by readAuthorDBLP, name table (the shared one by default)
+"""
+
+
+class CompactProfile:
+
+    __slots__ = ('table', 'person_name', 'names', 'coauthors', 'offsets', 'years', 'counts', 'years_of_pub',
+                 'affiliations')
+
+    def __init__(self, profile, table=name_table):
+        person_file_name, person_name_set, cauthor_hist_dict, _, year_set, coauthor_set, affl_set = profile
+        self.table = table
+        self.person_name = person_file_name
+        self.names = array('i', sorted(table.intern(name) for name in person_name_set))
+        self.coauthors = array('i')
+        self.offsets = array('I', [0])
+        self.years = array('H')
+        self.counts = array('I')
+        for coauthor, hist in cauthor_hist_dict.items():
+            self.coauthors.append(table.intern(coauthor))
+            for year, count in hist:
+                self.years.append(_yearToInt(year))
+                self.counts.append(count)
+            self.offsets.append(len(self.years))
+        # Names in coauthor_set are the keys of cauthor_hist_dict, so only the years of publication are kept apart
+        self.years_of_pub = array('H', sorted(_yearToInt(year) for year in year_set))
+        self.affiliations = tuple(affl_set)
+
+    def __len__(self):
+        return len(self.coauthors)
+
+    """
+    Desc: Histogram of a coauthor
+    Input: Coauthor name (lower case, unidecoded)
+    Output: List of (year, frequency) as in readAuthorDBLP, empty if the name is not a coauthor
+    """
+
+    def coauthorHistory(self, coauthor):
+
+        name_id = self.table.lookup(coauthor)
+        if name_id is None or name_id not in self.coauthors:
+            return []
+        i = self.coauthors.index(name_id)
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return [(_yearToStr(self.years[k]), self.counts[k]) for k in range(start, end)]
+
+    """
+    Desc: Size of the arrays of the profile in bytes (the shared name table is not included)
+    """
+
+    def nbytes(self):
+
+        return sum(a.itemsize * len(a) for a in (self.names, self.coauthors, self.offsets, self.years, self.counts,
+                                                 self.years_of_pub))
+
+    def _histories(self):
+        for i, name_id in enumerate(self.coauthors):
+            start, end = self.offsets[i], self.offsets[i + 1]
+            yield self.table.name(name_id), \
+                [(_yearToStr(self.years[k]), self.counts[k]) for k in range(start, end)], \
+                sum(self.counts[start:end])
+
+    """
+    Desc: Expand the profile into the tuple returned by readAuthorDBLP (new containers on every call)
+    """
+
+    def toTuple(self):
+
+        cauthor_hist_dict = dict()
+        cauthor_freq_dict = dict()
+        for coauthor, hist, freq in self._histories():
+            cauthor_hist_dict[coauthor] = hist
+            cauthor_freq_dict[coauthor] = freq
+        return self.person_name, {self.table.name(name_id) for name_id in self.names}, cauthor_hist_dict, \
+            cauthor_freq_dict, {_yearToStr(year) for year in self.years_of_pub}, set(cauthor_hist_dict.keys()), \
+            set(self.affiliations)
+
+    """
+    Desc: JSON shape of the /dblp route
+    Output: Dictionary with the person name, coauthor histogram, years of publication and coauthors
+    """
+
+    def toResponse(self):
+
+        coauthor_hist = {coauthor: hist for coauthor, hist, _ in self._histories()}
+        return {
+            "person_name": self.person_name,
+            "coauthor_hist": coauthor_hist,
+            "years_of_publication": [_yearToStr(year) for year in self.years_of_pub],
+            "coauthors": list(coauthor_hist.keys())
+        }
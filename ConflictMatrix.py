@@ -0,0 +1,114 @@
+"""
+Desc: Conflict-of-interest matrix of a candidate pool. The coauthor histograms of the candidates (CompactProfile) are
+turned into a sparse candidate-by-name matrix of coauthored papers, and the names of the candidates into a sparse
+name-by-candidate incidence matrix; their product counts the papers each pair of candidates wrote together, for the
+whole pool in one sparse matrix multiplication.
+"""
+
+import numpy as np
+from scipy import sparse
+from CompactProfile import name_table, NO_YEAR
+from NameNormalizer import canonicalName
+
+
+def _concat(arrays, dtype):
+    # Concatenate array.array objects into one NumPy array without per-element conversion
+    parts = [np.frombuffer(a, dtype=dtype) for a in arrays if len(a) > 0]
+    return np.concatenate(parts) if parts else np.zeros(0, dtype=dtype)
+
+
+"""
+Desc: Candidate-by-name matrix of coauthored papers
+Input: List of CompactProfile, first and last year of the window (None for no bound), name table of the profiles,
+number of name columns (the size of the table by default; names interned later are left out)
+Output: CSR matrix whose entry (i, k) is the number of papers candidate i wrote with name k in the window
+"""
+
+
+def coauthorIncidence(profiles, first_year=None, last_year=None, table=name_table, n=None):
+
+    n = len(table) if n is None else n
+
+    years = _concat([p.years for p in profiles], np.uint16)
+    counts = _concat([p.counts for p in profiles], np.uint32).astype(np.int64)
+    names = _concat([np.repeat(np.frombuffer(p.coauthors, dtype=np.int32), np.diff(np.frombuffer(p.offsets,
+                     dtype=np.uint32))) for p in profiles if len(p) > 0], np.int32)
+    rows = np.repeat(np.arange(len(profiles)), [len(p.years) for p in profiles])
+
+    mask = names < n
+    if first_year is not None or last_year is not None:
+        mask &= years != NO_YEAR
+        if first_year is not None:
+            mask &= years >= int(first_year)
+        if last_year is not None:
+            mask &= years <= int(last_year)
+    rows, names, counts = rows[mask], names[mask], counts[mask]
+
+    # entries of the same (candidate, name) in different years are summed
+    return sparse.csr_matrix((counts, (rows, names)), shape=(len(profiles), n))
+
+
+"""
+Desc: Name-by-candidate incidence matrix: the DBLP names of each candidate and, optionally, the names under which
+the candidates are known otherwise (e.g., the NAME column of Candidate_Rec)
+Input: List of CompactProfile, list of additional names (one per candidate, may be None), name table of the profiles,
+number of name rows (the size of the table by default; names interned later are left out)
+Output: CSR matrix whose entry (k, j) is 1 if name k denotes candidate j
+"""
+
+
+def candidateIncidence(profiles, candidate_names=None, table=name_table, n=None):
+
+    n = len(table) if n is None else n
+    rows = []
+    cols = []
+    for j, profile in enumerate(profiles):
+        name_ids = set(profile.names)
+        if candidate_names is not None and candidate_names[j]:
+            name_id = table.lookup(canonicalName(candidate_names[j]))
+            if name_id is not None:  # a name nobody coauthored with cannot cause a conflict
+                name_ids.add(name_id)
+        name_ids = [name_id for name_id in name_ids if name_id < n]
+        rows.extend(name_ids)
+        cols.extend([j] * len(name_ids))
+
+    return sparse.csr_matrix((np.ones(len(rows), dtype=np.int64), (rows, cols)), shape=(n, len(profiles)))
+
+
+"""
+Desc: Conflict matrix of a candidate pool
+Input: List of CompactProfile (one per candidate), list of additional candidate names, first and last year of the
+window, minimum number of joint papers for a conflict
+Output: Symmetric CSR matrix whose entry (i, j) is the number of papers candidates i and j wrote together (the larger
+of the counts seen from either profile); pairs below min_papers and the diagonal are left out
+"""
+
+
+def conflictMatrix(profiles, candidate_names=None, first_year=None, last_year=None, min_papers=1):
+
+    # The shared name table may grow while the matrices are built (names interned by other requests): both sides are
+    # sized by the same snapshot of the table, and names interned after it cannot belong to the given profiles
+    n = len(name_table)
+    coauthors = coauthorIncidence(profiles, first_year, last_year, n=n)
+    papers = coauthors @ candidateIncidence(profiles, candidate_names, n=n)
+    papers = papers.maximum(papers.T).tocsr()  # profiles of the two candidates may disagree (e.g., false positives)
+    # every candidate is among the coauthors of its own papers
+    papers = papers - sparse.diags(papers.diagonal(), dtype=papers.dtype)
+    papers.data[papers.data < min_papers] = 0
+    papers.eliminate_zeros()
+    return papers
+
+
+"""
+Desc: Conflicts of every candidate
+Input: Conflict matrix (see conflictMatrix)
+Output: List (one entry per candidate) of lists of (index of conflicting candidate, number of joint papers)
+"""
+
+
+def conflictLists(matrix):
+
+    matrix = matrix.tocsr()
+    return [list(zip(matrix.indices[matrix.indptr[i]:matrix.indptr[i + 1]].tolist(),
+                     matrix.data[matrix.indptr[i]:matrix.indptr[i + 1]].tolist()))
+            for i in range(matrix.shape[0])]
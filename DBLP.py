@@ -3,19 +3,35 @@ Author: SOURAV S BHOWMICK
 Desc: Procedures to read data from DBLP.
 """
 
-from urllib.request import urlopen
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 # import accents
-from unidecode import unidecode
 import xml.etree.ElementTree as ETree
 from collections import Counter
 from lxml import etree
 import time
+from io import BytesIO
 import os
-import pandas as pd
-# import reviewerStore as SancusDB
+import logging
+import reviewerStore as SancusDB
 # import ClosetIO
-import gc
+import hashlib
+from DBLPScan import runScan, AuthorSetQuery, KeywordSearchQuery, MultiKeywordSearchQuery, ProceedingsQuery, \
+    VenueAuthorStatsQuery, HomonymousAuthorsQuery
+from DBLPIndex import indexAvailable, indexedDBLPAuthors, indexedSearchDBLPAuthors, indexedKeywordsSearch, \
+    indexedProceedings, indexedVenueAuthorStats, indexedHomonymousAuthors
+from MemoCache import LRUCache
+from CompactProfile import CompactProfile
+from TitleMatcher import TitleSet, normalizeTitle
+from NameNormalizer import canonicalName, splitHomonym
+from ColumnarExport import writeTable, candidatePapersTable
+from VenueScoring import loadVenueList, VenueIndex, rankCandidates
+from ProfileStore import profile_store, filterFingerprint
+from DBLPCache import cache as page_cache
+from Metrics import configureLogging, span, stage_seconds, bytes_downloaded, pages_fetched, records_parsed
+from RateLimit import limiter
+from DBLPFetcher import FETCH_TIMEOUT, CONNECT_TIMEOUT, FETCH_RETRIES, FETCH_BACKOFF, MAX_CONCURRENCY, RETRY_STATUS
 
 
 """
@@ -42,7 +58,51 @@ def xmlifyAdd(add):
 
 
 """
-Desc: Connect to the XML version of a DBLP page
+Desc: Create a keep-alive session for synchronous access to DBLP, with the same retry policy as DBLPFetcher.
+"""
+
+
+def createDBLPSession():
+
+    session = requests.Session()
+    # 429 is left to requestDBLPPage so that the Retry-After pause is shared through the rate limiter
+    retry = Retry(total=FETCH_RETRIES, backoff_factor=FETCH_BACKOFF, status_forcelist=sorted(RETRY_STATUS - {429}),
+                  allowed_methods=['GET'], raise_on_status=False, respect_retry_after_header=False)
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=MAX_CONCURRENCY, pool_maxsize=MAX_CONCURRENCY)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+logger = logging.getLogger(__name__)
+session = createDBLPSession()  # shared by the synchronous procedures below
+profile_cache = LRUCache(int(os.environ.get('DBLP_PROFILE_CACHE_SIZE', '1024')), 'author_profiles')
+venue_index_cache = LRUCache(4, 'venue_indexes')  # VenueIndex per venue-list version and dump
+
+
+"""
+Desc: GET a DBLP page through the rate limiter. A 429 response pauses all DBLP requests for the Retry-After period
+before the page is requested again.
+"""
+
+
+def requestDBLPPage(add, headers=None):
+
+    attempt = 0
+    while True:
+        limiter.acquire()  # respect the rate limit of DBLP
+        request = session.get(add, headers=headers, timeout=(CONNECT_TIMEOUT, FETCH_TIMEOUT))
+        if request.status_code != 429:
+            limiter.reward()
+            return request
+        limiter.penalize(request.headers.get('Retry-After'))
+        if attempt >= FETCH_RETRIES:
+            return request
+        attempt = attempt + 1
+
+
+"""
+Desc: Connect to the XML version of a DBLP page (through the on-disk page cache)
 Input: Web address of XML DBLP page
 Output: If successful, return the entire XML file string
 """
@@ -50,111 +110,288 @@ Output: If successful, return the entire XML file string
 
 def connectToDBLPPage(add):
 
+    my_file = page_cache.fresh(add)  # served from the on-disk cache while younger than its TTL
+    if my_file is not None:
+        pages_fetched.inc(outcome='cached')
+        return my_file
     my_file = ''
-    request = requests.get(add)
+    with span('fetch'):
+        try:
+            request = requestDBLPPage(add, page_cache.validators(add))
+            if request.status_code == 304:  # not modified since it was cached
+                cached_file = page_cache.revalidated(add)
+                if cached_file is not None:
+                    pages_fetched.inc(outcome='revalidated')
+                    return cached_file
+                request = requestDBLPPage(add)
+        except requests.RequestException as err:
+            logger.warning('Web page %s could not be reached: %s', add, err)
+            pages_fetched.inc(outcome='error')
+            return my_file
     if request.status_code == 200:
-        print('Web page', add,  'exists.')
-        f = urlopen(add)
-        my_file = f.read()
+        logger.debug('Web page %s exists.', add)
+        my_file = request.content
+        pages_fetched.inc(outcome='downloaded')
+        bytes_downloaded.inc(len(my_file))
+        page_cache.store(add, my_file, request.headers.get('ETag'), request.headers.get('Last-Modified'))
     else:
-        print('Web page', add, 'does not exist!')
+        logger.warning('Web page %s does not exist!', add)
+        pages_fetched.inc(outcome='missing')
 
     return my_file
 
 
 """
-Desc: Extract all coauthor information of a DBLP author (excluding those papers in the white list).
+Desc: Extract all coauthor information of a DBLP author (excluding those papers in the white list, matched by
+normalized title).
 Input: XML file string, white list details
 Output: Name of author, set of names in DBLP, aggregated dictionary coauthor name -> list of (year, frequency), 
 coauthor name -> total frequency.
  Set of all coauthors. Set of all years of publications
+Parsed profiles are memoized in profile_cache (see readAuthorProfile).
 """
 
 
 def readAuthorDBLP(xml_file, title_year_dict, title_venue_dict, dblp_url_dict, r_dblp):
 
+    # The compact profile is expanded into new containers, so callers cannot alter the cached profile
+    return readAuthorProfile(xml_file, title_venue_dict, dblp_url_dict, r_dblp).toTuple()
+
+
+"""
+Desc: Coauthor information of a DBLP author as a CompactProfile (names interned, histograms in arrays).
+Profiles are memoized in profile_cache, keyed by the content hash of the XML file, the white list titles
+and the false positive URLs of the author.
+Input: XML file string, white list details
+Output: CompactProfile
+"""
+
+
+def readAuthorProfile(xml_file, title_venue_dict, dblp_url_dict, r_dblp):
+
+    # Identical content with identical white list and false positives always yields the same profile
+    false_positives = dblp_url_dict[r_dblp] if r_dblp in dblp_url_dict.keys() else ()
+    if isinstance(xml_file, str):
+        xml_file = xml_file.encode('utf-8')
+    key = (hashlib.sha256(xml_file).digest(), frozenset(title_venue_dict.keys()), frozenset(false_positives))
+    profile = profile_cache.get(key)
+    if profile is None:
+        profile_tuple = parseAuthorDBLP(xml_file, title_venue_dict, dblp_url_dict, r_dblp)
+        with span('compact'):
+            profile = CompactProfile(profile_tuple)
+        profile_cache.put(key, profile)
+    return profile
+
+
+"""
+Desc: Parse the coauthor information of a DBLP author without consulting the profile cache (see readAuthorDBLP).
+"""
+
+
+def parseAuthorDBLP(xml_file, title_venue_dict, dblp_url_dict, r_dblp):
+
+    return parsePersonDBLP(xml_file, ('coauthor',), title_venue_dict=title_venue_dict, dblp_url_dict=dblp_url_dict,
+                           r_dblp=r_dblp)['coauthor']
+
+
+"""
+Desc: Aggregate a dictionary key -> list of years into key -> list of (year, frequency) and key -> total frequency.
+"""
+
+
+def aggregateYearHistory(key_year_dict):
+
+    key_hist_dict = dict()
+    key_freq_dict = dict()
+    for key in key_year_dict:
+        agg_year = Counter(key_year_dict[key])
+        key_hist_dict[key] = list(agg_year.items())
+        key_freq_dict[key] = len(key_year_dict[key])
+
+    return key_hist_dict, key_freq_dict
+
+
+PERSON_VIEWS = ('coauthor', 'venue', 'disamb', 'record')  # result shapes produced by parsePersonDBLP
+
+
+"""
+Desc: Single streaming pass over the XML file of a DBLP person page. Every r element is processed as soon as it has
+been read and is then discarded, so the page is never held in memory as a whole.
+Input: XML file string, the views to produce, and the inputs those views need: white list titles and false positive
+URLs for 'coauthor' (see readAuthorDBLP), the quality venue set for 'venue' (see getQualityVenuePublications).
+'disamb' and 'record' take no input (see readDisambDBLP and readRecordsDBLP).
+Output: Dictionary view -> tuple returned by readAuthorDBLP, getQualityVenuePublications, readDisambDBLP or
+readRecordsDBLP.
+"""
+
+
+def parsePersonDBLP(xml_file, views=PERSON_VIEWS, title_venue_dict=None, dblp_url_dict=None, r_dblp=None,
+                    quality_venue_set=None):
+
+    coauthor_view = 'coauthor' in views
+    venue_view = 'venue' in views
+    disamb_view = 'disamb' in views
+    record_view = 'record' in views
+    white_list = TitleSet(title_venue_dict.keys() if title_venue_dict is not None else ())  # normalized titles
+    false_positives = dblp_url_dict[r_dblp] if dblp_url_dict is not None and r_dblp in dblp_url_dict.keys() else ()
+    quality_venue_set = quality_venue_set if quality_venue_set is not None else set()
+
     cauthor_year_dict = dict()  # Dictionary coauthor name -> list of years of publication
-    cauthor_hist_dict = dict()  # aggregated dictionary coauthor name -> list of (year, frequency)
-    cauthor_freq_dict = dict()  # Dictionary coauthor name -> total frequency
-    temp_author_set = set()  # set of co-authors of an author
     year_set = set()  # set of all years of publications
     coauthor_set = set()  # Set of all co-authors. Some co-authors may appear multiple times due to homonyms.
-    affl_set = set()  # Stores affiliations of the author
+    affl_set = set()  # Stores affiliations of the author (first part, lower case)
+    full_affl_set = set()  # Stores affiliations of the author (as in DBLP)
     person_name_set = set()  # set of DBLP names of the person
-
-    root = ETree.fromstring(xml_file)
-    records = root.findall(".//r")  # Extract all r elements in DBLP
-    person_file_name = (root.attrib['name']).lower()  # Get name of the author in DBLP
-    person_file_name = unidecode(person_file_name)
-    author = root.find(".//person")  # Get the first person element (contains affiliation information)
-    if author is None:
-        print("XML content for ", person_file_name, "is missing!")
-        return person_file_name, person_name_set, cauthor_hist_dict, cauthor_freq_dict, \
-            year_set, coauthor_set, affl_set
-
-    # The person element contains notes elements (affiliation info)
-    notes = list(author)
-    for note in notes:  # Get affiliations
-        if note.tag == "note":
-            if note.attrib['type'] == 'affiliation':
-                affl = note.text.split(',')[0]
-                affl_set.add(affl.lower())
-        if note.tag == "author":
-            person_name_set.add(unidecode(note.text.lower()))
-
-    print("Name identifier in DBLP: ", person_file_name)
-    print("Set of all names: ", person_name_set)
-    print("Affiliations: ", affl_set)
-
-    for record in records:  # scan all r elements in the XML
-        # list of papers
-        papers = list(record)
-        for paper in papers:
-            white_list_match = 0  # set to 1 if a paper title matches a white paper
-            false_positive_flag = 0  # set to 1 if a paper is erroneously assigned to the author
-            year_flag = 'unseen'  # set to seen if year element is encountered
-            # authors, year, etc. of a paper
-            info = list(paper)
-            for item in info:
-                if len(title_venue_dict) > 0:  # white list is available
-                    if item.tag == "title":
-                        if item.text in title_venue_dict.keys():  # check if the paper is in white list
-                            print("White paper detected:", item.text)
+    venue_year_dict = dict()  # Dictionary venue name -> list of years of publication
+    venue_year_set = set()  # set of all years of quality-venue publications
+    d_coauthor_set = set()  # Set of all co-authors of all papers (disambiguation page)
+    title_year_dict = dict()  # title->year map
+    title_coauthor_dict = dict()  # title->co-author set map
+    records = []  # (url, title, year, co-authors, key, mdate) of every paper
+
+    if isinstance(xml_file, str):
+        xml_file = xml_file.encode('utf-8')
+    root = None
+    person_file_name = ''
+    person_found = False
+    a_year = None  # year and title of the last paper that had one
+    p_title = None
+    paper_count = 0
+    debug = logger.isEnabledFor(logging.DEBUG)  # checked once, not for every paper
+    parse_start = time.perf_counter()
+
+    for _, elem in etree.iterparse(BytesIO(xml_file), events=('end',)):
+        if root is None:  # the root element (dblpperson) is open as soon as the first element ends
+            root = elem
+            while root.getparent() is not None:
+                root = root.getparent()
+            person_file_name = canonicalName(root.attrib['name'])  # Get name of the author in DBLP
+
+        if elem.tag == 'person' and not person_found:  # the first person element contains affiliation information
+            person_found = True
+            for note in elem:
+                if note.tag == "note" and note.attrib.get('type') == 'affiliation':
+                    affl_set.add(note.text.split(',')[0].lower())
+                    full_affl_set.add(note.text)
+                if note.tag == "author":
+                    person_name_set.add(canonicalName(note.text))
+
+        elif elem.tag == 'r':  # list of papers
+            for paper in elem:
+                paper_count = paper_count + 1
+                white_list_match = 0  # set to 1 if a paper title matches a white paper
+                false_positive_flag = 0  # set to 1 if a paper is erroneously assigned to the author
+                quality_venue_match = 0  # set to 1 when the venue is a quality venue
+                year_flag = 'unseen'  # set to seen if year element is encountered
+                paper_author_set = set()  # set of co-authors of the paper
+                p_url = None  # url and title of the paper as in DBLP
+                r_title = None
+                for item in paper:  # authors, year, etc. of a paper
+                    tag = item.tag
+                    if tag == "author":
+                        paper_author_set.add(canonicalName(item.text))
+                    elif tag == "year":
+                        year_flag = 'seen'  # year element is visited
+                        a_year = item.text
+                    elif tag == "title":
+                        if coauthor_view and len(white_list) > 0 and item.text in white_list:
+                            if debug:
+                                logger.debug("White paper detected: %s", item.text)
                             white_list_match = 1
-                if item.tag == "author":
-                    temp_author_set.add(unidecode(item.text.lower()))
-                if item.tag == "year":
-                    year_flag = 'seen'  # year element is visited
-                    a_year = item.text
-                if item.tag == "url":
-                    # false positive article
-                    if r_dblp in dblp_url_dict.keys() and item.text in dblp_url_dict[r_dblp]:
-                        print("Paper to exclude due to false positive:", item.text)
-                        false_positive_flag = 1
-            # only consider paper information if it is not in the white paper list or false positive list
-            if white_list_match == 0 and year_flag == 'seen' and false_positive_flag == 0:
-                year_set.add(a_year)
-                for author in temp_author_set:  # generate set of co-authors
-                    coauthor_set.add(unidecode(author.lower()))
-                    if author not in cauthor_year_dict.keys():  # generate co-authorship history dictionary
-                        cauthor_year_dict[author] = [a_year]
+                        if disamb_view:
+                            p_title = normalizeTitle(str(item.text))
+                        r_title = item.text
+                    elif tag == "url":
+                        p_url = item.text
+                        if coauthor_view and item.text in false_positives:  # false positive article
+                            if debug:
+                                logger.debug("Paper to exclude due to false positive: %s", item.text)
+                            false_positive_flag = 1
+                    elif tag == "booktitle" or tag == "journal":
+                        if venue_view and item.text in quality_venue_set:  # check if the paper is in venue list
+                            quality_venue_match = 1
+                            venue_title = item.text
+
+                # only consider paper information if it is not in the white paper list or false positive list
+                if coauthor_view and white_list_match == 0 and year_flag == 'seen' and false_positive_flag == 0:
+                    year_set.add(a_year)
+                    for author in paper_author_set:  # generate set of co-authors (names are already canonical)
+                        coauthor_set.add(author)
+                        if author not in cauthor_year_dict.keys():  # generate co-authorship history dictionary
+                            cauthor_year_dict[author] = [a_year]
+                        else:
+                            cauthor_year_dict[author].append(a_year)
+
+                # only consider paper information if it is in quality venue
+                if venue_view and quality_venue_match == 1 and year_flag == 'seen':
+                    venue_year_set.add(a_year)
+                    if venue_title not in venue_year_dict.keys():  # generate quality venue history dictionary
+                        venue_year_dict[venue_title] = [a_year]
                     else:
-                        cauthor_year_dict[author].append(a_year)
-            temp_author_set.clear()
-
-    """ Generate aggregated temporal history of collaboration"""
-    for key in cauthor_year_dict:
-        agg_year = Counter(cauthor_year_dict[key])
-        freq = 0
-        for (y, c) in agg_year.items():
-            freq = freq + c
-            if key not in cauthor_hist_dict.keys():
-                cauthor_hist_dict[key] = [(y, c)]
-            else:
-                cauthor_hist_dict[key].append((y, c))
-        cauthor_freq_dict[key] = freq
-
-    return person_file_name, person_name_set, cauthor_hist_dict, cauthor_freq_dict, year_set, coauthor_set, affl_set
+                        venue_year_dict[venue_title].append(a_year)
+
+                if disamb_view:
+                    for author in paper_author_set:
+                        d_coauthor_set.add(author)
+                        if p_title not in title_coauthor_dict.keys():  # create title-> authors map
+                            title_coauthor_dict[p_title] = {author}
+                        else:
+                            title_coauthor_dict[p_title].add(author)
+                    if p_title not in title_year_dict.keys():  # create title -> year of pub map
+                        title_year_dict[p_title] = {a_year}
+                    else:
+                        title_year_dict[p_title].add(a_year)
+
+                if record_view:
+                    records.append((p_url, r_title, a_year if year_flag == 'seen' else None,
+                                    frozenset(paper_author_set), paper.get('key'), paper.get('mdate')))
+
+        if elem.getparent() is root:  # discard every processed child of dblpperson
+            elem.clear()
+            while elem.getprevious() is not None:
+                del root[0]
+
+    aggregate_start = time.perf_counter()
+    stage_seconds.observe(aggregate_start - parse_start, stage='parse')
+    records_parsed.inc(paper_count, source='page')
+    results = dict()
+    if not person_found:
+        logger.warning("XML content for %s is missing!", person_file_name)
+        if coauthor_view:
+            results['coauthor'] = (person_file_name, set(), dict(), dict(), set(), set(), set())
+        if venue_view:
+            results['venue'] = (person_file_name, dict(), dict(), set())
+        if disamb_view:
+            results['disamb'] = (person_file_name, set(), set(), set(), dict(), dict())
+        if record_view:
+            results['record'] = (person_file_name, set(), [], set())
+        return results
+
+    if debug:
+        logger.debug("Name identifier in DBLP: %s", person_file_name)
+        if coauthor_view or disamb_view:
+            logger.debug("Set of all names: %s", person_name_set)
+    if coauthor_view:
+        if debug:
+            logger.debug("Affiliations: %s", affl_set)
+        # Generate aggregated temporal history of collaboration
+        cauthor_hist_dict, cauthor_freq_dict = aggregateYearHistory(cauthor_year_dict)
+        results['coauthor'] = (person_file_name, person_name_set, cauthor_hist_dict, cauthor_freq_dict, year_set,
+                               coauthor_set, affl_set)
+    if venue_view:
+        # Generate aggregated temporal history of quality venue publications
+        venue_hist_dict, venue_freq_dict = aggregateYearHistory(venue_year_dict)
+        results['venue'] = (person_file_name, venue_hist_dict, venue_freq_dict, venue_year_set)
+    if disamb_view:
+        if debug:
+            logger.debug("Affiliations: %s", full_affl_set)
+        results['disamb'] = (person_file_name, set(person_name_set), d_coauthor_set, full_affl_set, title_year_dict,
+                             title_coauthor_dict)
+    if record_view:
+        results['record'] = (person_file_name, set(person_name_set), records, set(affl_set))
+    stage_seconds.observe(time.perf_counter() - aggregate_start, stage='aggregate')
+
+    return results
 
 
 """
@@ -166,62 +403,7 @@ Output: Quality venue statistics.
 
 def getQualityVenuePublications(xml_file, quality_venue_set):
 
-    venue_year_dict = dict()  # Dictionary venue name -> list of years of publication
-    venue_hist_dict = dict()  # aggregated dictionary venue name -> list of (year, frequency)
-    venue_freq_dict = dict()  # Dictionary venue name -> total frequency
-    year_set = set()  # set of all years of quality-venue publications
-
-    root = ETree.fromstring(xml_file)
-    records = root.findall(".//r")  # Extract all r elements in DBLP
-    person_file_name = (root.attrib['name']).lower()  # Get name of the author in DBLP
-    person_file_name = unidecode(person_file_name)
-
-    author = root.find(".//person")  # Get the first person element (contains affiliation information)
-    if author is None:
-        print("XML content for ", person_file_name, "is missing!")
-        return person_file_name, venue_hist_dict, venue_freq_dict, year_set
-
-    print("Name identifier in DBLP: ", person_file_name)
-
-    for record in records:  # scan all r elements in the XML
-        papers = list(record)
-        for paper in papers:
-            quality_venue_match = 0  # set to 1 when there is a match
-            year_flag = 'unseen'  # set to seen if year element is encountered
-            info = list(paper)
-            for item in info:
-                if item.tag == "booktitle":
-                    if item.text in quality_venue_set:  # check if the paper is in venue list
-                        quality_venue_match = 1
-                        venue_title = item.text
-                if item.tag == "journal":
-                    if item.text in quality_venue_set:  # check if the paper is in venue list
-                        quality_venue_match = 1
-                        venue_title = item.text
-                if item.tag == "year":
-                    year_flag = 'seen'  # year element is visited
-                    a_year = item.text
-            # only consider paper information if it is in quality venue
-            if quality_venue_match == 1 and year_flag == 'seen':
-                year_set.add(a_year)
-                if venue_title not in venue_year_dict.keys():  # generate quality venue history dictionary
-                    venue_year_dict[venue_title] = [a_year]
-                else:
-                    venue_year_dict[venue_title].append(a_year)
-
-    """ Generate aggregated temporal history of quality venue publications"""
-    for key in venue_year_dict:
-        agg_year = Counter(venue_year_dict[key])
-        freq = 0
-        for (y, c) in agg_year.items():
-            freq = freq + c
-            if key not in venue_hist_dict.keys():
-                venue_hist_dict[key] = [(y, c)]
-            else:
-                venue_hist_dict[key].append((y, c))
-        venue_freq_dict[key] = freq
-
-    return person_file_name, venue_hist_dict, venue_freq_dict, year_set
+    return parsePersonDBLP(xml_file, ('venue',), quality_venue_set=quality_venue_set)['venue']
 
 
 """
@@ -231,58 +413,44 @@ Desc: Extract author information for disambiguating a DBLP page. The input page
 
 def readDisambDBLP(xml_file):
 
-    temp_author_set = set()  # set of co-authors of an author
-    coauthor_set = set()  # Set of all co-authors. Some co-authors may appear multiple times due to homonyms.
-    affl_set = set()  # Stores affiliations of the author
-    person_name_set = set()  # set of DBLP names of the person
-    title_year_dict = dict()  # title->year map
-    title_coauthor_dict = dict()  # title->co-author set map
+    return parsePersonDBLP(xml_file, ('disamb',))['disamb']
+
+
+"""
+Desc: Extract the papers of a DBLP page one by one, e.g., to split a page mixing several persons.
+Input: XML file string
+Output: Name of author, set of names in DBLP, list of (url, title, year, frozenset of co-authors, key, mdate) of the
+papers in page order (co-author names in lower case and unidecoded, as in readAuthorDBLP), set of affiliations
+"""
 
-    root = ETree.fromstring(xml_file)
-    records = root.findall(".//r")  # Extract all r elements in DBLP
-    person_file_name = (root.attrib['name']).lower()  # Get name of the author in DBLP
-    person_file_name = unidecode(person_file_name)
-    author = root.find(".//person")  # Get the first person element (contains affiliation information)
-    if author is None:
-        print("XML content for ", person_file_name, "is missing!")
-        return person_file_name, person_name_set, coauthor_set, affl_set, title_year_dict, title_coauthor_dict
-
-    notes = list(author)
-    for note in notes:  # Get affiliations
-        if note.tag == "note":
-            if note.attrib['type'] == 'affiliation':
-                affl_set.add(note.text)
-        if note.tag == "author":
-            person_name_set.add(unidecode(note.text.lower()))
-
-    print("Name identifier in DBLP: ", person_file_name)
-    print("Set of all names: ", person_name_set)
-    print("Affiliations: ", affl_set)
-
-    for record in records:  # scan all r elements in the XML
-        papers = list(record)
-        for paper in papers:
-            info = list(paper)
-            for item in info:
-                if item.tag == "title":
-                    p_title = str(item.text).replace('.', '').replace('"', '').lower()
-                if item.tag == "author":
-                    temp_author_set.add(unidecode(item.text.lower()))
-                if item.tag == "year":
-                    a_year = item.text
-            for author in temp_author_set:  # generate set of co-authors
-                coauthor_set.add(unidecode(author.lower()))
-                if p_title not in title_coauthor_dict.keys():  # create title-> authors map
-                    title_coauthor_dict[p_title] = {unidecode(author.lower())}
-                else:
-                    title_coauthor_dict[p_title].add(unidecode(author.lower()))
-            if p_title not in title_year_dict.keys():  # create title -> year of pub map
-                title_year_dict[p_title] = {a_year}
-            else:
-                title_year_dict[p_title].add(a_year)
-            temp_author_set.clear()
 
-    return person_file_name, person_name_set, coauthor_set, affl_set, title_year_dict, title_coauthor_dict
+def readRecordsDBLP(xml_file):
+
+    return parsePersonDBLP(xml_file, ('record',))['record']
+
+
+"""
+Desc: Coauthor information of a DBLP author, refreshed incrementally from the profile store (see ProfileStore.py).
+The page is fetched through the page cache; an unchanged page is not parsed, and a changed one is merged into the
+stored profile paper by paper.
+Input: Web address of the DBLP author, white list details
+Output: Tuple as returned by readAuthorDBLP, or None if the page could not be retrieved
+"""
+
+
+def refreshAuthorDBLP(r_dblp, title_venue_dict, dblp_url_dict, store=profile_store):
+
+    false_positives = dblp_url_dict[r_dblp] if r_dblp in dblp_url_dict.keys() else ()
+    xml_file = connectToDBLPPage(xmlifyAdd(r_dblp))
+    if len(xml_file) <= 4:
+        return None
+    if isinstance(xml_file, str):
+        xml_file = xml_file.encode('utf-8')
+    digest = hashlib.sha256(xml_file).hexdigest()
+    if store.state(r_dblp) == (digest, filterFingerprint(title_venue_dict, false_positives)):
+        store.touch(r_dblp)
+        return store.profile(r_dblp)
+    return store.merge(r_dblp, digest, readRecordsDBLP(xml_file), title_venue_dict, false_positives)
 
 
 """
@@ -312,96 +480,81 @@ def readDBLPHomonyms(xml_file):
 
 
 """
-Desc: Create a dblp data iterator.
+Desc: Retrieve all authors in DBLP, and store them in SANCUS DB when asked to (python reviewerStore.py does).
+Input: Whether to insert the authors into the dblp_authors table of the configured database
+Output: Set of all author names
 """
 
 
-def context_iter(dblp_path):
+def getDBLPAuthors(load_database=False):
+
+    start_time = time.time()  # to measure running time of the program
+    dblp_path = os.path.join(os.getcwd(), 'DataStore', 'dblp.xml')
+
+    if indexAvailable(dblp_path=dblp_path):  # answer from the prebuilt index (see DBLPIndex.py)
+        logger.info("Reading authors from DBLP index..")
+        author_set = indexedDBLPAuthors()
+    else:
+        logger.info("Reading authors from DBLP file..")
+        try:
+            author_set, = runScan([AuthorSetQuery()], dblp_path)
+        except IOError as err:
+            logger.error("DBLP file could not be read: %s", err)
+            raise
+
+    logger.info("Number of distinct authors: %d", len(author_set))
+    if load_database:
+        logger.info("Inserting into SANCUS DB...")
+        SancusDB.insertDBLPAuthors(author_set)
+        logger.info("Insertion completed.")
+    logger.info("Time taken to execute the program: %s seconds", round((time.time() - start_time), 3))
 
-    """Create a dblp data iterator of (event, element) pairs for processing"""
-    return etree.iterparse(source=dblp_path, dtd_validation=True, load_dtd=True)  # required dtd
+    return author_set
 
 
 """
-Desc: Retrieve all authors in DBLP and stores them in SANCUS DB.
+Desc: Retrieve authors in DBLP who has published in specified venues and on specified topics.
 """
 
 
-def getDBLPAuthors():
+def searchDBLPAuthors(key_word, venue_set):
 
-    start_time = time.time()  # to measure running time of the program
     dblp_path = os.path.join(os.getcwd(), 'DataStore', 'dblp.xml')
-    author_set = set()
-    count = 0
-    pub_type = ["article", "inproceedings", "book", "incollection"]
+    if indexAvailable(dblp_path=dblp_path):  # answer from the prebuilt index (see DBLPIndex.py)
+        return indexedSearchDBLPAuthors(key_word, venue_set)
 
-    print("Reading authors from DBLP file..")
+    logger.info("Reading authors from DBLP file..")
     try:
-        context_iter(dblp_path)
-        for _, elem in context_iter(dblp_path):
-            if elem.tag in pub_type:
-                for sub in elem:
-                    if sub.tag == 'author':
-                        author_set.add(sub.text)
-                        count = count + 1
-    except IOError:
-        exit()
+        title_venue_dict, title_authors_dict = runScan([KeywordSearchQuery(key_word, venue_set)], dblp_path)[0]
+    except IOError as err:
+        logger.error("DBLP file could not be read: %s", err)
+        raise
 
-    print("Number of distinct authors:", len(author_set))
-    print("Inserting into SANCUS DB...")
-    # SancusDB.insertDBLPAuthors(author_set)
-    print("Insertion completed.")
-    print("\n----Time take to execute the program: %s seconds -----" % round((time.time() - start_time), 3))
+    return title_venue_dict, title_authors_dict
 
 
 """
-Desc: Retrieve authors in DBLP who has published in specified venues and on specified topics.
+Desc: Retrieve authors in DBLP who has published in specified venues on any of many topics, in one pass.
+Input: Key words, set of venues
+Output: Dictionaries title -> venue, title -> set of authors and title -> set of key words found in the title
 """
 
 
-def searchDBLPAuthors(key_word, venue_set):
+def searchDBLPAuthorsByKeywords(key_words, venue_set):
 
     dblp_path = os.path.join(os.getcwd(), 'DataStore', 'dblp.xml')
-    title_authors_dict = dict()
-    title_venue_dict = dict()
-    pub_type = ["article", "inproceedings"]
+    if indexAvailable(dblp_path=dblp_path):  # answer from the prebuilt index (see DBLPIndex.py)
+        return indexedKeywordsSearch(key_words, venue_set)
 
-    print("Reading authors from DBLP file..")
+    logger.info("Reading authors from DBLP file..")
     try:
-        context_iter(dblp_path)
-        for _, elem in context_iter(dblp_path):
-            title_match = 0
-            quality_venue_match = 0
-            p_title = ''
-            venue_title = ''
-            author_set = set()
-            if elem.tag in pub_type:
-                for sub in elem:
-                    if sub.tag == "booktitle":
-                        if sub.text in venue_set:  # check if the paper is in venue list
-                            quality_venue_match = 1
-                            venue_title = sub.text
-                    if sub.tag == "journal":
-                        if sub.text in venue_set:  # check if the paper is in venue list
-                            quality_venue_match = 1
-                            venue_title = sub.text
-                    if sub.tag == 'author':
-                        author_set.add(sub.text)
-                    if sub.tag == "title" and sub.text is not None:
-                        if key_word in sub.text.lower():
-                            title_match = 1
-                            p_title = sub.text
-            if title_match == 1 and quality_venue_match == 1 and len(author_set) > 0:
-                if p_title not in title_authors_dict.keys():
-                    title_authors_dict[p_title] = author_set
-                if p_title not in title_venue_dict.keys():
-                    title_venue_dict[p_title] = venue_title
-            else:
-                author_set.clear()
-    except IOError:
-        exit()
+        title_venue_dict, title_authors_dict, title_keywords_dict = \
+            runScan([MultiKeywordSearchQuery(key_words, venue_set)], dblp_path)[0]
+    except IOError as err:
+        logger.error("DBLP file could not be read: %s", err)
+        raise
 
-    return title_venue_dict, title_authors_dict
+    return title_venue_dict, title_authors_dict, title_keywords_dict
 
 
 """
@@ -412,24 +565,14 @@ Desc: Retrieve homonymous authors and their affiliations from DBLP
 def retrieveDBLPHomonymousAuthorsOld():
 
     dblp_path = os.path.join(os.getcwd(), 'DataStore', 'dblp.xml')
-    hom_author_set = set()
-    pub_type = ["article", "inproceedings", "book", "incollection"]
 
-    print("Reading authors from DBLP file..")
+    logger.info("Reading authors from DBLP file..")
     try:
-        context_iter(dblp_path)
-        for _, elem in context_iter(dblp_path):
-            if elem.tag in pub_type:
-                for sub in elem:
-                    if sub.tag == 'author':
-                        word_list = sub.text.split()
-                        last_item = word_list[-1]
-                        if last_item.isnumeric():  # check if the last word is a numeric value
-                            hom_author_set.add(sub.text.lower())
-
-    except IOError:
-        exit()
-    print("No. of homonymous authors:", len(hom_author_set))
+        hom_author_set, = runScan([HomonymousAuthorsQuery()], dblp_path)
+    except IOError as err:
+        logger.error("DBLP file could not be read: %s", err)
+        raise
+    logger.info("No. of homonymous authors: %d", len(hom_author_set))
 
     return hom_author_set
 
@@ -442,32 +585,16 @@ Desc: Retrieve homonymous authors and their affiliations from DBLP
 def retrieveDBLPHomonymousAuthors():
 
     dblp_path = os.path.join(os.getcwd(), 'DataStore', 'dblp.xml')
-    hom_author_set = set()
-    pub_type = ["article", "inproceedings", "book", "incollection"]
-
-    print("Reading authors from DBLP file..")
-
-    count = 0
-    with open(dblp_path, "rb") as infile:
-        for event, elem in etree.iterparse(infile, load_dtd=True, dtd_validation=True, events=("end",)):
-
-            if elem.tag in pub_type:
-                for sub in elem:
-                    if sub.tag == 'author':
-                        word_list = sub.text.split()
-                        last_item = word_list[-1]
-                        if last_item.isnumeric():  # check if the last word is a numeric value
-                            hom_author_set.add(sub.text.lower())  # address lower case issue
-
-            if 'key' in elem.attrib: elem.clear()  # reduces memory footprint
-
-            count += 1
-            if count % 1000000 == 0:
-                print('%d events ....' % count)
-                gc.collect()
+    if indexAvailable(dblp_path=dblp_path):  # answer from the prebuilt index (see DBLPIndex.py)
+        return indexedHomonymousAuthors()
 
-    print('done after %d events.' % count)
-    print('collected %d names.' % len(hom_author_set))
+    logger.info("Reading authors from DBLP file..")
+    try:
+        hom_author_set, = runScan([HomonymousAuthorsQuery()], dblp_path)
+    except IOError as err:
+        logger.error("DBLP file could not be read: %s", err)
+        raise
+    logger.info('collected %d names.', len(hom_author_set))
 
     return hom_author_set
 
@@ -480,55 +607,30 @@ Desc: Retrieve title and authors of a conference venue.
 def retrieveProceedingsFromDBLP(venue, year):
 
     dblp_path = os.path.join(os.getcwd(), 'DataStore', 'dblp.xml')
-    title_authors_dict = dict()
-    pub_type = ["article", "inproceedings"]
+    if indexAvailable(dblp_path=dblp_path):  # answer from the prebuilt index (see DBLPIndex.py)
+        return indexedProceedings(venue, year)
 
-    print("Reading data from DBLP file..")
+    logger.info("Reading data from DBLP file..")
     try:
-        context_iter(dblp_path)
-        for _, elem in context_iter(dblp_path):
-            p_title = ''
-            venue_match = 0
-            year_match = 0
-            author_set = set()
-            if elem.tag in pub_type:
-                for sub in elem:
-                    if sub.tag == "booktitle":
-                        if sub.text == venue:  # check if the paper is in venue list
-                            venue_match = 1
-                    if sub.tag == 'author':
-                        author_set.add(sub.text)
-                    if sub.tag == "title" and sub.text is not None:
-                        p_title = sub.text
-                    if sub.tag == 'year' and sub.text == year:
-                        year_match = 1
-            if venue_match == 1 and year_match == 1 and len(author_set) > 0:
-                if p_title not in title_authors_dict.keys():
-                    title_authors_dict[p_title] = author_set
-            else:
-                author_set.clear()
-    except IOError:
-        exit()
+        title_authors_dict, = runScan([ProceedingsQuery(venue, year)], dblp_path)
+    except IOError as err:
+        logger.error("DBLP file could not be read: %s", err)
+        raise
 
     return title_authors_dict
 
 
 """
-Desc: Procedure to search for potential PC members in DBLP  
+Desc: Aggregate the papers found by a topic search per author
+Input: Dictionaries title -> venue and title -> set of authors (see searchDBLPAuthors)
+Output: Dictionaries author -> set of venues and author -> number of papers
 """
 
 
-def searchDBLPforPC(key_word, conf_name, input_dir, output_dir, venue_file_name):
+def aggregateCandidates(title_venue_dict, title_authors_dict):
 
     author_venue_dict = dict()
     author_count_dict = dict()
-    venue_file = os.path.join(os.getcwd(), 'Venues', conf_name, input_dir, venue_file_name)
-    venue_df = pd.read_excel(venue_file)
-    venue_set = set(venue_df['Venue'])
-    print("Set of quality venues: ", venue_set)
-
-    title_venue_dict, title_authors_dict = searchDBLPAuthors(key_word, venue_set)
-    print("No. of articles found:", len(title_venue_dict))
     for title in title_authors_dict.keys():
         for author in title_authors_dict[title]:
             if author not in author_venue_dict.keys():
@@ -539,10 +641,32 @@ def searchDBLPforPC(key_word, conf_name, input_dir, output_dir, venue_file_name)
                 author_count_dict[author] = 1
             else:
                 author_count_dict[author] = author_count_dict[author] + 1
-    print("No. of potential candidates:", len(author_venue_dict))
+
+    return author_venue_dict, author_count_dict
+
+
+"""
+Desc: Procedure to search for potential PC members in DBLP  
+"""
+
+
+def searchDBLPforPC(key_word, conf_name, input_dir, output_dir, venue_file_name, iteration=None):
+
+    venue_file = os.path.join(os.getcwd(), 'Venues', conf_name, input_dir, venue_file_name)
+    venue_set = loadVenueList(venue_file).spellings()  # compiled once per version of the file (see VenueScoring.py)
+    logger.info("Set of quality venues: %s", venue_set)
+
+    title_venue_dict, title_authors_dict = searchDBLPAuthors(key_word, venue_set)
+    logger.info("No. of articles found: %d", len(title_venue_dict))
+    author_venue_dict, author_count_dict = aggregateCandidates(title_venue_dict, title_authors_dict)
+    logger.info("No. of potential candidates: %d", len(author_venue_dict))
     output_file_name = ''.join([key_word, '.txt'])
     output_file = os.path.join(os.getcwd(), 'Venues', conf_name, output_dir, output_file_name)
     # ClosetIO.outputPotentialPC(output_file, author_count_dict, author_venue_dict)
+    table_file = os.path.join(os.getcwd(), 'Venues', conf_name, output_dir, ''.join([key_word, '.parquet']))
+    writeTable(candidatePapersTable(title_venue_dict, title_authors_dict), table_file)  # see rankAuthors
+    if iteration is not None:  # stored as candidates of the given iteration of Candidate_Rec
+        SancusDB.upsertCandidates(SancusDB.candidateRows(author_venue_dict, author_count_dict, [key_word], iteration))
 
 
 """
@@ -551,21 +675,27 @@ Desc: Retrieve co-authorship data of a reviewer
 
 
 def getDBLPData(r_email, dblp_add, title_year_dict, title_venue_dict, rev_dblp_name_dict, dblp_name_rev_dict,
-                rev_coauthors_dict, dblp_url_dict):
+                rev_coauthors_dict, dblp_url_dict, incremental=False):
 
     c_author_freq_dict = dict()
 
-    x_dblp = xmlifyAdd(dblp_add)
-    xml_file = connectToDBLPPage(x_dblp)  # Connecting to DBLP page and get the XML file
-    if len(xml_file) > 4:  # file exists
+    if incremental:  # merge page changes into the stored profile (see refreshAuthorDBLP)
+        profile = refreshAuthorDBLP(dblp_add, title_venue_dict, dblp_url_dict)
+    else:
+        x_dblp = xmlifyAdd(dblp_add)
+        xml_file = connectToDBLPPage(x_dblp)  # Connecting to DBLP page and get the XML file
+        profile = None
+        if len(xml_file) > 4:  # file exists
+            profile = readAuthorDBLP(xml_file, title_year_dict, title_venue_dict, dblp_url_dict, dblp_add)
+    if profile is not None:
         person, person_name_set, c_author_hist_dict, c_author_freq_dict, years_of_pub, coauthor_set, affl_set = \
-            readAuthorDBLP(xml_file, title_year_dict, title_venue_dict, dblp_url_dict, dblp_add)
+            profile
         if len(person_name_set) > 0:
             rev_dblp_name_dict[r_email] = person_name_set
             for name in person_name_set:
                 dblp_name_rev_dict[name] = r_email
         else:
-            print("XML file of ", r_email, "cannot be located!")
+            logger.warning("XML file of %s cannot be located!", r_email)
         rev_coauthors_dict[r_email] = coauthor_set
 
     return c_author_freq_dict
@@ -581,13 +711,7 @@ def refineCoAuthors(coauthor_set):
     refined_coauthor_set = set()
 
     for c_author in coauthor_set:
-        word_list = c_author.split()
-        last_item = word_list[-1]
-        if last_item.isnumeric():  # check if the last word is a numeric value
-            new_author = c_author.replace(last_item, '')
-            refined_coauthor_set.add(new_author.strip())
-        else:
-            refined_coauthor_set.add(c_author.strip())
+        refined_coauthor_set.add(splitHomonym(c_author)[0])  # without the numeric homonym suffix
 
     return refined_coauthor_set
 
@@ -600,106 +724,73 @@ Desc: Retrieve authors in DBLP who has published in a given venue (e.g., SIGMOD)
 def generateVenueBasedAuthorStats(venue_set):
 
     dblp_path = os.path.join(os.getcwd(), 'DataStore', 'dblp.xml')
-    author_hist_dict = dict()
-    pub_type = ["article", "inproceedings"]
+    if indexAvailable(dblp_path=dblp_path):  # answer from the prebuilt index (see DBLPIndex.py)
+        return indexedVenueAuthorStats(venue_set)
 
-    print("Reading authors from DBLP file..")
+    logger.info("Reading authors from DBLP file..")
     try:
-        context_iter(dblp_path)
-        for _, elem in context_iter(dblp_path):
-            quality_venue_match = 0
-            year_match = 0
-            venue_title = ''
-            a_year = ''
-            author_set = set()
-            if elem.tag in pub_type:
-                for sub in elem:
-                    if sub.tag == "booktitle":
-                        if sub.text in venue_set:  # check if the paper is in venue list
-                            quality_venue_match = 1
-                            venue_title = sub.text
-                    if sub.tag == "journal":
-                        if sub.text in venue_set:  # check if the paper is in venue list
-                            quality_venue_match = 1
-                            venue_title = sub.text
-                    if sub.tag == "year":
-                        year_match = 1
-                        a_year = sub.text
-                    if sub.tag == 'author':
-                        author_set.add(sub.text)
-            if len(author_set) > 0 and quality_venue_match == 1 and year_match == 1:
-                for author in author_set:
-                    if author not in author_hist_dict.keys():
-                        author_hist_dict[author] = [(venue_title, a_year)]
-                    else:
-                        author_hist_dict[author].append((venue_title, a_year))
-            author_set.clear()
-    except IOError:
-        exit()
+        author_hist_dict, = runScan([VenueAuthorStatsQuery(venue_set)], dblp_path)
+    except IOError as err:
+        logger.error("DBLP file could not be read: %s", err)
+        raise
 
     return author_hist_dict
 
 
 """
-Desc: Retrieve the first year of publication of reviewers.
+Desc: Rank the authors of DBLP by their weighted recent output in the quality venues of a conference
+Input: Conference name, input directory and venue file (as in searchDBLPforPC), current year, optional candidate names,
+maximum number of results
+Output: List of dictionaries author, score, papers, best first (see rankCandidates)
+"""
+
+
+def rankQualityCandidates(conf_name, input_dir, venue_file_name, cur_year, candidates=None, top=None):
+
+    venue_list = loadVenueList(os.path.join(os.getcwd(), 'Venues', conf_name, input_dir, venue_file_name))
+    dump_stat = os.stat(os.path.join(os.getcwd(), 'DataStore', 'dblp.xml'))
+    key = (venue_list.version, dump_stat.st_size, dump_stat.st_mtime_ns)
+    index = venue_index_cache.get(key)
+    if index is None:
+        index = VenueIndex.fromHistories(generateVenueBasedAuthorStats(venue_list.spellings()), venue_list)
+        venue_index_cache.put(key, index)
+        logger.info("Indexed the venues of %d authors", len(index))
+    return rankCandidates(index, cur_year, candidates, top)
+
+
+"""
+Desc: Retrieve the first year of publication of reviewers and compute their years of experience. The roster is
+processed at once (see Seniority.py); reviewers whose DBLP page is missing or invalid are reported and left out.
+Input: Excel file of the PC (NAME, EMAIL, DBLP), white list details, current year
+Output: Dictionary rev email -> no. of years of experience
 """
 
 
 def getFirstYearOfPub(conf_pc_file, title_venue_dict, dblp_url_dict, cur_year):
 
-    pc_first_yr_pub_dict = dict()  # rev email -> first year of publication
-    missing_url = set()  # set containing invalid URL addresses
+    from Seniority import readRoster, getRosterSeniority  # Seniority.py imports this module
+
+    logger.info("Retrieving first year of publication info from DBLP using the following file: %s", conf_pc_file)
+    roster, roster_names = readRoster(conf_pc_file)
+    seniority_dict = getRosterSeniority(roster, cur_year, title_venue_dict, dblp_url_dict)
+
     r_email_exp_dict = dict()  # rev email -> no. of years of experience
-    title_year_dict = dict()  # placeholder - currently not used.
-
-    print("Retrieving first year of publication info from DBLP using the following file:", conf_pc_file)
-
-    reviewers = pd.read_excel(conf_pc_file)
-    for index, row in reviewers.iterrows():
-        r_name = str(row['NAME']).strip().lower()
-        r_email = str(row['EMAIL']).strip()
-        r_dblp = str(row['DBLP']).strip()
-        if len(r_dblp) > 5:
-            x_dblp = xmlifyAdd(r_dblp)  # Format to XML URL
-            time.sleep(2.1)
-            print("\nReading XML DBLP file of", r_name, "located at:", x_dblp)
-            xml_file = connectToDBLPPage(x_dblp)  # Connecting to DBLP page and get the XML file
-            if len(xml_file) > 4:  # file exists
-                person, person_name_set, c_author_hist_dict, c_author_freq_dict, years_of_pub, coauthor_set, \
-                    affl_set = readAuthorDBLP(xml_file, title_year_dict, title_venue_dict, dblp_url_dict, r_dblp)
-                if len(coauthor_set) > 0:
-                    first_pub_name = ''  # dblp name containing first pub year
-                    temp_year = 9999
-                    if r_email not in pc_first_yr_pub_dict.keys():
-                        for item in person_name_set:  # find the dblp name which contains the first pub year
-                            if item in c_author_hist_dict.keys():
-                                first_year = int(c_author_hist_dict[item][-1][0])
-                                if first_year < temp_year:
-                                    temp_year = first_year
-                                    first_pub_name = item
-                        # get first year of pub
-                        pc_first_yr_pub_dict[r_email] = c_author_hist_dict[first_pub_name][-1][0]
-                else:
-                    missing_url.add(r_name)
-            else:
-                print("XML address is invalid for ", r_name)
-                missing_url.add(r_name)
+    missing_url = set()  # names of reviewers with a missing or invalid URL
+    for r_email, result in seniority_dict.items():
+        if 'error' in result:
+            logger.warning("No first year of publication for %s (%s): %s", roster_names[r_email], roster[r_email],
+                           result['error'])
+            missing_url.add(roster_names[r_email])
         else:
-            print("DBLP page of the following reviewer is missing:", r_name)
+            r_email_exp_dict[r_email] = result['experience']
 
     if len(missing_url) > 0:
-        print("Total number of invalid URLs of reviewers detected: ", len(missing_url))
-        print("Names: ", missing_url)
-        print("Please rectify the URLs. Exiting CLOSET....")
-        exit()
-
-    # Compute experience
-    for email in pc_first_yr_pub_dict.keys():
-        experience = cur_year - int(pc_first_yr_pub_dict[email])
-        r_email_exp_dict[email] = experience
+        logger.error("Total number of invalid URLs of reviewers detected: %d", len(missing_url))
+        logger.error("Names: %s", missing_url)
 
     return r_email_exp_dict
 
 
 if __name__ == '__main__':
-    print("Running DBLP file")
+    configureLogging()
+    logger.info("Running DBLP file")
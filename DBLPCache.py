@@ -0,0 +1,182 @@
+"""
+Desc: Persistent on-disk cache of DBLP pages. Entries are keyed by the XML address of a page (see xmlifyAdd),
+bodies are stored gzip-compressed under their SHA-256 digest, and the ETag/Last-Modified validators of the
+response are kept so stale entries can be revalidated with a conditional GET.
+"""
+
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+
+CACHE_DIR = os.environ.get('DBLP_CACHE_DIR', os.path.join(os.getcwd(), 'DataStore', 'cache'))
+CACHE_TTL = float(os.environ.get('DBLP_CACHE_TTL', '86400'))  # seconds before an entry must be revalidated
+CACHE_MAX_BYTES = int(os.environ.get('DBLP_CACHE_MAX_BYTES', str(512 * 1024 * 1024)))  # compressed bytes
+
+
+"""
+Desc: Cache of DBLP pages with TTL, conditional revalidation and size-bounded LRU eviction.
+Input: Cache directory, time to live of an entry in seconds, maximum compressed size of all bodies
+"""
+
+
+class DBLPCache:
+
+    def __init__(self, cache_dir=CACHE_DIR, ttl=CACHE_TTL, max_bytes=CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0  # served from disk without contacting DBLP
+        self.revalidations = 0  # served from disk after a 304 Not Modified
+        self.misses = 0  # downloaded in full
+        self._db = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        # Open the index lazily so importing the module does not touch the disk
+        if self._db is None:
+            os.makedirs(os.path.join(self.cache_dir, 'objects'), exist_ok=True)
+            self._db = sqlite3.connect(os.path.join(self.cache_dir, 'index.sqlite'), check_same_thread=False,
+                                       timeout=30)
+            self._db.execute('CREATE TABLE IF NOT EXISTS entries (url TEXT PRIMARY KEY, digest TEXT NOT NULL, '
+                             'etag TEXT, last_modified TEXT, fetched_at REAL NOT NULL, accessed_at REAL NOT NULL, '
+                             'size INTEGER NOT NULL)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)')
+            self._db.commit()
+        return self._db
+
+    def _objectPath(self, digest):
+        return os.path.join(self.cache_dir, 'objects', digest[:2], digest + '.xml.gz')
+
+    def _entry(self, url):
+        row = self._connect().execute('SELECT digest, etag, last_modified, fetched_at FROM entries WHERE url = ?',
+                                      (url,)).fetchone()
+        return row
+
+    def _read(self, url, digest):
+        # Read a body and mark the entry as recently used; a vanished object invalidates the entry
+        try:
+            with gzip.open(self._objectPath(digest), 'rb') as f:
+                body = f.read()
+        except OSError:
+            self._connect().execute('DELETE FROM entries WHERE url = ?', (url,))
+            self._db.commit()
+            return None
+        self._db.execute('UPDATE entries SET accessed_at = ? WHERE url = ?', (time.time(), url))
+        self._db.commit()
+        return body
+
+    """
+    Desc: Return the cached body of a page if it is younger than the TTL
+    Input: XML address of a DBLP page
+    Output: The body as bytes, or None if the page must be requested from DBLP
+    """
+
+    def fresh(self, url):
+
+        with self._lock:
+            row = self._entry(url)
+            if row is None or time.time() - row[3] > self.ttl:
+                return None
+            body = self._read(url, row[0])
+            if body is not None:
+                self.hits = self.hits + 1
+            return body
+
+    """
+    Desc: Headers of a conditional GET for a cached page
+    Output: Dictionary of If-None-Match/If-Modified-Since headers (empty if the page is not cached)
+    """
+
+    def validators(self, url):
+
+        headers = dict()
+        with self._lock:
+            row = self._entry(url)
+        if row is not None:
+            if row[1]:
+                headers['If-None-Match'] = row[1]
+            if row[2]:
+                headers['If-Modified-Since'] = row[2]
+        return headers
+
+    """
+    Desc: Renew a cached page after DBLP answered 304 Not Modified
+    Output: The cached body, or None if it is no longer available
+    """
+
+    def revalidated(self, url):
+
+        with self._lock:
+            row = self._entry(url)
+            if row is None:
+                return None
+            body = self._read(url, row[0])
+            if body is not None:
+                self._db.execute('UPDATE entries SET fetched_at = ? WHERE url = ?', (time.time(), url))
+                self._db.commit()
+                self.revalidations = self.revalidations + 1
+            return body
+
+    """
+    Desc: Store a downloaded page
+    Input: XML address, body, ETag and Last-Modified header values (may be None)
+    """
+
+    def store(self, url, body, etag=None, last_modified=None):
+
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._objectPath(digest)
+        with self._lock:
+            db = self._connect()
+            if not os.path.exists(path):  # content-addressed: identical bodies are stored once
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temp_path = '%s.%d.tmp' % (path, os.getpid())
+                with gzip.open(temp_path, 'wb') as f:
+                    f.write(body)
+                os.replace(temp_path, path)
+            previous = self._entry(url)
+            now = time.time()
+            db.execute('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)',
+                       (url, digest, etag, last_modified, now, now, os.path.getsize(path)))
+            db.commit()
+            self.misses = self.misses + 1
+            removed = set() if previous is None or previous[0] == digest else {previous[0]}
+            self._evict(removed)
+
+    def _evict(self, removed):
+        # Drop least recently used entries until the cache fits in max_bytes, then delete orphaned bodies
+        db = self._db
+        total = db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total > self.max_bytes:
+            rows = db.execute('SELECT url, digest, size FROM entries ORDER BY accessed_at').fetchall()
+            for url, digest, size in rows:
+                if total <= self.max_bytes:
+                    break
+                db.execute('DELETE FROM entries WHERE url = ?', (url,))
+                removed.add(digest)
+                total = total - size
+        for digest in removed:
+            if db.execute('SELECT 1 FROM entries WHERE digest = ?', (digest,)).fetchone() is None:
+                try:
+                    os.remove(self._objectPath(digest))
+                except OSError:
+                    pass
+        db.commit()
+
+    """
+    Desc: Usage statistics of the cache
+    """
+
+    def stats(self):
+
+        with self._lock:
+            entries, size = self._connect().execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+        return {'entries': entries, 'bytes': size, 'max_bytes': self.max_bytes, 'hits': self.hits,
+                'revalidations': self.revalidations, 'misses': self.misses}
+
+
+cache = DBLPCache()  # shared by the synchronous and asynchronous fetch paths
@@ -0,0 +1,180 @@
+"""
+Desc: Streaming access to the DBLP dump (DataStore/dblp.xml). Publications are read one at a time into compact
+records, so callers never work on the element tree of the dump.
+"""
+
+import os
+import re
+from collections import namedtuple
+from lxml import etree
+
+
+PUB_TYPES = ("article", "inproceedings", "proceedings", "book", "incollection", "phdthesis", "mastersthesis")
+# Start of a top-level element of the dump; the dump puts every record on a new line
+TOP_LEVEL_PATTERN = re.compile(rb'\n<(?:article|inproceedings|proceedings|book|incollection|phdthesis|mastersthesis|'
+                               rb'www|person|data)[\s>]')
+SHARD_SCAN_BLOCK = 1 << 20  # bytes read at a time while looking for a shard boundary
+
+# One publication of the dump. title, booktitle, journal and year hold the text of the last such element
+# (None if absent); authors holds the author names in document order.
+PubRecord = namedtuple('PubRecord', ['key', 'tag', 'mdate', 'title', 'booktitle', 'journal', 'year', 'authors'])
+
+
+"""
+Desc: Location of the DBLP dump
+"""
+
+
+def defaultDBLPPath():
+
+    return os.path.join(os.getcwd(), 'DataStore', 'dblp.xml')
+
+
+"""
+Desc: Convert a publication element of the dump into a PubRecord
+"""
+
+
+def readPubRecord(elem):
+
+    title = booktitle = journal = year = None
+    authors = []
+    for sub in elem:
+        tag = sub.tag
+        if tag == 'author':
+            authors.append(sub.text)
+        elif tag == 'title':
+            title = sub.text
+        elif tag == 'year':
+            year = sub.text
+        elif tag == 'booktitle':
+            booktitle = sub.text
+        elif tag == 'journal':
+            journal = sub.text
+
+    return PubRecord(elem.get('key'), elem.tag, elem.get('mdate'), title, booktitle, journal, year, tuple(authors))
+
+
+"""
+Desc: Iterate over the publications of the DBLP dump in bounded memory. Only end events of the requested publication
+tags are produced; each publication element is cleared once its record has been read, and the elements before it
+(publications and everything else, e.g., www) are removed from the tree, so memory does not grow with the dump.
+Input: Path of dblp.xml (dblp.dtd must be next to it) or a file object such as a ShardReader, publication types
+to report (all of PUB_TYPES by default)
+Output: Generator of PubRecord
+"""
+
+
+def iterDBLPRecords(dblp_path=None, pub_type=PUB_TYPES, dtd_validation=True):
+
+    dblp_path = dblp_path if dblp_path is not None else defaultDBLPPath()
+    context = etree.iterparse(dblp_path, events=("end",), tag=tuple(pub_type), load_dtd=True,
+                              dtd_validation=dtd_validation)
+    for _, elem in context:
+        yield readPubRecord(elem)
+        elem.clear()
+        parent = elem.getparent()
+        while elem.getprevious() is not None:
+            del parent[0]
+
+
+"""
+Desc: Read the prolog of the dump (XML declaration, DOCTYPE and the opening dblp tag). The DTD reference is made
+absolute so that the prolog can head documents that are not read from the dump's directory.
+Output: Prolog bytes, offset of the first byte after the opening dblp tag, offset of the closing dblp tag
+"""
+
+
+def readDumpProlog(dblp_path):
+
+    with open(dblp_path, 'rb') as f:
+        head = f.read(SHARD_SCAN_BLOCK)
+        body_start = head.index(b'>', head.index(b'<dblp')) + 1
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(0, size - SHARD_SCAN_BLOCK))
+        tail = f.read()
+        body_end = size - len(tail) + tail.rindex(b'</dblp>')
+
+    dtd_dir = os.fsencode(os.path.dirname(os.path.abspath(dblp_path)))
+
+    def absoluteDTD(match):
+        system_id = match.group(1)
+        if not os.path.isabs(system_id) and b'://' not in system_id:
+            system_id = os.path.join(dtd_dir, system_id)
+        return b'SYSTEM "' + system_id + b'"'
+
+    prolog = re.sub(rb'SYSTEM\s+"([^"]+)"', absoluteDTD, head[:body_start])
+    return prolog, body_start, body_end
+
+
+"""
+Desc: Split the body of the dump into byte ranges that start on top-level element boundaries.
+Input: Path of dblp.xml, number of shards
+Output: List of (start offset, end offset); fewer shards are returned if the dump is too small
+"""
+
+
+def findShardBoundaries(dblp_path, shards):
+
+    _, body_start, body_end = readDumpProlog(dblp_path)
+    offsets = [body_start]
+    with open(dblp_path, 'rb') as f:
+        for k in range(1, shards):
+            pos = max(body_start + (body_end - body_start) * k // shards, offsets[-1] + 1) - 1
+            boundary = None
+            while boundary is None and pos < body_end:
+                f.seek(pos)
+                block = f.read(SHARD_SCAN_BLOCK)
+                match = TOP_LEVEL_PATTERN.search(block)
+                if match is not None:
+                    boundary = pos + match.start() + 1  # the element starts after the newline
+                elif len(block) < SHARD_SCAN_BLOCK:
+                    break
+                else:
+                    pos = pos + len(block) - 64  # overlap so that a tag across two blocks is not missed
+            if boundary is not None and offsets[-1] < boundary < body_end:
+                offsets.append(boundary)
+    offsets.append(body_end)
+
+    return [(offsets[i], offsets[i + 1]) for i in range(len(offsets) - 1)]
+
+
+"""
+Desc: File object presenting a byte range of the dump as a complete document: the prolog, the range, and the
+closing dblp tag. The range is streamed from disk, so a shard is never held in memory. bytes_read counts the bytes
+of the range read so far.
+Input: Path of dblp.xml, prolog (see readDumpProlog), start and end offsets of the range
+"""
+
+
+class ShardReader:
+
+    def __init__(self, dblp_path, prolog, start, end):
+        self._head = prolog
+        self._tail = b'</dblp>\n'
+        self._file = open(dblp_path, 'rb')
+        self._file.seek(start)
+        self._remaining = end - start
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = SHARD_SCAN_BLOCK
+        if self._head:
+            data, self._head = self._head[:size], self._head[size:]
+            return data
+        if self._remaining > 0:
+            data = self._file.read(min(size, self._remaining))
+            self._remaining = self._remaining - len(data)
+            self.bytes_read = self.bytes_read + len(data)
+            if data:
+                return data
+            self._remaining = 0
+        data, self._tail = self._tail[:size], self._tail[size:]
+        if not data:
+            self.close()
+        return data
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
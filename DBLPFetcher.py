@@ -0,0 +1,165 @@
+"""
+Desc: Asynchronous, pooled access to DBLP pages. A single keep-alive connection pool is shared by all
+requests of a process, and every page is downloaded exactly once.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import httpx
+from DBLPCache import cache as page_cache
+from RateLimit import limiter as dblp_limiter
+from Metrics import span, bytes_downloaded, pages_fetched
+
+
+FETCH_TIMEOUT = float(os.environ.get('DBLP_FETCH_TIMEOUT', '20'))  # seconds to wait for a response
+CONNECT_TIMEOUT = float(os.environ.get('DBLP_CONNECT_TIMEOUT', '5'))  # seconds to establish a connection
+FETCH_RETRIES = int(os.environ.get('DBLP_FETCH_RETRIES', '3'))  # retries after the first attempt
+FETCH_BACKOFF = float(os.environ.get('DBLP_FETCH_BACKOFF', '0.5'))  # base delay of the exponential backoff
+MAX_CONCURRENCY = int(os.environ.get('DBLP_MAX_CONCURRENCY', '8'))  # simultaneous requests to DBLP
+RETRY_STATUS = {429, 500, 502, 503, 504}  # transient responses worth another attempt
+
+logger = logging.getLogger(__name__)
+
+
+"""
+Desc: Delay before the given retry attempt (exponential backoff with jitter)
+"""
+
+
+def backoffDelay(attempt, backoff=FETCH_BACKOFF):
+
+    return backoff * (2 ** attempt) * (1 + random.random() / 2)
+
+
+"""
+Desc: Pooled asynchronous fetcher of DBLP pages with timeouts, retries and a concurrency limit.
+Input: Timeouts, number of retries, backoff and maximum number of concurrent requests. An httpx transport
+may be supplied to route the requests somewhere else than the network, and a DBLPCache (or None) to keep
+downloaded pages on disk. Every request waits for a token of the rate limiter.
+"""
+
+
+class DBLPFetcher:
+
+    def __init__(self, timeout=FETCH_TIMEOUT, connect_timeout=CONNECT_TIMEOUT, retries=FETCH_RETRIES,
+                 backoff=FETCH_BACKOFF, max_concurrency=MAX_CONCURRENCY, transport=None, cache=page_cache,
+                 limiter=dblp_limiter):
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_concurrency = max_concurrency
+        self.transport = transport
+        self.cache = cache
+        self.limiter = limiter
+        self._client = None
+        self._semaphore = None
+        self._loop = None
+
+    def _bind(self):
+        # The client and the semaphore belong to the running event loop; recreate them if the loop changed
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            limits = httpx.Limits(max_connections=self.max_concurrency,
+                                  max_keepalive_connections=self.max_concurrency)
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=limits, transport=self.transport,
+                                             follow_redirects=True)
+        return self._client
+
+    async def _send(self, client, add, headers):
+        # One request with retries on transport errors and transient status codes. A 429 is reported to the rate
+        # limiter, which makes the next attempt (and every other request) wait for the Retry-After period.
+        attempt = 0
+        while True:
+            response = None
+            try:
+                await self.limiter.acquireAsync()
+                response = await client.get(add, headers=headers)
+                if response.status_code == 429:
+                    await self.limiter.penalizeAsync(response.headers.get('Retry-After'))
+                elif response.status_code not in RETRY_STATUS:
+                    await self.limiter.rewardAsync()
+                if response.status_code not in RETRY_STATUS or attempt >= self.retries:
+                    return response
+            except httpx.TransportError:
+                if attempt >= self.retries:
+                    raise
+            if response is None or response.status_code != 429:
+                await asyncio.sleep(backoffDelay(attempt, self.backoff))
+            attempt = attempt + 1
+
+    """
+    Desc: Download a page once.
+    Input: Web address, optional request headers
+    Output: The httpx response, or None if the page could not be reached
+    """
+
+    async def request(self, add, headers=None):
+
+        client = self._bind()
+        async with self._semaphore:
+            try:
+                return await self._send(client, add, headers)
+            except httpx.TransportError as err:
+                logger.warning('Web page %s could not be reached: %s', add, err)
+                return None
+
+    """
+    Desc: Asynchronous counterpart of connectToDBLPPage.
+    Input: Web address of XML DBLP page
+    Output: If successful, the entire XML file as bytes, otherwise empty bytes
+    """
+
+    async def fetch(self, add):
+
+        # The page cache reads and writes SQLite and files under a lock shared with worker threads: it is used from a
+        # thread so that a slow disk or a busy lock does not stall the other requests of the event loop
+        body = None if self.cache is None else await asyncio.to_thread(self.cache.fresh, add)
+        if body is not None:
+            pages_fetched.inc(outcome='cached')
+            return body
+        with span('fetch'):
+            headers = None if self.cache is None else await asyncio.to_thread(self.cache.validators, add)
+            response = await self.request(add, headers)
+            if response is not None and response.status_code == 304:
+                body = await asyncio.to_thread(self.cache.revalidated, add)
+                if body is not None:
+                    pages_fetched.inc(outcome='revalidated')
+                    return body
+                response = await self.request(add)  # cached body vanished, download it again
+        if response is not None and response.status_code == 200:
+            logger.debug('Web page %s exists.', add)
+            pages_fetched.inc(outcome='downloaded')
+            bytes_downloaded.inc(len(response.content))
+            if self.cache is not None:
+                await asyncio.to_thread(self.cache.store, add, response.content, response.headers.get('ETag'),
+                                        response.headers.get('Last-Modified'))
+            return response.content
+        logger.warning('Web page %s does not exist!', add)
+        pages_fetched.inc(outcome='missing' if response is not None else 'error')
+        return b''
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+        self._client = None
+        self._semaphore = None
+        self._loop = None
+
+
+fetcher = DBLPFetcher()  # shared by every request handled by this process
+
+
+"""
+Desc: Fetch the XML version of a DBLP page with the shared fetcher
+Input: Web address of XML DBLP page
+Output: If successful, return the entire XML file as bytes
+"""
+
+
+async def fetchDBLPPage(add):
+
+    return await fetcher.fetch(add)
@@ -0,0 +1,367 @@
+"""
+Desc: Indexed local store of the DBLP dump. A one-time ingest converts DataStore/dblp.xml into an SQLite database
+(DataStore/dblp.sqlite) of publications, authors, venues and years; the dump-scan procedures of DBLP.py
+then answer their queries with index lookups instead of streaming the whole dump.
+Usage: python DBLPIndex.py [path of dblp.xml] [path of the index]
+"""
+
+import logging
+import os
+import sqlite3
+import sys
+import time
+from DBLPDump import defaultDBLPPath, iterDBLPRecords
+from MemoCache import LRUCache
+from TitleMatcher import KeywordMatcher, normalizeTitle
+from NameNormalizer import homonymSuffix
+from Metrics import configureLogging
+
+
+INDEX_PATH = os.environ.get('DBLP_INDEX_PATH', os.path.join(os.getcwd(), 'DataStore', 'dblp.sqlite'))
+INGEST_BATCH = 50000  # records per transaction during the ingest
+TITLE_RULES = '1'  # version of the title normalization stored in publications.title_lower (see normalizeTitle)
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)',
+    'CREATE TABLE IF NOT EXISTS publications (id INTEGER PRIMARY KEY, key TEXT NOT NULL UNIQUE, type TEXT NOT NULL, '
+    'mdate TEXT, title TEXT, title_lower TEXT, booktitle TEXT, journal TEXT, year TEXT, '
+    'generation INTEGER NOT NULL)',
+    'CREATE TABLE IF NOT EXISTS authors (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, homonym INTEGER NOT NULL)',
+    'CREATE TABLE IF NOT EXISTS pub_authors (pub_id INTEGER NOT NULL, position INTEGER NOT NULL, '
+    'author_id INTEGER NOT NULL, PRIMARY KEY (pub_id, position)) WITHOUT ROWID',
+    'CREATE INDEX IF NOT EXISTS publications_booktitle ON publications (booktitle, year)',
+    'CREATE INDEX IF NOT EXISTS publications_journal ON publications (journal, year)',
+    'CREATE INDEX IF NOT EXISTS publications_year ON publications (year)',
+    'CREATE INDEX IF NOT EXISTS publications_generation ON publications (generation)',
+    'CREATE INDEX IF NOT EXISTS pub_authors_author ON pub_authors (author_id)',
+    'DROP TABLE IF EXISTS title_tokens',  # token index of older versions, not used by any query
+]
+
+
+"""
+Desc: Check if an author name carries a DBLP homonym number (e.g., "Wei Wang 0001")
+"""
+
+
+def isHomonymName(name):
+
+    return homonymSuffix(name) is not None
+
+
+"""
+Desc: Open the index (read-only access does not create it)
+"""
+
+
+def openIndex(index_path=None, create=False):
+
+    index_path = index_path if index_path is not None else INDEX_PATH
+    if create:
+        os.makedirs(os.path.dirname(os.path.abspath(index_path)), exist_ok=True)
+        db = sqlite3.connect(index_path)
+        for statement in SCHEMA:
+            db.execute(statement)
+        db.commit()
+        return db
+    return sqlite3.connect('file:%s?mode=ro' % index_path, uri=True)
+
+
+"""
+Desc: Check if an index has been built. Reports when the dump is newer than the index.
+"""
+
+
+def indexAvailable(index_path=None, dblp_path=None):
+
+    index_path = index_path if index_path is not None else INDEX_PATH
+    if not os.path.exists(index_path):
+        return False
+    dblp_path = dblp_path if dblp_path is not None else defaultDBLPPath()
+    if os.path.exists(dblp_path) and os.path.getmtime(dblp_path) > os.path.getmtime(index_path):
+        logger.warning("DBLP index %s is older than %s - run DBLPIndex.py to update it.", index_path, dblp_path)
+    return True
+
+
+"""
+Desc: Build or update the index from a DBLP dump. Records whose key and mdate are unchanged are kept as they are,
+new or modified records are (re)inserted, and records that no longer appear in the dump are removed.
+Input: Path of dblp.xml, path of the index
+Output: Dictionary with the number of inserted, updated, unchanged and removed records
+"""
+
+
+def ingestDBLPDump(dblp_path=None, index_path=None):
+
+    start_time = time.time()
+    dblp_path = dblp_path if dblp_path is not None else defaultDBLPPath()
+    db = openIndex(index_path, create=True)
+    db.execute('PRAGMA journal_mode = WAL')
+    db.execute('PRAGMA synchronous = OFF')
+    row = db.execute("SELECT value FROM meta WHERE name = 'generation'").fetchone()
+    generation = int(row[0]) + 1 if row is not None else 1
+    author_ids = LRUCache(500000, 'index_author_ids')  # name -> author id of recently seen authors
+    stats = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'removed': 0}
+
+    logger.info("Indexing DBLP file %s (generation %d)..", dblp_path, generation)
+    count = 0
+    for record in iterDBLPRecords(dblp_path):
+        if record.key is None:
+            continue
+        existing = db.execute('SELECT id, mdate FROM publications WHERE key = ?', (record.key,)).fetchone()
+        if existing is not None and existing[1] == record.mdate:
+            db.execute('UPDATE publications SET generation = ? WHERE id = ?', (generation, existing[0]))
+            stats['unchanged'] = stats['unchanged'] + 1
+        else:
+            values = (record.tag, record.mdate, record.title, normalizeTitle(record.title) if record.title else None,
+                      record.booktitle, record.journal, record.year, generation)
+            if existing is None:
+                pub_id = db.execute('INSERT INTO publications (type, mdate, title, title_lower, booktitle, journal, '
+                                    'year, generation, key) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                    values + (record.key,)).lastrowid
+                stats['inserted'] = stats['inserted'] + 1
+            else:
+                pub_id = existing[0]
+                db.execute('UPDATE publications SET type = ?, mdate = ?, title = ?, title_lower = ?, booktitle = ?, '
+                           'journal = ?, year = ?, generation = ? WHERE id = ?', values + (pub_id,))
+                db.execute('DELETE FROM pub_authors WHERE pub_id = ?', (pub_id,))
+                stats['updated'] = stats['updated'] + 1
+            for position, name in enumerate(record.authors):
+                if name is None:
+                    continue
+                author_id = author_ids.get(name)
+                if author_id is None:
+                    db.execute('INSERT OR IGNORE INTO authors (name, homonym) VALUES (?, ?)',
+                               (name, int(isHomonymName(name))))
+                    author_id = db.execute('SELECT id FROM authors WHERE name = ?', (name,)).fetchone()[0]
+                    author_ids.put(name, author_id)
+                db.execute('INSERT INTO pub_authors VALUES (?, ?, ?)', (pub_id, position, author_id))
+        count = count + 1
+        if count % INGEST_BATCH == 0:
+            db.commit()
+            logger.info('%d records ....', count)
+
+    # Remove the records of older dumps that are not part of this one
+    stale = 'SELECT id FROM publications WHERE generation < ?'
+    db.execute('DELETE FROM pub_authors WHERE pub_id IN (%s)' % stale, (generation,))
+    stats['removed'] = db.execute('DELETE FROM publications WHERE generation < ?', (generation,)).rowcount
+    if generation > 1:
+        db.execute('DELETE FROM authors WHERE id NOT IN (SELECT author_id FROM pub_authors)')
+    if generation > 1 and not _titleRulesCurrent(db):  # unchanged records of older versions kept other rules
+        db.create_function('normalize_title', 1, normalizeTitle, deterministic=True)
+        db.execute('UPDATE publications SET title_lower = normalize_title(title) WHERE title IS NOT NULL')
+    db.execute("INSERT OR REPLACE INTO meta VALUES ('title_rules', ?)", (TITLE_RULES,))
+    db.execute("INSERT OR REPLACE INTO meta VALUES ('generation', ?)", (str(generation),))
+    db.execute("INSERT OR REPLACE INTO meta VALUES ('source', ?)", (os.path.abspath(dblp_path),))
+    db.commit()
+    db.execute('ANALYZE')
+    db.close()
+
+    logger.info("Indexing completed: %s", stats)
+    logger.info("Time taken to execute the program: %s seconds", round((time.time() - start_time), 3))
+    return stats
+
+
+def _titleRulesCurrent(db):
+    # Check if title_lower holds the titles normalized with the current rules
+    row = db.execute("SELECT value FROM meta WHERE name = 'title_rules'").fetchone()
+    return row is not None and row[0] == TITLE_RULES
+
+
+def _placeholders(values):
+    return ', '.join('?' * len(values))
+
+
+def _venueFilter(venue_set):
+    # Condition on booktitle or journal being one of the venues, with its parameters
+    venues = list(venue_set)
+    condition = '(p.booktitle IN (%s) OR p.journal IN (%s))' % (_placeholders(venues), _placeholders(venues))
+    return condition, venues + venues
+
+
+def _pubAuthors(db, pub_ids):
+    # Dictionary publication id -> list of author names in document order
+    pub_authors_dict = dict()
+    pub_ids = list(pub_ids)
+    for start in range(0, len(pub_ids), 900):
+        chunk = pub_ids[start:start + 900]
+        rows = db.execute('SELECT pa.pub_id, a.name FROM pub_authors pa JOIN authors a ON a.id = pa.author_id '
+                          'WHERE pa.pub_id IN (%s) ORDER BY pa.pub_id, pa.position' % _placeholders(chunk), chunk)
+        for pub_id, name in rows:
+            pub_authors_dict.setdefault(pub_id, []).append(name)
+    return pub_authors_dict
+
+
+"""
+Desc: All author names of articles, inproceedings, books and incollections (see getDBLPAuthors)
+"""
+
+
+def indexedDBLPAuthors(index_path=None):
+
+    db = openIndex(index_path)
+    types = ["article", "inproceedings", "book", "incollection"]
+    rows = db.execute('SELECT DISTINCT a.name FROM authors a JOIN pub_authors pa ON pa.author_id = a.id '
+                      'JOIN publications p ON p.id = pa.pub_id WHERE p.type IN (%s)' % _placeholders(types), types)
+    author_set = {name for (name,) in rows}
+    db.close()
+    return author_set
+
+
+"""
+Desc: Titles, venues and authors of articles and inproceedings in the venue set whose title contains the key word
+(see searchDBLPAuthors). Titles and key word are compared in normalized form, as in the dump scan.
+"""
+
+
+def indexedSearchDBLPAuthors(key_word, venue_set, index_path=None):
+
+    title_authors_dict = dict()
+    title_venue_dict = dict()
+    if len(venue_set) == 0:
+        return title_venue_dict, title_authors_dict
+    db = openIndex(index_path)
+    title_column = 'p.title_lower'
+    if not _titleRulesCurrent(db):  # index built by an older version, until the next ingest
+        db.create_function('normalize_title', 1, normalizeTitle, deterministic=True)
+        title_column = 'normalize_title(p.title)'
+    condition, params = _venueFilter(venue_set)
+    rows = db.execute('SELECT p.id, p.title, p.booktitle, p.journal FROM publications p '
+                      'WHERE p.type IN (\'article\', \'inproceedings\') AND %s AND instr(%s, ?) > 0 '
+                      'ORDER BY p.id' % (condition, title_column), params + [normalizeTitle(key_word)]).fetchall()
+    pub_authors_dict = _pubAuthors(db, [row[0] for row in rows])
+    for pub_id, p_title, booktitle, journal in rows:
+        if pub_id not in pub_authors_dict or p_title in title_authors_dict.keys():
+            continue
+        title_authors_dict[p_title] = set(pub_authors_dict[pub_id])
+        title_venue_dict[p_title] = booktitle if booktitle in venue_set else journal
+    db.close()
+    return title_venue_dict, title_authors_dict
+
+
+"""
+Desc: Titles, venues and authors of articles and inproceedings in the venue set whose title contains any of the key
+words (see searchDBLPAuthorsByKeywords). The titles of the venues are read once and matched against all key words.
+"""
+
+
+def indexedKeywordsSearch(key_words, venue_set, index_path=None):
+
+    title_authors_dict = dict()
+    title_venue_dict = dict()
+    title_keywords_dict = dict()
+    matcher = KeywordMatcher(key_words)
+    if len(venue_set) == 0 or len(matcher) == 0:
+        return title_venue_dict, title_authors_dict, title_keywords_dict
+    db = openIndex(index_path)
+    condition, params = _venueFilter(venue_set)
+    rows = []
+    for pub_id, p_title, booktitle, journal in db.execute(
+            'SELECT p.id, p.title, p.booktitle, p.journal FROM publications p '
+            'WHERE p.type IN (\'article\', \'inproceedings\') AND %s AND p.title IS NOT NULL ORDER BY p.id'
+            % condition, params):
+        hits = matcher.matches(p_title)
+        if hits:
+            rows.append((pub_id, p_title, booktitle, journal, hits))
+    pub_authors_dict = _pubAuthors(db, [row[0] for row in rows])
+    for pub_id, p_title, booktitle, journal, hits in rows:
+        if pub_id not in pub_authors_dict or p_title in title_authors_dict.keys():
+            continue
+        title_authors_dict[p_title] = set(pub_authors_dict[pub_id])
+        title_venue_dict[p_title] = booktitle if booktitle in venue_set else journal
+        title_keywords_dict[p_title] = hits
+    db.close()
+    return title_venue_dict, title_authors_dict, title_keywords_dict
+
+
+"""
+Desc: Titles and authors of the papers of a conference venue in a given year (see retrieveProceedingsFromDBLP)
+"""
+
+
+def indexedProceedings(venue, year, index_path=None):
+
+    title_authors_dict = dict()
+    db = openIndex(index_path)
+    rows = db.execute('SELECT p.id, p.title FROM publications p WHERE p.booktitle = ? AND p.year = ? '
+                      'AND p.type IN (\'article\', \'inproceedings\') ORDER BY p.id', (venue, year)).fetchall()
+    pub_authors_dict = _pubAuthors(db, [row[0] for row in rows])
+    for pub_id, p_title in rows:
+        p_title = p_title if p_title is not None else ''
+        if pub_id in pub_authors_dict and p_title not in title_authors_dict.keys():
+            title_authors_dict[p_title] = set(pub_authors_dict[pub_id])
+    db.close()
+    return title_authors_dict
+
+
+"""
+Desc: Dictionary author -> list of (venue, year) of the author's papers in the venue set
+(see generateVenueBasedAuthorStats)
+"""
+
+
+def indexedVenueAuthorStats(venue_set, index_path=None):
+
+    author_hist_dict = dict()
+    if len(venue_set) == 0:
+        return author_hist_dict
+    db = openIndex(index_path)
+    condition, params = _venueFilter(venue_set)
+    rows = db.execute('SELECT p.booktitle, p.journal, p.year, a.name FROM publications p '
+                      'JOIN pub_authors pa ON pa.pub_id = p.id JOIN authors a ON a.id = pa.author_id '
+                      'WHERE p.type IN (\'article\', \'inproceedings\') AND p.year IS NOT NULL AND %s '
+                      'ORDER BY p.id, pa.position' % condition, params)
+    for booktitle, journal, a_year, author in rows:
+        venue_title = booktitle if booktitle in venue_set else journal
+        author_hist_dict.setdefault(author, []).append((venue_title, a_year))
+    db.close()
+    return author_hist_dict
+
+
+"""
+Desc: Lower case names of all homonymous authors (see retrieveDBLPHomonymousAuthors)
+"""
+
+
+def indexedHomonymousAuthors(index_path=None):
+
+    db = openIndex(index_path)
+    types = ["article", "inproceedings", "book", "incollection"]
+    rows = db.execute('SELECT DISTINCT a.name FROM authors a JOIN pub_authors pa ON pa.author_id = a.id '
+                      'JOIN publications p ON p.id = pa.pub_id WHERE a.homonym = 1 AND p.type IN (%s)'
+                      % _placeholders(types), types)
+    hom_author_set = {name.lower() for (name,) in rows}
+    db.close()
+    return hom_author_set
+
+
+"""
+Desc: First and last year of publication, number of distinct years with a publication and number of publications of
+authors (see Seniority.py)
+Input: DBLP names of the authors (as in the dump)
+Output: Dictionary name -> (first year, last year, active years, publications); authors without dated publications
+are left out
+"""
+
+
+def indexedAuthorSeniority(names, index_path=None):
+
+    seniority_dict = dict()
+    names = list(dict.fromkeys(names))
+    db = openIndex(index_path)
+    for start in range(0, len(names), 900):
+        chunk = names[start:start + 900]
+        rows = db.execute('SELECT a.name, MIN(CAST(p.year AS INTEGER)), MAX(CAST(p.year AS INTEGER)), '
+                          'COUNT(DISTINCT p.year), COUNT(*) FROM authors a JOIN pub_authors pa ON pa.author_id = a.id '
+                          'JOIN publications p ON p.id = pa.pub_id WHERE a.name IN (%s) AND p.year IS NOT NULL '
+                          'GROUP BY a.name' % _placeholders(chunk), chunk)
+        for name, first_year, last_year, active_years, papers in rows:
+            seniority_dict[name] = (first_year, last_year, active_years, papers)
+    db.close()
+    return seniority_dict
+
+
+if __name__ == '__main__':
+    configureLogging()
+    ingestDBLPDump(sys.argv[1] if len(sys.argv) > 1 else None, sys.argv[2] if len(sys.argv) > 2 else None)
@@ -0,0 +1,96 @@
+"""
+Desc: Retrieval of the coauthor profiles of DBLP authors, one at a time or as a concurrent batch. Pages are fetched
+with the shared DBLPFetcher (rate limited, pooled, cached) and parsed in worker threads so the event loop stays free.
+"""
+
+import asyncio
+from DBLP import xmlifyAdd, readAuthorProfile
+from DBLPFetcher import fetcher
+
+
+"""
+Desc: Response of the /dblp route for a parsed DBLP page
+Input: Web address of a DBLP author, XML file string, white list details
+Output: Dictionary with the person name, coauthor histogram, years of publication and coauthors
+"""
+
+
+def profileResponse(dblp_url, xml_data, title_venue_dict=None, dblp_url_dict=None):
+
+    return readAuthorProfile(xml_data, title_venue_dict or {}, dblp_url_dict or {}, dblp_url).toResponse()
+
+
+"""
+Desc: Fetch and parse the page of one DBLP author into a CompactProfile
+Output: CompactProfile, or None if the page could not be retrieved
+"""
+
+
+async def fetchAuthorProfile(dblp_url, title_venue_dict=None, dblp_url_dict=None):
+
+    xml_data = await fetcher.fetch(xmlifyAdd(dblp_url))
+    if not xml_data:
+        return None
+    return await asyncio.to_thread(readAuthorProfile, xml_data, title_venue_dict or {}, dblp_url_dict or {},
+                                   dblp_url)
+
+
+"""
+Desc: Fetch and parse the page of one DBLP author
+Output: profileResponse of the author, or a dictionary with an error message
+"""
+
+
+async def fetchDBLPProfile(dblp_url, title_venue_dict=None, dblp_url_dict=None):
+
+    xml_data = await fetcher.fetch(xmlifyAdd(dblp_url))
+    if not xml_data:
+        return {"error": "Could not retrieve DBLP data"}
+    try:
+        return await asyncio.to_thread(profileResponse, dblp_url, xml_data, title_venue_dict, dblp_url_dict)
+    except Exception as err:  # a malformed page must not abort the other authors of a batch
+        return {"error": "Could not parse DBLP data: %s" % err}
+
+
+"""
+Desc: Fetch and parse the pages of many DBLP authors concurrently. The number of requests in flight is bounded by the
+fetcher and their pace by the DBLP rate limiter.
+Input: List of web addresses of DBLP authors, white list details
+Output: Asynchronous generator of results, in order of completion; each result carries its "dblp_url"
+"""
+
+
+async def fetchDBLPProfiles(dblp_urls, title_venue_dict=None, dblp_url_dict=None):
+
+    async def fetchOne(dblp_url):
+        result = await fetchDBLPProfile(dblp_url, title_venue_dict, dblp_url_dict)
+        result["dblp_url"] = dblp_url
+        return result
+
+    tasks = [asyncio.create_task(fetchOne(dblp_url)) for dblp_url in dict.fromkeys(dblp_urls)]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:  # the consumer went away (e.g., client disconnected)
+            task.cancel()
+
+
+"""
+Desc: Synchronous batch retrieval for scripts
+Output: Dictionary web address -> result of fetchDBLPProfile
+"""
+
+
+def getDBLPProfiles(dblp_urls, title_venue_dict=None, dblp_url_dict=None):
+
+    async def collect():
+        results = dict()
+        try:
+            async for result in fetchDBLPProfiles(dblp_urls, title_venue_dict, dblp_url_dict):
+                results[result.pop("dblp_url")] = result
+        finally:
+            await fetcher.aclose()
+        return results
+
+    return asyncio.run(collect())
@@ -0,0 +1,357 @@
+"""
+Desc: Multi-query scan engine over the DBLP dump. A batch of queries is answered in one streaming pass over
+dblp.xml: every publication record is offered to each query whose publication types and predicate accept it, and
+each query keeps its own aggregation. With more than one worker, the dump is split into shards that are scanned in a
+process pool, and the per-shard aggregations of every query are merged.
+"""
+
+import logging
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from DBLPDump import defaultDBLPPath, iterDBLPRecords, readDumpProlog, findShardBoundaries, ShardReader
+from TitleMatcher import KeywordMatcher, normalizeTitle
+from NameNormalizer import homonymSuffix
+from Metrics import stage_seconds, records_parsed
+
+
+SCAN_WORKERS = int(os.environ.get('DBLP_SCAN_WORKERS', '1'))  # processes used by runScan
+SHARDS_PER_WORKER = 4  # more shards than workers balances uneven shards
+PROGRESS_EVERY = 20000  # records between two progress reports of a serial scan
+
+logger = logging.getLogger(__name__)
+
+
+"""
+Desc: Base class of the queries of the scan engine. A query lists the publication types it needs, decides with
+match() whether a record is relevant, accumulates relevant records in aggregate() and returns its answer in result().
+merge() adds the aggregation of the same query over the next part of the dump (used by the parallel scan).
+"""
+
+
+class ScanQuery:
+
+    pub_type = ("article", "inproceedings")
+
+    def match(self, record):
+        return True
+
+    def aggregate(self, record):
+        raise NotImplementedError
+
+    def result(self):
+        raise NotImplementedError
+
+    def merge(self, other):
+        raise NotImplementedError
+
+
+def _venueOf(record, venue_set):
+    # Venue of a record if its booktitle or journal is in the venue set, otherwise None
+    if record.booktitle in venue_set:
+        return record.booktitle
+    if record.journal in venue_set:
+        return record.journal
+    return None
+
+
+"""
+Desc: All authors of articles, inproceedings, books and incollections (see getDBLPAuthors)
+"""
+
+
+class AuthorSetQuery(ScanQuery):
+
+    pub_type = ("article", "inproceedings", "book", "incollection")
+
+    def __init__(self):
+        self.author_set = set()
+
+    def aggregate(self, record):
+        self.author_set.update(author for author in record.authors if author is not None)
+
+    def result(self):
+        return self.author_set
+
+    def merge(self, other):
+        self.author_set.update(other.author_set)
+
+
+"""
+Desc: Papers in the venue set whose title contains a key word (see searchDBLPAuthors)
+Output: Dictionaries title -> venue and title -> set of authors
+"""
+
+
+class KeywordSearchQuery(ScanQuery):
+
+    def __init__(self, key_word, venue_set):
+        self.key_word = normalizeTitle(key_word)
+        self.venue_set = venue_set
+        self.title_venue_dict = dict()
+        self.title_authors_dict = dict()
+
+    def match(self, record):
+        return len(record.authors) > 0 and record.title is not None and self.key_word in normalizeTitle(record.title) \
+            and _venueOf(record, self.venue_set) is not None
+
+    def aggregate(self, record):
+        if record.title not in self.title_authors_dict.keys():
+            self.title_authors_dict[record.title] = set(record.authors)
+            self.title_venue_dict[record.title] = _venueOf(record, self.venue_set)
+
+    def result(self):
+        return self.title_venue_dict, self.title_authors_dict
+
+    def merge(self, other):
+        for title in other.title_authors_dict:
+            if title not in self.title_authors_dict.keys():
+                self.title_authors_dict[title] = other.title_authors_dict[title]
+                self.title_venue_dict[title] = other.title_venue_dict[title]
+
+
+"""
+Desc: Papers in the venue set whose title contains any of many key words, matched in one pass over each title
+(see searchDBLPAuthorsByKeywords)
+Output: Dictionaries title -> venue, title -> set of authors and title -> set of key words found in the title
+"""
+
+
+class MultiKeywordSearchQuery(ScanQuery):
+
+    def __init__(self, key_words, venue_set):
+        self.matcher = KeywordMatcher(key_words)
+        self.venue_set = venue_set
+        self.title_venue_dict = dict()
+        self.title_authors_dict = dict()
+        self.title_keywords_dict = dict()
+        self._hits = None  # key words of the record accepted last by match()
+
+    def match(self, record):
+        if len(record.authors) == 0 or record.title is None or _venueOf(record, self.venue_set) is None:
+            return False
+        self._hits = self.matcher.matches(record.title)
+        return len(self._hits) > 0
+
+    def aggregate(self, record):
+        if record.title not in self.title_authors_dict.keys():
+            self.title_authors_dict[record.title] = set(record.authors)
+            self.title_venue_dict[record.title] = _venueOf(record, self.venue_set)
+            self.title_keywords_dict[record.title] = self._hits
+
+    def result(self):
+        return self.title_venue_dict, self.title_authors_dict, self.title_keywords_dict
+
+    def merge(self, other):
+        for title in other.title_authors_dict:
+            if title not in self.title_authors_dict.keys():
+                self.title_authors_dict[title] = other.title_authors_dict[title]
+                self.title_venue_dict[title] = other.title_venue_dict[title]
+                self.title_keywords_dict[title] = other.title_keywords_dict[title]
+
+
+"""
+Desc: Titles and authors of the papers of a conference venue in a given year (see retrieveProceedingsFromDBLP)
+"""
+
+
+class ProceedingsQuery(ScanQuery):
+
+    def __init__(self, venue, year):
+        self.venue = venue
+        self.year = year
+        self.title_authors_dict = dict()
+
+    def match(self, record):
+        return len(record.authors) > 0 and record.booktitle == self.venue and record.year == self.year
+
+    def aggregate(self, record):
+        p_title = record.title if record.title is not None else ''
+        if p_title not in self.title_authors_dict.keys():
+            self.title_authors_dict[p_title] = set(record.authors)
+
+    def result(self):
+        return self.title_authors_dict
+
+    def merge(self, other):
+        for title in other.title_authors_dict:
+            if title not in self.title_authors_dict.keys():
+                self.title_authors_dict[title] = other.title_authors_dict[title]
+
+
+"""
+Desc: Dictionary author -> list of (venue, year) of the author's papers in the venue set
+(see generateVenueBasedAuthorStats)
+"""
+
+
+class VenueAuthorStatsQuery(ScanQuery):
+
+    def __init__(self, venue_set):
+        self.venue_set = venue_set
+        self.author_hist_dict = dict()
+
+    def match(self, record):
+        return record.year is not None and _venueOf(record, self.venue_set) is not None
+
+    def aggregate(self, record):
+        venue_title = _venueOf(record, self.venue_set)
+        for author in set(record.authors):
+            if author not in self.author_hist_dict.keys():
+                self.author_hist_dict[author] = [(venue_title, record.year)]
+            else:
+                self.author_hist_dict[author].append((venue_title, record.year))
+
+    def result(self):
+        return self.author_hist_dict
+
+    def merge(self, other):
+        for author in other.author_hist_dict:
+            if author not in self.author_hist_dict.keys():
+                self.author_hist_dict[author] = other.author_hist_dict[author]
+            else:
+                self.author_hist_dict[author].extend(other.author_hist_dict[author])
+
+
+"""
+Desc: Lower case names of all homonymous authors, i.e., names ending with a DBLP number
+(see retrieveDBLPHomonymousAuthors)
+"""
+
+
+class HomonymousAuthorsQuery(ScanQuery):
+
+    pub_type = ("article", "inproceedings", "book", "incollection")
+
+    def __init__(self):
+        self.hom_author_set = set()
+
+    def aggregate(self, record):
+        for author in record.authors:
+            if homonymSuffix(author) is not None:  # the name ends with a DBLP homonym number
+                self.hom_author_set.add(author.lower())  # address lower case issue
+
+    def result(self):
+        return self.hom_author_set
+
+    def merge(self, other):
+        self.hom_author_set.update(other.hom_author_set)
+
+
+def _pubTypes(queries):
+    pub_type = set()
+    for query in queries:
+        pub_type.update(query.pub_type)
+    return pub_type
+
+
+def _scanRecords(queries, records, progress=None):
+    # Offer every record to the queries interested in its publication type; progress(count) is called every
+    # PROGRESS_EVERY records
+    type_queries_dict = {tag: [query for query in queries if tag in query.pub_type] for tag in _pubTypes(queries)}
+    count = 0
+    for record in records:
+        for query in type_queries_dict[record.tag]:
+            if query.match(record):
+                query.aggregate(record)
+        count = count + 1
+        if progress is not None and count % PROGRESS_EVERY == 0:
+            progress(count)
+    return count
+
+
+def _scanShard(task):
+    # Worker of the parallel scan: answer fresh copies of the queries over one shard
+    dblp_path, prolog, start, end, pickled_queries = task
+    queries = pickle.loads(pickled_queries)
+    reader = ShardReader(dblp_path, prolog, start, end)
+    try:
+        count = _scanRecords(queries, iterDBLPRecords(reader, _pubTypes(queries)))
+    finally:
+        reader.close()
+    return count, queries
+
+
+def _recordScan(count, start_time):
+    elapsed = time.time() - start_time
+    stage_seconds.observe(elapsed, stage='scan')
+    records_parsed.inc(count, source='dump')
+    logger.info("Scanned %d publications in %s seconds.", count, round(elapsed, 3))
+
+
+"""
+Desc: Answer a batch of queries with a single pass over the DBLP dump.
+Input: List of ScanQuery objects, path of dblp.xml (DataStore/dblp.xml by default), number of worker processes
+(DBLP_SCAN_WORKERS, 1 by default; more than one runs runParallelScan), optional progress callback called with the
+number of records scanned, the bytes of the dump read and the size of the dump; it may raise to abort the scan
+Output: List of the query results, in the order of the queries
+"""
+
+
+def runScan(queries, dblp_path=None, workers=SCAN_WORKERS, progress=None):
+
+    if workers > 1:
+        return runParallelScan(queries, dblp_path, workers, progress=progress)
+    start_time = time.time()
+
+    logger.info("Answering %d queries in one pass over the DBLP file..", len(queries))
+    if progress is None:
+        count = _scanRecords(queries, iterDBLPRecords(dblp_path, _pubTypes(queries)))
+    else:  # read the dump through a ShardReader spanning the whole body to know how far the scan is
+        dblp_path = dblp_path if dblp_path is not None else defaultDBLPPath()
+        prolog, body_start, body_end = readDumpProlog(dblp_path)
+        reader = ShardReader(dblp_path, prolog, body_start, body_end)
+        try:
+            count = _scanRecords(queries, iterDBLPRecords(reader, _pubTypes(queries)),
+                                 lambda scanned: progress(scanned, reader.bytes_read, body_end - body_start))
+        finally:
+            reader.close()
+        progress(count, body_end - body_start, body_end - body_start)
+
+    _recordScan(count, start_time)
+    return [query.result() for query in queries]
+
+
+"""
+Desc: Answer a batch of queries by scanning shards of the DBLP dump in parallel. The dump is split into byte ranges
+aligned on top-level elements; each shard is parsed in a worker process with the dump's DTD (so the character
+entities resolve as in a full scan), and the per-shard aggregations are merged in dump order.
+Input: List of ScanQuery objects, path of dblp.xml, number of worker processes (all cores by default), number of
+shards (SHARDS_PER_WORKER per worker by default), optional progress callback (see runScan) called after every shard
+Output: List of the query results, in the order of the queries
+"""
+
+
+def runParallelScan(queries, dblp_path=None, workers=None, shards=None, progress=None):
+
+    start_time = time.time()
+    dblp_path = dblp_path if dblp_path is not None else defaultDBLPPath()
+    workers = workers if workers is not None else os.cpu_count()
+    shards = shards if shards is not None else workers * SHARDS_PER_WORKER
+    prolog, _, _ = readDumpProlog(dblp_path)
+    boundaries = findShardBoundaries(dblp_path, shards)
+
+    logger.info("Answering %d queries over %d shards of the DBLP file with %d workers..", len(queries),
+                len(boundaries), workers)
+    count = 0
+    bytes_done = 0
+    bytes_total = boundaries[-1][1] - boundaries[0][0]
+    pickled_queries = pickle.dumps(queries)  # the queries are merged into while later shards are still submitted
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        tasks = [(dblp_path, prolog, start, end, pickled_queries) for (start, end) in boundaries]
+        for (start, end), (shard_count, shard_queries) in zip(boundaries, executor.map(_scanShard, tasks)):
+            for query, shard_query in zip(queries, shard_queries):
+                query.merge(shard_query)
+            count = count + shard_count
+            bytes_done = bytes_done + end - start
+            if progress is not None:
+                progress(count, bytes_done, bytes_total)
+    except BaseException:
+        executor.shutdown(wait=False, cancel_futures=True)  # aborted (e.g., cancelled job): drop pending shards
+        raise
+    executor.shutdown()
+
+    _recordScan(count, start_time)
+    return [query.result() for query in queries]
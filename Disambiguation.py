@@ -0,0 +1,172 @@
+"""
+Desc: Batch disambiguation of DBLP pages that mix the papers of several persons sharing a name. The papers of each
+page are clustered by shared coauthors through an inverted index (coauthor -> papers) and a union-find structure,
+without comparing papers pairwise. Clusters of other persons (disconnected from the person's cluster, large
+enough, and at other venues or years) are reported as false positives, in the form of the dblp_url_dict taken by
+readAuthorDBLP.
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from DBLP import xmlifyAdd, readRecordsDBLP
+from DBLPFetcher import fetcher
+
+
+logger = logging.getLogger(__name__)
+
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]  # path halving
+        i = parent[i]
+    return i
+
+
+def _union(parent, size, i, j):
+    i = _find(parent, i)
+    j = _find(parent, j)
+    if i == j:
+        return
+    if size[i] < size[j]:
+        i, j = j, i
+    parent[j] = i
+    size[i] = size[i] + size[j]
+
+
+"""
+Desc: Cluster the papers of a page by shared coauthors
+Input: List of papers (see readRecordsDBLP), names of the page owner (not counted as shared coauthors), minimum
+number of shared coauthors for two papers to be put in the same cluster
+Output: List of clusters (lists of paper indices), largest first; papers without coauthors form no cluster
+"""
+
+
+def recordClusters(records, person_names, min_shared=1):
+
+    coauthor_index = dict()  # coauthor -> indices of the papers with the coauthor
+    for i, record in enumerate(records):
+        for coauthor in record[3]:
+            if coauthor not in person_names:
+                coauthor_index.setdefault(coauthor, []).append(i)
+
+    parent = list(range(len(records)))
+    size = [1] * len(records)
+    if min_shared <= 1:
+        for postings in coauthor_index.values():
+            for i in postings[1:]:
+                _union(parent, size, postings[0], i)
+    else:
+        for i, record in enumerate(records):
+            shared = Counter()  # later paper -> number of coauthors shared with paper i
+            for coauthor in record[3]:
+                for j in coauthor_index.get(coauthor, ()):
+                    if j > i:
+                        shared[j] = shared[j] + 1
+            for j, count in shared.items():
+                if count >= min_shared:
+                    _union(parent, size, i, j)
+
+    clusters = dict()
+    for i, record in enumerate(records):
+        if any(coauthor not in person_names for coauthor in record[3]):
+            clusters.setdefault(_find(parent, i), []).append(i)
+    return sorted(clusters.values(), key=lambda cluster: (-len(cluster), cluster[0]))
+
+
+def _venue(record):
+    # Venue of a paper from its DBLP key, e.g., conf/icse for conf/icse/Smith20
+    return record[4].rsplit('/', 1)[0] if record[4] else None
+
+
+"""
+Desc: False positive papers of a page. The clusters are disconnected by construction (no shared coauthor with the
+person's cluster); a cluster is only reported when it is large enough to be a person of its own and, in addition, it
+shares no venue with the person's cluster or lies outside the years of the person's cluster. Papers whose coauthors
+appear nowhere else on the page (singleton clusters) are therefore kept.
+Input: List of papers (see readRecordsDBLP), names of the page owner, minimum number of shared coauthors, optional set
+of coauthors known to belong to the person (the cluster sharing most of them is the person's; the largest otherwise),
+minimum number of papers of a reported cluster
+Output: Set of the urls of the papers of the reported clusters. Papers without coauthors are kept.
+"""
+
+
+def falsePositivePapers(records, person_names, min_shared=1, known_coauthors=None, min_cluster_size=2):
+
+    clusters = recordClusters(records, person_names, min_shared)
+    if len(clusters) < 2:
+        return set()
+    person_cluster = 0
+    if known_coauthors:
+        overlap = [sum(1 for i in cluster for coauthor in records[i][3] if coauthor in known_coauthors)
+                   for cluster in clusters]
+        if max(overlap) > 0:
+            person_cluster = overlap.index(max(overlap))
+
+    person_venues = {_venue(records[i]) for i in clusters[person_cluster]} - {None}
+    person_years = [records[i][2] for i in clusters[person_cluster] if records[i][2]]
+    false_positives = set()
+    for k, cluster in enumerate(clusters):
+        if k == person_cluster or len(cluster) < max(min_cluster_size, 1):
+            continue
+        venues = {_venue(records[i]) for i in cluster} - {None}
+        years = [records[i][2] for i in cluster if records[i][2]]
+        other_venues = len(person_venues) > 0 and len(venues) > 0 and venues.isdisjoint(person_venues)
+        other_years = (len(person_years) > 0 and len(years) > 0 and
+                       (max(years) < min(person_years) or min(years) > max(person_years)))
+        if other_venues or other_years:
+            false_positives.update(records[i][0] for i in cluster if records[i][0] is not None)
+    return false_positives
+
+
+def _disambiguatePage(xml_data, min_shared, known_coauthors, min_cluster_size):
+    person_file_name, person_name_set, records, _ = readRecordsDBLP(xml_data)
+    false_positives = falsePositivePapers(records, person_name_set, min_shared, known_coauthors, min_cluster_size)
+    logger.info("Disambiguated %s: %d of %d papers are false positives", person_file_name, len(false_positives),
+                len(records))
+    return false_positives
+
+
+"""
+Desc: Fetch and disambiguate the pages of many homonymous DBLP authors concurrently
+Input: List of web addresses of DBLP authors, minimum number of shared coauthors, optional dictionary web address ->
+set of coauthors known to belong to the person, minimum number of papers of a reported cluster
+Output: Dictionary web address -> set of false positive paper urls (dblp_url_dict of readAuthorDBLP); pages that
+could not be retrieved are left out
+"""
+
+
+async def fetchFalsePositives(dblp_urls, min_shared=1, known_coauthors_dict=None, min_cluster_size=2):
+
+    known_coauthors_dict = known_coauthors_dict or dict()
+
+    async def disambiguateOne(dblp_url):
+        xml_data = await fetcher.fetch(xmlifyAdd(dblp_url))
+        if not xml_data:
+            logger.warning('DBLP page of %s could not be retrieved for disambiguation', dblp_url)
+            return dblp_url, None
+        return dblp_url, await asyncio.to_thread(_disambiguatePage, xml_data, min_shared,
+                                                 known_coauthors_dict.get(dblp_url), min_cluster_size)
+
+    dblp_url_dict = dict()
+    for dblp_url, false_positives in await asyncio.gather(*[disambiguateOne(dblp_url)
+                                                            for dblp_url in dict.fromkeys(dblp_urls)]):
+        if false_positives is not None:
+            dblp_url_dict[dblp_url] = false_positives
+    return dblp_url_dict
+
+
+"""
+Desc: Synchronous batch disambiguation for scripts (see fetchFalsePositives)
+"""
+
+
+def getFalsePositives(dblp_urls, min_shared=1, known_coauthors_dict=None, min_cluster_size=2):
+
+    async def collect():
+        try:
+            return await fetchFalsePositives(dblp_urls, min_shared, known_coauthors_dict, min_cluster_size)
+        finally:
+            await fetcher.aclose()
+
+    return asyncio.run(collect())
@@ -0,0 +1,358 @@
+"""
+Desc: Background jobs for long-running DBLP work (topic searches and venue statistics over the dump, batch retrieval
+of author profiles). A job runs in the background and records a sequence of events: progress with an ETA, partial
+results as they are found, and the final result. Clients follow the events as NDJSON or Server-Sent Events and may
+cancel the job at any time.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from itertools import islice
+from DBLP import aggregateCandidates
+from DBLPIndex import indexAvailable, indexedKeywordsSearch, indexedVenueAuthorStats
+from DBLPScan import runScan, MultiKeywordSearchQuery, VenueAuthorStatsQuery
+from DBLPDump import defaultDBLPPath
+from DBLPProfiles import fetchDBLPProfiles
+
+
+JOB_TTL = float(os.environ.get('DBLP_JOB_TTL', '3600'))  # seconds a finished job and its events are kept
+JOB_POLL_INTERVAL = 0.25  # seconds between two checks for new events of a streamed job
+PROGRESS_INTERVAL = 1.0  # minimum seconds between two progress events
+RESULT_CHUNK = 1000  # entries per event when a large result is streamed
+
+logger = logging.getLogger(__name__)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+"""
+Desc: State and events of a background job. Events are dictionaries with a "type" (progress, partial result types,
+result, error, cancelled) and a sequence number "seq".
+Input: Kind of job, parameters (reported back to clients)
+"""
+
+
+class Job:
+
+    def __init__(self, kind, params):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params
+        self.status = 'running'
+        self.events = []
+        self.created = time.time()
+        self.finished = None
+        self.progress = None
+        self.task = None  # asyncio task of asynchronous work
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._last_progress = 0.0
+
+    """
+    Desc: Record an event
+    """
+
+    def emit(self, event_type, **data):
+
+        with self._lock:
+            data['type'] = event_type
+            data['seq'] = len(self.events)
+            self.events.append(data)
+
+    """
+    Desc: Record the progress of the job, with an ETA extrapolated from the elapsed time (at most one event per
+    PROGRESS_INTERVAL, except for the last one)
+    Input: Units done, units in total, name of the unit (e.g., bytes, authors)
+    """
+
+    def reportProgress(self, done, total, unit):
+
+        elapsed = time.time() - self.created
+        eta = elapsed * (total - done) / done if done > 0 and total > 0 else None
+        self.progress = {'done': done, 'total': total, 'unit': unit,
+                         'percent': round(100.0 * done / total, 1) if total > 0 else None,
+                         'eta_seconds': round(eta, 1) if eta is not None else None}
+        if time.time() - self._last_progress >= PROGRESS_INTERVAL or done >= total:
+            self._last_progress = time.time()
+            self.emit('progress', **self.progress)
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    """
+    Desc: Abort the work of the job if it was cancelled (called by the work at safe points)
+    """
+
+    def checkCancelled(self):
+
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def finish(self, status, **data):
+        if status == 'failed':
+            self.emit('error', **data)
+        elif status == 'cancelled':
+            self.emit('cancelled')
+        self.status = status
+        self.finished = time.time()
+
+    """
+    Desc: Description of the job for the API
+    """
+
+    def summary(self):
+
+        return {'id': self.id, 'kind': self.kind, 'params': self.params, 'status': self.status,
+                'progress': self.progress, 'events': len(self.events), 'created': self.created,
+                'finished': self.finished}
+
+    """
+    Desc: Follow the events of the job
+    Input: Sequence number of the first event to produce
+    Output: Asynchronous generator of events, ending once the job is finished and all its events were produced
+    """
+
+    async def follow(self, since=0):
+
+        seq = since
+        while True:
+            finished = self.status != 'running'
+            while seq < len(self.events):
+                yield self.events[seq]
+                seq = seq + 1
+            if finished:
+                return
+            await asyncio.sleep(JOB_POLL_INTERVAL)
+
+
+"""
+Desc: Event as one line of NDJSON
+"""
+
+
+def ndjsonEvent(event):
+
+    return json.dumps(event) + "\n"
+
+
+"""
+Desc: Event as a Server-Sent Event (the sequence number is the event id, so a client can resume with since)
+"""
+
+
+def sseEvent(event):
+
+    return "id: %d\nevent: %s\ndata: %s\n\n" % (event['seq'], event['type'], json.dumps(event))
+
+
+"""
+Desc: Registry of the jobs of the process. Work functions receive the job and emit their events through it; blocking
+work runs in a thread, asynchronous work as a task of the event loop.
+"""
+
+
+class JobManager:
+
+    def __init__(self):
+        self.jobs = dict()
+        self._lock = threading.Lock()
+
+    def _register(self, kind, params):
+        self._prune()
+        job = Job(kind, params)
+        with self._lock:
+            self.jobs[job.id] = job
+        return job
+
+    def _prune(self):
+        # Forget jobs finished more than JOB_TTL seconds ago
+        now = time.time()
+        with self._lock:
+            for job_id in [job_id for job_id, job in self.jobs.items()
+                           if job.finished is not None and now - job.finished > JOB_TTL]:
+                del self.jobs[job_id]
+
+    @staticmethod
+    def _finishWith(job, error):
+        if isinstance(error, (JobCancelled, asyncio.CancelledError)) or job.cancelled:
+            job.finish('cancelled')
+        else:
+            logger.error('Job %s failed: %s', job.id, error)
+            job.finish('failed', message=str(error))
+
+    """
+    Desc: Start a blocking work function in a background thread
+    Input: Kind of job, parameters, work function taking the job
+    Output: Job
+    """
+
+    def startThread(self, kind, params, work):
+
+        job = self._register(kind, params)
+
+        def run():
+            try:
+                work(job)
+                job.finish('done')
+            except BaseException as err:
+                self._finishWith(job, err)
+
+        threading.Thread(target=run, name='job-%s' % job.id, daemon=True).start()
+        return job
+
+    """
+    Desc: Start an asynchronous work function as a task of the running event loop
+    Input: Kind of job, parameters, coroutine function taking the job
+    Output: Job
+    """
+
+    def startTask(self, kind, params, work):
+
+        job = self._register(kind, params)
+
+        async def run():
+            try:
+                await work(job)
+                job.finish('done')
+            except (Exception, asyncio.CancelledError) as err:
+                self._finishWith(job, err)
+
+        job.task = asyncio.get_running_loop().create_task(run())
+        return job
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    def list(self):
+        self._prune()
+        return [job.summary() for job in list(self.jobs.values())]
+
+    """
+    Desc: Cancel a job
+    Output: False if the job is unknown
+    """
+
+    def cancel(self, job_id):
+
+        job = self.jobs.get(job_id)
+        if job is None:
+            return False
+        job.cancel()
+        if job.task is not None:
+            job.task.cancel()
+        return True
+
+
+job_manager = JobManager()  # jobs of the /jobs routes
+
+
+def _scanProgress(job):
+    # Progress callback of runScan reporting the bytes of the dump read so far
+    def progress(count, bytes_done, bytes_total):
+        job.checkCancelled()
+        job.reportProgress(bytes_done, bytes_total, 'bytes')
+    return progress
+
+
+def _emitChunks(job, event_type, items):
+    # Emit a large dictionary in events of RESULT_CHUNK entries
+    items = list(items)
+    for start in range(0, len(items), RESULT_CHUNK):
+        job.checkCancelled()
+        job.emit(event_type, **{event_type: dict(items[start:start + RESULT_CHUNK])})
+
+
+def _emitPapers(job, title_venue_dict, title_authors_dict, title_keywords_dict, start):
+    # Emit the papers found after the first start ones (titles are kept in order of discovery); return the count
+    titles = list(islice(title_authors_dict.keys(), start, None))
+    if titles:
+        job.emit('papers', papers=[{'title': title, 'venue': title_venue_dict[title],
+                                    'authors': sorted(title_authors_dict[title]),
+                                    'keywords': sorted(title_keywords_dict[title])} for title in titles])
+    return start + len(titles)
+
+
+"""
+Desc: Work of a candidate search job: papers on any of the key words in the venue set (see searchDBLPforPC). The
+papers are streamed as they are found ("papers" events), then the candidates with their number of papers and venues
+("result" event).
+"""
+
+
+def candidateSearchWork(key_words, venue_set, dblp_path=None):
+
+    def work(job):
+        path = dblp_path if dblp_path is not None else defaultDBLPPath()
+        if indexAvailable(dblp_path=path):  # answer from the prebuilt index (see DBLPIndex.py)
+            title_venue_dict, title_authors_dict, title_keywords_dict = indexedKeywordsSearch(key_words, venue_set)
+            _emitPapers(job, title_venue_dict, title_authors_dict, title_keywords_dict, 0)
+        else:
+            query = MultiKeywordSearchQuery(key_words, venue_set)
+            progress = _scanProgress(job)
+            emitted = [0]
+
+            def reportPapers(count, bytes_done, bytes_total):
+                progress(count, bytes_done, bytes_total)
+                emitted[0] = _emitPapers(job, query.title_venue_dict, query.title_authors_dict,
+                                        query.title_keywords_dict, emitted[0])
+
+            title_venue_dict, title_authors_dict, _ = runScan([query], path, progress=reportPapers)[0]
+
+        author_venue_dict, author_count_dict = aggregateCandidates(title_venue_dict, title_authors_dict)
+        job.emit('result', candidates={author: {'papers': author_count_dict[author],
+                                                'venues': sorted(author_venue_dict[author])}
+                                       for author in author_venue_dict})
+
+    return work
+
+
+"""
+Desc: Work of a venue statistics job (see generateVenueBasedAuthorStats): progress while the dump is scanned, then the
+(venue, year) list of every author in "authors" events of RESULT_CHUNK authors
+"""
+
+
+def venueStatsWork(venue_set, dblp_path=None):
+
+    def work(job):
+        path = dblp_path if dblp_path is not None else defaultDBLPPath()
+        if indexAvailable(dblp_path=path):
+            author_hist_dict = indexedVenueAuthorStats(venue_set)
+        else:
+            author_hist_dict, = runScan([VenueAuthorStatsQuery(venue_set)], path, progress=_scanProgress(job))
+        job.emit('summary', authors=len(author_hist_dict))
+        _emitChunks(job, 'authors', author_hist_dict.items())
+
+    return work
+
+
+"""
+Desc: Work of a batch profile job: one "profile" event per author as soon as the author's page is parsed
+(see fetchDBLPProfiles)
+"""
+
+
+def profileBatchWork(dblp_urls):
+
+    async def work(job):
+        total = len(dict.fromkeys(dblp_urls))
+        done = 0
+        job.reportProgress(done, total, 'authors')
+        async for result in fetchDBLPProfiles(dblp_urls):
+            job.checkCancelled()
+            done = done + 1
+            job.emit('profile', profile=result)
+            job.reportProgress(done, total, 'authors')
+
+    return work
@@ -0,0 +1,67 @@
+"""
+Desc: Bounded in-memory LRU cache with hit/miss counters, used to memoize parse results.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+"""
+Desc: Thread-safe least-recently-used mapping of at most maxsize entries.
+Input: Maximum number of entries, name reported in the statistics
+"""
+
+
+class LRUCache:
+
+    def __init__(self, maxsize, name='cache'):
+        self.maxsize = maxsize
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    """
+    Desc: Look up a key and mark it as recently used
+    Output: The cached value, or None on a miss
+    """
+
+    def get(self, key):
+
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses = self.misses + 1
+                return None
+            self._data.move_to_end(key)
+            self.hits = self.hits + 1
+            return value
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    """
+    Desc: Usage statistics of the cache
+    """
+
+    def stats(self):
+
+        lookups = self.hits + self.misses
+        return {'name': self.name, 'entries': len(self._data), 'max_entries': self.maxsize, 'hits': self.hits,
+                'misses': self.misses, 'hit_ratio': round(self.hits / lookups, 4) if lookups > 0 else 0.0}
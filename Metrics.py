@@ -0,0 +1,255 @@
+"""
+Desc: Instrumentation of the hot paths. Timing spans around the fetch, parse and aggregate stages, counters of bytes
+downloaded and records parsed, and gauges collected from the caches are kept in a process-wide registry and rendered
+in the Prometheus text format (GET /metrics). A sampling profiler records the stacks of a single request on demand.
+Logging is configured here as well (DBLP_LOG_LEVEL, INFO by default).
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter as StackCounter
+from contextlib import contextmanager
+
+
+LOG_LEVEL = os.environ.get('DBLP_LOG_LEVEL', 'INFO').upper()
+PROFILE_INTERVAL = float(os.environ.get('DBLP_PROFILE_INTERVAL', '0.005'))  # seconds between two stack samples
+PROFILE_MAX_DEPTH = 64  # frames kept per sampled stack
+IDLE_FRAMES = frozenset(('wait', 'select', '_worker', 'get', 'accept', 'serve_forever'))  # threads waiting for work
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+"""
+Desc: Configure the logging of the app once (level from DBLP_LOG_LEVEL: DEBUG, INFO, WARNING, ERROR or OFF)
+"""
+
+
+def configureLogging(level=None):
+
+    level = (level or LOG_LEVEL).upper()
+    root = logging.getLogger()
+    if not root.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+        root.addHandler(handler)
+    root.setLevel(logging.CRITICAL + 1 if level == 'OFF' else getattr(logging, level, logging.INFO))
+    logging.getLogger('httpx').setLevel(max(root.level, logging.WARNING))  # one line per request otherwise
+
+
+def _labelText(labels):
+    if not labels:
+        return ''
+    return '{%s}' % ','.join('%s="%s"' % (name, str(value).replace('\\', '\\\\').replace('"', '\\"')
+                                          .replace('\n', '\\n')) for name, value in labels)
+
+
+"""
+Desc: Monotonic counter with optional labels
+Input: Name, help text
+"""
+
+
+class Counter:
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self._values = dict()  # sorted label pairs -> value
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(sorted(labels.items())), 0)
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, key, value) for key, value in self._values.items()]
+
+
+"""
+Desc: Histogram of durations (or sizes) with cumulative buckets, as Prometheus expects
+Input: Name, help text, upper bounds of the buckets
+"""
+
+
+class Histogram:
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, buckets=STAGE_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._series = dict()  # sorted label pairs -> [bucket counts..., count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] = series[i] + 1
+                    break
+            series[-2] = series[-2] + 1
+            series[-1] = series[-1] + value
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            for key, series in self._series.items():
+                cumulative = 0
+                for bound, count in zip(self.buckets, series):
+                    cumulative = cumulative + count
+                    samples.append((self.name + '_bucket', key + (('le', repr(float(bound))),), cumulative))
+                samples.append((self.name + '_bucket', key + (('le', '+Inf'),), series[-2]))
+                samples.append((self.name + '_count', key, series[-2]))
+                samples.append((self.name + '_sum', key, series[-1]))
+        return samples
+
+
+"""
+Desc: Registry of the metrics of the process. Collectors are functions called at rendering time that return gauges
+read from other components (e.g., the hits of a cache) as a list of (name, help text, labels dict, value).
+"""
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self.metrics = dict()
+        self.collectors = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            return self.metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help_text):
+        return self._register(Counter(name, help_text))
+
+    def histogram(self, name, help_text, buckets=STAGE_BUCKETS):
+        return self._register(Histogram(name, help_text, buckets))
+
+    def addCollector(self, collector):
+        self.collectors.append(collector)
+
+    """
+    Desc: Metrics in the Prometheus text exposition format (version 0.0.4)
+    """
+
+    def render(self):
+
+        lines = []
+        for metric in list(self.metrics.values()):
+            lines.append('# HELP %s %s' % (metric.name, metric.help))
+            lines.append('# TYPE %s %s' % (metric.name, metric.kind))
+            for name, labels, value in metric.samples():
+                lines.append('%s%s %s' % (name, _labelText(labels), _number(value)))
+        gauges = dict()  # name -> (help text, [(labels, value)])
+        for collector in self.collectors:
+            try:
+                for name, help_text, labels, value in collector():
+                    gauges.setdefault(name, (help_text, []))[1].append((tuple(sorted(labels.items())), value))
+            except Exception as err:  # a failing component must not break the other metrics
+                logging.getLogger(__name__).warning('Metrics collector %s failed: %s', collector, err)
+        for name, (help_text, series) in gauges.items():
+            lines.append('# HELP %s %s' % (name, help_text))
+            lines.append('# TYPE %s gauge' % name)
+            for labels, value in series:
+                lines.append('%s%s %s' % (name, _labelText(labels), _number(value)))
+        return '\n'.join(lines) + '\n'
+
+
+def _number(value):
+    if isinstance(value, float):
+        return repr(value) if value == value else 'NaN'
+    return str(int(value))
+
+
+metrics = MetricsRegistry()  # registry of the process, rendered by GET /metrics
+
+stage_seconds = metrics.histogram('dblp_stage_seconds', 'Time spent in each stage (fetch, parse, aggregate, scan)')
+bytes_downloaded = metrics.counter('dblp_downloaded_bytes_total', 'Bytes of DBLP pages downloaded')
+pages_fetched = metrics.counter('dblp_pages_fetched_total', 'DBLP pages requested, by outcome')
+records_parsed = metrics.counter('dblp_records_parsed_total', 'Publications parsed, by source (page or dump)')
+http_requests = metrics.counter('dblp_http_requests_total', 'Requests handled by the app, by route and status')
+http_seconds = metrics.histogram('dblp_http_request_seconds', 'Time spent handling requests, by route')
+
+
+"""
+Desc: Timing span: the time spent in the block is observed in dblp_stage_seconds under the stage label
+Input: Name of the stage
+"""
+
+
+@contextmanager
+def span(stage):
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage_seconds.observe(time.perf_counter() - start, stage=stage)
+
+
+"""
+Desc: Sampling profiler: a background thread samples the stacks of all threads every PROFILE_INTERVAL seconds (the
+profiled code is not slowed down by tracing). The samples are reported as collapsed stacks, one line per distinct
+stack with its number of samples, the input format of flame graph tools.
+"""
+
+
+class SamplingProfiler:
+
+    def __init__(self, interval=PROFILE_INTERVAL):
+        self.interval = interval
+        self.samples = 0
+        self.stacks = StackCounter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                if frame.f_code.co_name in IDLE_FRAMES:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < PROFILE_MAX_DEPTH:
+                    code = frame.f_code
+                    stack.append('%s (%s:%d)' % (code.co_name, os.path.basename(code.co_filename), frame.f_lineno))
+                    frame = frame.f_back
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples = self.samples + 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._sample, name='sampling-profiler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self
+
+    """
+    Desc: Collapsed stacks, most sampled first
+    """
+
+    def collapsed(self):
+
+        return ''.join('%s %d\n' % (stack, count) for stack, count in self.stacks.most_common())
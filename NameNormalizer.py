@@ -0,0 +1,84 @@
+"""
+Desc: Normalization of DBLP author names, shared by the page parsers, the dump scans and the candidate services. A
+name is normalized once (lower case, unidecoded) and the result is memoized, as the same coauthor names occur over and
+over across pages and dumps. The DBLP homonym number of a name ("Wei Wang 0001") is split off the same way, and the
+canonical name is interned in the name table shared by the compact profiles.
+"""
+
+import os
+from collections import namedtuple
+from functools import lru_cache
+from unidecode import unidecode
+from CompactProfile import name_table
+
+
+NAME_CACHE_SIZE = int(os.environ.get('DBLP_NAME_CACHE_SIZE', '262144'))  # distinct names memoized per function
+
+NameInfo = namedtuple('NameInfo', ['canonical', 'base', 'suffix', 'id'])
+
+
+"""
+Desc: Canonical form of a name (lower case, unidecoded), as used for the coauthor sets and histograms
+"""
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def canonicalName(name):
+
+    return unidecode(name.lower()) if name else ''
+
+
+"""
+Desc: Split the DBLP homonym number off a name
+Output: (name without the number, number as a string), or (name, None) if the name has no number
+"""
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def splitHomonym(name):
+
+    words = name.split() if name else []
+    if len(words) > 0 and words[-1].isnumeric():
+        return ' '.join(words[:-1]), words[-1]
+    return ' '.join(words), None
+
+
+"""
+Desc: DBLP homonym number of a name, or None
+"""
+
+
+def homonymSuffix(name):
+
+    return splitHomonym(name)[1]
+
+
+"""
+Desc: Canonical name, name without homonym number, homonym number and id in the name table of a name, e.g., for a
+candidate entering the selection graph. The page parsers only take the canonical name: the ids of their names are
+assigned once, when the parsed profile is compacted (see CompactProfile).
+Input: Name as in DBLP, name table (the one shared by the compact profiles by default)
+Output: NameInfo
+"""
+
+
+def normalizeName(name, table=name_table):
+
+    canonical = canonicalName(name)
+    base, suffix = splitHomonym(canonical)
+    return NameInfo(canonical, base, suffix, table.intern(canonical))
+
+
+"""
+Desc: Hits and misses of the memoized normalizations
+"""
+
+
+def nameCacheStats():
+
+    stats = dict()
+    for function in (canonicalName, splitHomonym):
+        info = function.cache_info()
+        stats[function.__name__] = {'hits': info.hits, 'misses': info.misses, 'entries': info.currsize,
+                                    'max_entries': info.maxsize}
+    return stats
@@ -0,0 +1,206 @@
+"""
+Desc: Selection of the program committee among the candidates, as in the run_iteration route of server.ts, with the
+coauthor graph kept in memory between iterations. Two candidates are connected if a name of one of them appears among
+the coauthors of the other. Accept/decline decisions update the graph incrementally, and the least-connected
+greedy selection runs on a priority queue of connection counts.
+"""
+
+import heapq
+import threading
+from CompactProfile import name_table
+from NameNormalizer import normalizeName
+
+
+ACCEPTED = 'Accepted'
+DECLINED = 'Declined'
+
+
+"""
+Desc: In-memory coauthor graph of the candidate pool and the greedy PC selection over it.
+Input: Name table of the candidate profiles (the shared one by default)
+"""
+
+
+class SelectionService:
+
+    def __init__(self, table=name_table):
+        self.table = table
+        self._lock = threading.Lock()
+        self._keys = []  # candidate index -> key (lower case candidate name)
+        self._index = dict()  # key -> candidate index
+        self._names = []  # candidate index -> set of name ids denoting the candidate
+        self._coauthors = []  # candidate index -> set of name ids of the coauthors
+        self._decision = []  # candidate index -> None, ACCEPTED or DECLINED
+        self._present = []  # candidate index -> False once the candidate is removed
+        self._neighbors = []  # candidate index -> set of connected candidate indices (declined ones included)
+        self._name_index = dict()  # name id -> set of candidates denoted by the name
+        self._coauthor_index = dict()  # name id -> set of candidates who coauthored with the name
+        self._degree = []  # candidate index -> number of active neighbors
+        self._accepted = []  # candidate index -> number of accepted neighbors
+
+    def _active(self, i):
+        return self._present[i] and self._decision[i] != DECLINED
+
+    def _shift(self, i, counts, change):
+        # Add change to counts[j] of every neighbor j of candidate i
+        for j in self._neighbors[i]:
+            counts[j] = counts[j] + change
+
+    """
+    Desc: Add a candidate, or replace the profile of a known one
+    Input: Candidate name, CompactProfile of the candidate (None if unknown), decision (None, Accepted or Declined)
+    """
+
+    def addCandidate(self, name, profile=None, decision=None):
+
+        key = name.lower()
+        with self._lock:
+            if key in self._index:
+                self._detach(self._index[key])
+                i = self._index[key]
+            else:
+                i = len(self._keys)
+                self._index[key] = i
+                self._keys.append(key)
+                self._names.append(set())
+                self._coauthors.append(set())
+                self._decision.append(None)
+                self._present.append(False)
+                self._neighbors.append(set())
+                self._degree.append(0)
+                self._accepted.append(0)
+
+            names = {normalizeName(key, self.table).id}
+            coauthors = set()
+            if profile is not None:
+                names.update(profile.names)
+                coauthors.update(profile.coauthors)
+            self._names[i] = names
+            self._coauthors[i] = coauthors
+            self._decision[i] = decision
+            self._present[i] = True
+
+            neighbors = set()
+            for name_id in names:  # candidates who coauthored with the new candidate
+                neighbors.update(self._coauthor_index.get(name_id, ()))
+            for name_id in coauthors:  # candidates the new candidate coauthored with
+                neighbors.update(self._name_index.get(name_id, ()))
+            neighbors.discard(i)
+            for name_id in names:
+                self._name_index.setdefault(name_id, set()).add(i)
+            for name_id in coauthors:
+                self._coauthor_index.setdefault(name_id, set()).add(i)
+
+            self._neighbors[i] = neighbors
+            for j in neighbors:
+                self._neighbors[j].add(i)
+            self._degree[i] = sum(1 for j in neighbors if self._active(j))
+            self._accepted[i] = sum(1 for j in neighbors if self._active(j) and self._decision[j] == ACCEPTED)
+            self._attach(i)
+
+    def _attach(self, i):
+        # Count candidate i in the degrees of its neighbors according to its decision
+        if self._active(i):
+            self._shift(i, self._degree, 1)
+            if self._decision[i] == ACCEPTED:
+                self._shift(i, self._accepted, 1)
+
+    def _detach(self, i):
+        # Remove candidate i from the graph and the indices
+        if self._active(i):
+            self._shift(i, self._degree, -1)
+            if self._decision[i] == ACCEPTED:
+                self._shift(i, self._accepted, -1)
+        for j in self._neighbors[i]:
+            self._neighbors[j].discard(i)
+        for name_id in self._names[i]:
+            self._name_index[name_id].discard(i)
+        for name_id in self._coauthors[i]:
+            self._coauthor_index[name_id].discard(i)
+        self._neighbors[i] = set()
+        self._present[i] = False
+
+    """
+    Desc: Remove a candidate from the pool
+    Output: False if the candidate is unknown
+    """
+
+    def removeCandidate(self, name):
+
+        with self._lock:
+            i = self._index.get(name.lower())
+            if i is None or not self._present[i]:
+                return False
+            self._detach(i)
+            return True
+
+    """
+    Desc: Record the decision of a candidate (delta update of the connection counts of the neighbors)
+    Input: Candidate name, decision (None, Accepted or Declined)
+    Output: False if the candidate is unknown
+    """
+
+    def setDecision(self, name, decision):
+
+        with self._lock:
+            i = self._index.get(name.lower())
+            if i is None or not self._present[i]:
+                return False
+            if self._active(i):
+                self._shift(i, self._degree, -1)
+                if self._decision[i] == ACCEPTED:
+                    self._shift(i, self._accepted, -1)
+            self._decision[i] = decision
+            self._attach(i)
+            return True
+
+    """
+    Desc: Select the program committee: the accepted candidates, completed up to pc_size by repeatedly adding the
+    candidate with the fewest connections to the candidates selected so far (the first one in order of addition on
+    ties). Without accepted candidates, the pc_size least connected candidates are selected.
+    Input: Size of the program committee
+    Output: List of selected candidate names
+    """
+
+    def select(self, pc_size):
+
+        with self._lock:
+            active = [i for i in range(len(self._keys)) if self._active(i)]
+            selected = [i for i in active if self._decision[i] == ACCEPTED]
+            if len(selected) == 0:
+                selected = [i for _, i in heapq.nsmallest(pc_size, ((self._degree[i], i) for i in active))]
+                return [self._keys[i] for i in selected]
+
+            connections = list(self._accepted)
+            chosen = set(selected)
+            heap = [(connections[i], i) for i in active if i not in chosen]
+            heapq.heapify(heap)
+            while len(selected) < pc_size and heap:
+                count, i = heapq.heappop(heap)
+                if i in chosen or count != connections[i]:  # stale entry, the count has grown since
+                    continue
+                selected.append(i)
+                chosen.add(i)
+                for j in self._neighbors[i]:
+                    if self._active(j) and j not in chosen:
+                        connections[j] = connections[j] + 1
+                        heapq.heappush(heap, (connections[j], j))
+
+            return [self._keys[i] for i in selected]
+
+    """
+    Desc: Size of the candidate graph
+    """
+
+    def stats(self):
+
+        with self._lock:
+            active = [i for i in range(len(self._keys)) if self._active(i)]
+            return {'candidates': len(active),
+                    'accepted': sum(1 for i in active if self._decision[i] == ACCEPTED),
+                    'declined': sum(1 for i in range(len(self._keys)) if self._present[i] and
+                                    self._decision[i] == DECLINED),
+                    'connections': sum(self._degree[i] for i in active) // 2}
+
+
+selection = SelectionService()  # candidate pool of the /selection routes
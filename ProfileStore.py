@@ -0,0 +1,212 @@
+"""
+Desc: Persistent store of the coauthor profiles of DBLP authors for incremental refreshes. For every author, the
+papers of the page (key, mdate, year, coauthors) and the aggregated coauthor histogram are kept in SQLite. When the
+page changes, only the papers that were added, removed or modified are merged into the histogram; an unchanged page
+is not parsed at all.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from TitleMatcher import TitleSet, normalizeTitle
+
+
+PROFILE_STORE_PATH = os.environ.get('DBLP_PROFILE_STORE', os.path.join(os.getcwd(), 'DataStore', 'profiles.sqlite'))
+
+SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS authors (url TEXT PRIMARY KEY, digest TEXT NOT NULL, fingerprint TEXT NOT NULL, '
+    'person_name TEXT NOT NULL, names TEXT NOT NULL, affiliations TEXT NOT NULL, refreshed_at REAL NOT NULL)',
+    'CREATE TABLE IF NOT EXISTS records (url TEXT NOT NULL, key TEXT NOT NULL, mdate TEXT, paper_url TEXT, '
+    'title TEXT, year TEXT, coauthors TEXT NOT NULL, counted INTEGER NOT NULL, PRIMARY KEY (url, key)) WITHOUT ROWID',
+    'CREATE TABLE IF NOT EXISTS coauthor_years (url TEXT NOT NULL, coauthor TEXT NOT NULL, year TEXT NOT NULL, '
+    'count INTEGER NOT NULL, PRIMARY KEY (url, coauthor, year)) WITHOUT ROWID',
+]
+
+
+"""
+Desc: Fingerprint of the filters applied to the papers of an author (white list titles and false positive urls)
+"""
+
+
+def filterFingerprint(title_venue_dict, false_positives):
+
+    digest = hashlib.sha256()
+    digest.update(json.dumps(sorted({normalizeTitle(title) for title in title_venue_dict.keys()})).encode('utf-8'))
+    digest.update(json.dumps(sorted(url for url in false_positives if url is not None)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _recordKey(record, position):
+    # Key of a paper of a page: its DBLP key, or its url or position if the key is missing
+    paper_url, _, _, _, key, _ = record
+    if key is not None:
+        return key
+    return paper_url if paper_url is not None else '#%d' % position
+
+
+"""
+Desc: SQLite store of author profiles
+Input: Path of the database (DBLP_PROFILE_STORE, DataStore/profiles.sqlite by default)
+"""
+
+
+class ProfileStore:
+
+    def __init__(self, path=PROFILE_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = None
+        self.unchanged = 0  # refreshes answered without parsing
+        self.merged = 0  # refreshes merged paper by paper
+        self.papers_added = 0
+        self.papers_removed = 0
+
+    def _connect(self):
+        if self._db is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            for statement in SCHEMA:
+                self._db.execute(statement)
+            self._db.commit()
+        return self._db
+
+    """
+    Desc: Stored state of an author
+    Output: (digest of the page, filter fingerprint), or None if the author is not stored
+    """
+
+    def state(self, url):
+
+        with self._lock:
+            row = self._connect().execute('SELECT digest, fingerprint FROM authors WHERE url = ?', (url,)).fetchone()
+        return tuple(row) if row is not None else None
+
+    """
+    Desc: Stored profile of an author
+    Output: Tuple as returned by readAuthorDBLP, or None if the author is not stored
+    """
+
+    def profile(self, url):
+
+        with self._lock:
+            return self._profile(self._connect(), url)
+
+    def _profile(self, db, url):
+        row = db.execute('SELECT person_name, names, affiliations FROM authors WHERE url = ?', (url,)).fetchone()
+        if row is None:
+            return None
+        person_name, names, affiliations = row
+        cauthor_hist_dict = dict()
+        cauthor_freq_dict = dict()
+        for coauthor, year, count in db.execute('SELECT coauthor, year, count FROM coauthor_years WHERE url = ? '
+                                                'ORDER BY coauthor, year DESC', (url,)):
+            cauthor_hist_dict.setdefault(coauthor, []).append((year, count))
+            cauthor_freq_dict[coauthor] = cauthor_freq_dict.get(coauthor, 0) + count
+        year_set = {year for (year,) in db.execute('SELECT DISTINCT year FROM records WHERE url = ? AND counted = 1',
+                                                    (url,))}
+        return person_name, set(json.loads(names)), cauthor_hist_dict, cauthor_freq_dict, year_set, \
+            set(cauthor_hist_dict.keys()), set(json.loads(affiliations))
+
+    """
+    Desc: Mark an author as unchanged (the page has the stored digest and filters)
+    """
+
+    def touch(self, url):
+
+        with self._lock:
+            db = self._connect()
+            db.execute('UPDATE authors SET refreshed_at = ? WHERE url = ?', (time.time(), url))
+            db.commit()
+            self.unchanged = self.unchanged + 1
+
+    """
+    Desc: Merge a new version of the page of an author into the store. Papers whose key and mdate are stored are
+    kept; the others are added to or removed from the coauthor histogram. If the filters changed, the counted flag of
+    every stored paper is recomputed and applied the same way.
+    Input: Web address of the author, digest of the page, parsed page (see readRecordsDBLP), white list details
+    Output: Tuple as returned by readAuthorDBLP
+    """
+
+    def merge(self, url, digest, page, title_venue_dict, false_positives):
+
+        person_file_name, person_name_set, records, affl_set = page
+        white_list = TitleSet(title_venue_dict.keys())
+        false_positives = set(false_positives)
+        fingerprint = filterFingerprint(title_venue_dict, false_positives)
+
+        def counted(paper_url, title, year):
+            return year is not None and title not in white_list and paper_url not in false_positives
+
+        with self._lock:
+            db = self._connect()
+            stored = {key: (mdate, paper_url, title, year, coauthors, flag) for key, mdate, paper_url, title, year,
+                      coauthors, flag in db.execute('SELECT key, mdate, paper_url, title, year, coauthors, counted '
+                                                    'FROM records WHERE url = ?', (url,))}
+            current = dict()
+            for position, record in enumerate(records):
+                current.setdefault(_recordKey(record, position), record)
+
+            changes = []  # (coauthors, year, +1/-1) to apply to the histogram
+            removed = {key for key in stored if key not in current or current[key][5] != stored[key][0]}
+            for key in removed:
+                _, _, _, year, coauthors, flag = stored[key]
+                if flag:
+                    changes.append((json.loads(coauthors), year, -1))
+            db.executemany('DELETE FROM records WHERE url = ? AND key = ?', [(url, key) for key in removed])
+
+            for key in stored:  # papers kept, but counted differently under new filters
+                if key in removed:
+                    continue
+                _, paper_url, title, year, coauthors, flag = stored[key]
+                flag_now = counted(paper_url, title, year)
+                if flag_now != bool(flag):
+                    changes.append((json.loads(coauthors), year, 1 if flag_now else -1))
+                    db.execute('UPDATE records SET counted = ? WHERE url = ? AND key = ?', (int(flag_now), url, key))
+
+            added = [key for key in current if key not in stored or key in removed]
+            rows = []
+            for key in added:
+                paper_url, title, year, coauthors, _, mdate = current[key]
+                flag_now = counted(paper_url, title, year)
+                if flag_now:
+                    changes.append((sorted(coauthors), year, 1))
+                rows.append((url, key, mdate, paper_url, title, year, json.dumps(sorted(coauthors)), int(flag_now)))
+            db.executemany('INSERT INTO records (url, key, mdate, paper_url, title, year, coauthors, counted) '
+                           'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+
+            deltas = dict()
+            for coauthors, year, change in changes:
+                for coauthor in coauthors:
+                    deltas[(coauthor, year)] = deltas.get((coauthor, year), 0) + change
+            db.executemany('INSERT INTO coauthor_years (url, coauthor, year, count) VALUES (?, ?, ?, ?) '
+                           'ON CONFLICT (url, coauthor, year) DO UPDATE SET count = count + excluded.count',
+                           [(url, coauthor, year, change)
+                            for (coauthor, year), change in deltas.items() if change != 0])
+            db.execute('DELETE FROM coauthor_years WHERE url = ? AND count <= 0', (url,))
+            db.execute('INSERT OR REPLACE INTO authors (url, digest, fingerprint, person_name, names, affiliations, '
+                       'refreshed_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                       (url, digest, fingerprint, person_file_name, json.dumps(sorted(person_name_set)),
+                        json.dumps(sorted(affl_set)), time.time()))
+            db.commit()
+            self.merged = self.merged + 1
+            self.papers_added = self.papers_added + len(added)
+            self.papers_removed = self.papers_removed + len(removed)
+            return self._profile(db, url)
+
+    """
+    Desc: Counters of the store
+    """
+
+    def stats(self):
+
+        with self._lock:
+            authors = self._connect().execute('SELECT COUNT(*) FROM authors').fetchone()[0]
+        return {'path': self.path, 'authors': authors, 'unchanged': self.unchanged, 'merged': self.merged,
+                'papers_added': self.papers_added, 'papers_removed': self.papers_removed}
+
+
+profile_store = ProfileStore()  # used by refreshAuthorDBLP
@@ -0,0 +1,222 @@
+"""
+Desc: Rate limiting of the outbound traffic to DBLP. Every request to DBLP takes a token from a shared token bucket,
+which replaces fixed sleeps between requests. The bucket state lives in a small lock-protected file, so all processes
+of a host (e.g., several uvicorn workers and batch scripts) share one budget. A 429 response pauses every process for
+the Retry-After period and halves the rate, which then recovers gradually with successful requests.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+try:
+    import fcntl
+except ImportError:  # no file locking (Windows): the bucket is shared by the threads of a process only
+    fcntl = None
+
+
+DBLP_RATE = float(os.environ.get('DBLP_RATE', '1'))  # requests per second to DBLP
+DBLP_BURST = float(os.environ.get('DBLP_BURST', '5'))  # requests that may be sent at once after an idle period
+# File holding the shared bucket state, in a directory of the user (other users of the host cannot read or replace
+# it); set DBLP_RATE_STATE to an empty string to limit each process on its own
+RATE_STATE_PATH = os.environ.get('DBLP_RATE_STATE', os.path.join(
+    os.environ.get('XDG_RUNTIME_DIR') or os.path.join(os.path.expanduser('~'), '.cache'), 'dblp', 'ratelimit.json'))
+DEFAULT_RETRY_AFTER = 60.0  # seconds to pause after a 429 without a usable Retry-After header
+MIN_RATE_FACTOR = 1 / 16  # lowest fraction of the configured rate after repeated 429 responses
+RATE_RECOVERY = 0.05  # fraction of the configured rate regained per successful request
+
+logger = logging.getLogger(__name__)
+
+
+"""
+Desc: Seconds to wait according to a Retry-After header (delay in seconds or HTTP date)
+"""
+
+
+def retryAfterSeconds(value):
+
+    if value is None:
+        return DEFAULT_RETRY_AFTER
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
+"""
+Desc: Token bucket refilled at rate tokens per second up to burst tokens. A caller that finds the bucket empty
+reserves the next token and waits for it, so concurrent callers are served in order at the configured rate.
+Input: Rate in requests per second, burst size
+"""
+
+
+class TokenBucket:
+
+    def __init__(self, rate=DBLP_RATE, burst=DBLP_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._state = {'tokens': burst, 'updated': time.time(), 'blocked_until': 0.0, 'factor': 1.0}
+        self._lock = threading.Lock()
+        self.requests = 0  # tokens handed out by this process
+        self.throttled = 0  # requests that had to wait for a token
+        self.wait_seconds = 0.0  # total time spent waiting for tokens
+        self.max_wait = 0.0
+        self.rate_limited = 0  # 429 responses received by this process
+
+    def _update(self, change):
+        # Apply change to the bucket state under the lock and return its result
+        with self._lock:
+            return change(self._state)
+
+    def _take(self, state):
+        now = time.time()
+        rate = self.rate * state['factor']
+        state['tokens'] = min(self.burst, state['tokens'] + max(0.0, now - state['updated']) * rate)
+        state['updated'] = now
+        state['tokens'] = state['tokens'] - 1
+        wait = 0.0 if state['tokens'] >= 0 else -state['tokens'] / rate
+        return max(wait, state['blocked_until'] - now)
+
+    def _reserve(self):
+        wait = self._update(self._take)
+        self.requests = self.requests + 1
+        if wait > 0:
+            self.throttled = self.throttled + 1
+            self.wait_seconds = self.wait_seconds + wait
+            self.max_wait = max(self.max_wait, wait)
+        return wait
+
+    """
+    Desc: Wait for a token (blocking)
+    Output: Time waited in seconds
+    """
+
+    def acquire(self):
+
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    """
+    Desc: Wait for a token without blocking the event loop
+    Output: Time waited in seconds
+    """
+
+    async def acquireAsync(self):
+
+        wait = await asyncio.to_thread(self._reserve)  # the shared state is read and written under a file lock
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    """
+    Desc: Report a 429 response: pause all requests for the Retry-After period and halve the rate
+    Input: Value of the Retry-After header (may be None)
+    """
+
+    def penalize(self, retry_after=None):
+
+        pause = retryAfterSeconds(retry_after)
+
+        def change(state):
+            state['blocked_until'] = max(state['blocked_until'], time.time() + pause)
+            state['factor'] = max(MIN_RATE_FACTOR, state['factor'] / 2)
+            state['tokens'] = min(state['tokens'], 0.0)
+
+        self._update(change)
+        self.rate_limited = self.rate_limited + 1
+        logger.warning('DBLP rate limit hit, pausing requests for %s seconds.', round(pause, 1))
+
+    async def penalizeAsync(self, retry_after=None):
+        await asyncio.to_thread(self.penalize, retry_after)
+
+    """
+    Desc: Report a successful request, letting a reduced rate recover towards the configured rate
+    """
+
+    def reward(self):
+
+        if self._state['factor'] >= 1.0:  # nothing to recover (last known state)
+            return
+
+        def change(state):
+            state['factor'] = min(1.0, state['factor'] + RATE_RECOVERY)
+
+        self._update(change)
+
+    async def rewardAsync(self):
+        if self._state['factor'] < 1.0:
+            await asyncio.to_thread(self.reward)
+
+    """
+    Desc: Metrics of the limiter in this process
+    """
+
+    def stats(self):
+
+        return {'rate': self.rate, 'burst': self.burst, 'rate_factor': self._state['factor'],
+                'requests': self.requests, 'throttled': self.throttled,
+                'wait_seconds': round(self.wait_seconds, 3), 'max_wait_seconds': round(self.max_wait, 3),
+                'rate_limited_responses': self.rate_limited}
+
+
+"""
+Desc: Token bucket whose state is kept in a file locked with flock, shared by all processes of the user using the same
+file. The file is private to the user (mode 0600, no symbolic link followed); if it belongs to another user, the
+bucket is kept in the process instead.
+Input: Path of the state file, rate in requests per second, burst size
+"""
+
+
+class SharedTokenBucket(TokenBucket):
+
+    def __init__(self, state_path=RATE_STATE_PATH, rate=DBLP_RATE, burst=DBLP_BURST):
+        super().__init__(rate, burst)
+        self.state_path = state_path
+        self.shared = True
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(state_path)), mode=0o700, exist_ok=True)
+        except OSError as err:
+            logger.warning('Rate limit state directory cannot be created (%s), limiting this process only.', err)
+            self.shared = False
+
+    def _update(self, change):
+        if not self.shared:
+            return super()._update(change)
+        with self._lock:
+            try:
+                fd = os.open(self.state_path, os.O_RDWR | os.O_CREAT | getattr(os, 'O_NOFOLLOW', 0), 0o600)
+            except OSError as err:  # e.g., a symbolic link planted in place of the file
+                logger.warning('Rate limit state %s cannot be opened (%s), limiting this process only.',
+                               self.state_path, err)
+                self.shared = False
+                return change(self._state)
+            if os.fstat(fd).st_uid != os.getuid():
+                os.close(fd)
+                logger.warning('Rate limit state %s belongs to another user, limiting this process only.',
+                               self.state_path)
+                self.shared = False
+                return change(self._state)
+            with os.fdopen(fd, 'r+') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)  # released when the file is closed
+                try:
+                    self._state.update(json.loads(f.read() or '{}'))
+                except ValueError:  # unreadable state: start from the in-process one
+                    pass
+                result = change(self._state)
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(self._state))
+            return result
+
+
+limiter = SharedTokenBucket() if RATE_STATE_PATH and fcntl is not None else TokenBucket()  # used by every fetch path
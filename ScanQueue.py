@@ -0,0 +1,293 @@
+"""
+Desc: Persistent queue of scan jobs over the DBLP dump (all authors, homonymous authors, topic searches, venue
+statistics, proceedings). Jobs are recorded in SQLite and run in a pool of worker processes, so the web tier stays
+responsive and a failing scan cannot take a server process down. Identical jobs share one run: a job submitted while
+an identical one is queued or running joins it, and the result of a finished one is reused as long as the dump has not
+changed. Results are kept on disk as gzipped JSON.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import DBLP
+from DBLPDump import defaultDBLPPath
+
+
+SCAN_JOB_WORKERS = int(os.environ.get('DBLP_SCAN_JOBS', '2'))  # scan jobs running at the same time (each one may
+# use DBLP_SCAN_WORKERS processes of its own, see runScan)
+SCAN_JOB_DB = os.environ.get('DBLP_SCAN_DB', os.path.join(os.getcwd(), 'DataStore', 'scans.sqlite'))
+SCAN_RESULT_DIR = os.environ.get('DBLP_SCAN_RESULTS', os.path.join(os.getcwd(), 'DataStore', 'scans'))
+
+SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS scan_jobs (id TEXT PRIMARY KEY, kind TEXT NOT NULL, params TEXT NOT NULL, '
+    'dedup_key TEXT NOT NULL, status TEXT NOT NULL, submitted REAL NOT NULL, started REAL, finished REAL, '
+    'result_path TEXT, error TEXT)',
+    'CREATE INDEX IF NOT EXISTS scan_jobs_dedup ON scan_jobs (dedup_key, status)',
+    'CREATE INDEX IF NOT EXISTS scan_jobs_status ON scan_jobs (status, submitted)',
+]
+logger = logging.getLogger(__name__)
+
+COLUMNS = ('id', 'kind', 'params', 'dedup_key', 'status', 'submitted', 'started', 'finished', 'result_path', 'error')
+
+
+def _topicSearch(key_words, venues):
+    title_venue_dict, title_authors_dict, title_keywords_dict = DBLP.searchDBLPAuthorsByKeywords(key_words,
+                                                                                                 set(venues))
+    author_venue_dict, author_count_dict = DBLP.aggregateCandidates(title_venue_dict, title_authors_dict)
+    return {'papers': {title: {'venue': title_venue_dict[title], 'authors': title_authors_dict[title],
+                               'keywords': title_keywords_dict[title]} for title in title_authors_dict},
+            'candidates': {author: {'papers': author_count_dict[author], 'venues': author_venue_dict[author]}
+                           for author in author_venue_dict}}
+
+
+# Kind of scan job -> function computing its result from the job parameters
+SCAN_KINDS = {
+    'authors': lambda: DBLP.getDBLPAuthors(),
+    'homonyms': lambda: DBLP.retrieveDBLPHomonymousAuthors(),
+    'topic-search': _topicSearch,
+    'venue-stats': lambda venues: DBLP.generateVenueBasedAuthorStats(set(venues)),
+    'proceedings': lambda venue, year: DBLP.retrieveProceedingsFromDBLP(venue, str(year)),
+}
+
+
+def _jsonable(value):
+    # JSON form of the sets returned by the scans
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError('%s is not JSON serializable' % type(value).__name__)
+
+
+"""
+Desc: Run a scan job in a worker process and write its result
+Input: Kind of job, parameters, path of the result file
+Output: Size of the result file in bytes
+"""
+
+
+def runScanJob(kind, params, result_path):
+
+    result = SCAN_KINDS[kind](**params)
+    temp_path = '%s.%d.tmp' % (result_path, os.getpid())
+    with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+        json.dump(result, f, default=_jsonable)
+    os.replace(temp_path, result_path)  # a reader never sees a partial result
+    return os.path.getsize(result_path)
+
+
+"""
+Desc: Signature of the dump; results computed from another version of the dump are not reused
+"""
+
+
+def dumpSignature(dblp_path=None):
+
+    dblp_path = dblp_path if dblp_path is not None else defaultDBLPPath()
+    try:
+        stat = os.stat(dblp_path)
+    except OSError:
+        return 'missing'
+    return '%d:%d' % (stat.st_size, stat.st_mtime_ns)
+
+
+"""
+Desc: SQLite-backed queue of scan jobs executed by a process pool
+Input: Path of the job database, directory of the results, number of worker processes
+"""
+
+
+class ScanQueue:
+
+    def __init__(self, db_path=SCAN_JOB_DB, result_dir=SCAN_RESULT_DIR, workers=SCAN_JOB_WORKERS):
+        self.db_path = db_path
+        self.result_dir = result_dir
+        self.workers = workers
+        self._lock = threading.RLock()
+        self._db = None
+        self._executor = None
+        self._running = dict()  # job id -> future (abandoned jobs included until their worker is done)
+        self._abandoned = set()  # ids of cancelled jobs whose worker is still running
+
+    def _connect(self):
+        if self._db is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            os.makedirs(self.result_dir, exist_ok=True)
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            for statement in SCHEMA:
+                self._db.execute(statement)
+            # Jobs of a previous process that did not finish are run again
+            self._db.execute("UPDATE scan_jobs SET status = 'queued', started = NULL WHERE status = 'running'")
+            self._db.commit()
+            self._dispatch()  # start the recovered jobs without waiting for a new submission
+        return self._db
+
+    def _job(self, db, job_id):
+        row = db.execute('SELECT %s FROM scan_jobs WHERE id = ?' % ', '.join(COLUMNS), (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(COLUMNS, row))
+        job['params'] = json.loads(job['params'])
+        del job['dedup_key']
+        return job
+
+    """
+    Desc: Submit a scan job, or join an identical job that is queued, running or already done on the same dump
+    Input: Kind of job (see SCAN_KINDS), parameters
+    Output: Job description
+    """
+
+    def submit(self, kind, params=None):
+
+        if kind not in SCAN_KINDS:
+            raise ValueError('Unknown kind of scan job: %s' % kind)
+        params = params or dict()
+        params_json = json.dumps(params, sort_keys=True, default=_jsonable)
+        dedup_key = hashlib.sha256(('%s\n%s\n%s' % (kind, params_json, dumpSignature())).encode('utf-8')).hexdigest()
+        with self._lock:
+            db = self._connect()
+            row = db.execute("SELECT id, status, result_path FROM scan_jobs WHERE dedup_key = ? AND "
+                             "status IN ('queued', 'running', 'done') ORDER BY submitted DESC", (dedup_key,)).fetchone()
+            if row is not None and (row[1] != 'done' or os.path.exists(row[2])):
+                logger.info('Scan job %s joins job %s', kind, row[0])
+                self._dispatch()  # the joined job may still be waiting for a worker
+                return self._job(db, row[0])
+            job_id = uuid.uuid4().hex
+            db.execute("INSERT INTO scan_jobs (id, kind, params, dedup_key, status, submitted) "
+                       "VALUES (?, ?, ?, ?, 'queued', ?)", (job_id, kind, params_json, dedup_key, time.time()))
+            db.commit()
+            self._dispatch()
+            return self._job(db, job_id)
+
+    def _dispatch(self):
+        # Start queued jobs, oldest first, while fewer than workers jobs are running
+        with self._lock:
+            db = self._connect()
+            while len(self._running) < self.workers:
+                row = db.execute("SELECT id, kind, params FROM scan_jobs WHERE status = 'queued' "
+                                 "ORDER BY submitted LIMIT 1").fetchone()
+                if row is None:
+                    return
+                job_id, kind, params = row
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                result_path = os.path.join(self.result_dir, '%s.json.gz' % job_id)
+                db.execute("UPDATE scan_jobs SET status = 'running', started = ?, result_path = ? WHERE id = ?",
+                           (time.time(), result_path, job_id))
+                db.commit()
+                try:
+                    future = self._executor.submit(runScanJob, kind, json.loads(params), result_path)
+                except BrokenProcessPool as err:
+                    self._executor = None
+                    self._finish(job_id, 'failed', 'Worker pool unavailable: %s' % err)
+                    continue
+                self._running[job_id] = future
+                future.add_done_callback(lambda done, job_id=job_id: self._complete(job_id, done))
+
+    def _finish(self, job_id, status, error=None):
+        db = self._connect()
+        db.execute('UPDATE scan_jobs SET status = ?, finished = ?, error = ? WHERE id = ? AND status = ?',
+                   (status, time.time(), error, job_id, 'running'))
+        db.commit()
+
+    def _discardResult(self, job_id):
+        try:
+            os.remove(os.path.join(self.result_dir, '%s.json.gz' % job_id))
+        except OSError:
+            pass
+
+    def _complete(self, job_id, future):
+        # Record the outcome of a job (called in the executor's thread), then start the next queued ones
+        with self._lock:
+            self._running.pop(job_id, None)
+            if job_id in self._abandoned:  # cancelled while running: the result is not recorded
+                self._abandoned.discard(job_id)
+                self._discardResult(job_id)
+            elif future.cancelled():
+                self._finish(job_id, 'cancelled')
+            elif future.exception() is not None:
+                err = future.exception()
+                if isinstance(err, BrokenProcessPool):  # a worker died: start over with a new pool
+                    self._executor = None
+                logger.error('Scan job %s failed: %r', job_id, err)
+                self._finish(job_id, 'failed', repr(err))
+            else:
+                self._finish(job_id, 'done')
+            self._dispatch()
+
+    """
+    Desc: Open the job database and start the jobs left queued or running by a previous process
+    """
+
+    def resume(self):
+
+        with self._lock:
+            self._connect()
+
+    """
+    Desc: Description of a job, or None if it is unknown
+    """
+
+    def get(self, job_id):
+
+        with self._lock:
+            return self._job(self._connect(), job_id)
+
+    """
+    Desc: Descriptions of the most recent jobs
+    """
+
+    def list(self, limit=100):
+
+        with self._lock:
+            db = self._connect()
+            ids = [job_id for (job_id,) in db.execute('SELECT id FROM scan_jobs ORDER BY submitted DESC LIMIT ?',
+                                                      (limit,))]
+            return [self._job(db, job_id) for job_id in ids]
+
+    """
+    Desc: Path of the gzipped JSON result of a finished job, or None
+    """
+
+    def resultPath(self, job_id):
+
+        job = self.get(job_id)
+        if job is None or job['status'] != 'done' or not os.path.exists(job['result_path']):
+            return None
+        return job['result_path']
+
+    """
+    Desc: Cancel a job. A queued job is dropped; a running one is abandoned (its worker finishes the scan, but the
+    result is not recorded). An abandoned job keeps its worker until the scan ends, so the next queued job only starts
+    then.
+    Output: Job description, or None if the job is unknown
+    """
+
+    def cancel(self, job_id):
+
+        with self._lock:
+            db = self._connect()
+            future = self._running.get(job_id)
+            if future is not None and not future.cancel():
+                self._abandoned.add(job_id)  # still counted in _running until _complete
+            db.execute("UPDATE scan_jobs SET status = 'cancelled', finished = ? WHERE id = ? AND "
+                       "status IN ('queued', 'running')", (time.time(), job_id))
+            db.commit()
+            self._dispatch()
+            return self._job(db, job_id)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+scan_queue = ScanQueue()  # queue of the /scans routes
@@ -0,0 +1,162 @@
+"""
+Desc: Seniority of reviewers and candidates: first and last year of publication, number of years with a publication
+and number of papers. A whole roster is processed at once: the person pages are fetched concurrently with the shared
+DBLPFetcher (served from the page cache while fresh) and only the year, title and url of each paper are read, without
+the coauthor aggregation of readAuthorDBLP. Authors known by their DBLP name are answered from the dump index instead.
+Entries whose page cannot be retrieved or parsed are reported with an error; the other entries are still computed.
+"""
+
+import asyncio
+import logging
+from collections import namedtuple
+import pandas as pd
+from lxml import etree
+from DBLP import xmlifyAdd
+from DBLPFetcher import fetcher
+from DBLPIndex import indexAvailable, indexedAuthorSeniority
+from TitleMatcher import TitleSet
+from Metrics import span
+
+
+SeniorityRecord = namedtuple('SeniorityRecord', ['first_year', 'last_year', 'active_years', 'papers'])
+
+logger = logging.getLogger(__name__)
+
+
+"""
+Desc: Seniority of the author of a person page. Papers in the white list or among the false positives of the author
+are left out, as in readAuthorDBLP.
+Input: XML file string, titles of the white list, urls of the false positive papers
+Output: Name of the author in DBLP, SeniorityRecord (None if the page has no dated paper)
+"""
+
+
+def pageSeniority(xml_file, white_list=(), false_positives=()):
+
+    if isinstance(xml_file, str):
+        xml_file = xml_file.encode('utf-8')
+    white_list = white_list if isinstance(white_list, TitleSet) else TitleSet(white_list)
+    with span('parse'):
+        root = etree.fromstring(xml_file)
+        years = []
+        for paper in root.iterfind('r/*'):
+            year = paper.findtext('year')
+            if not year or not year.strip().isdigit():
+                continue
+            if len(white_list) > 0 and paper.findtext('title') in white_list:
+                continue
+            if len(false_positives) > 0 and paper.findtext('url') in false_positives:
+                continue
+            years.append(int(year))
+    if len(years) == 0:
+        return root.get('name'), None
+    return root.get('name'), SeniorityRecord(min(years), max(years), len(set(years)), len(years))
+
+
+def _entry(record, cur_year):
+    # Response entry of a SeniorityRecord
+    entry = dict(record._asdict())
+    if cur_year is not None:
+        entry['experience'] = int(cur_year) - record.first_year
+    return entry
+
+
+"""
+Desc: Seniority of one DBLP author from the person page
+Input: Web address of the author, current year (for the years of experience), white list, false positives
+Output: Dictionary with the name in DBLP, first_year, last_year, active_years, papers and experience, or with an error
+message
+"""
+
+
+async def fetchSeniority(dblp_url, cur_year=None, white_list=(), false_positives=()):
+
+    xml_data = await fetcher.fetch(xmlifyAdd(dblp_url))
+    if not xml_data:
+        return {"error": "Could not retrieve DBLP data"}
+    try:
+        name, record = await asyncio.to_thread(pageSeniority, xml_data, white_list, false_positives)
+    except Exception as err:  # a malformed page must not abort the other entries of the roster
+        return {"error": "Could not parse DBLP data: %s" % err}
+    if record is None:
+        return {"name": name, "error": "No dated publication in DBLP"}
+    return dict(_entry(record, cur_year), name=name)
+
+
+"""
+Desc: Seniority of a roster of DBLP authors, computed concurrently. The number of requests in flight is bounded by
+the fetcher and their pace by the DBLP rate limiter.
+Input: Dictionary key (e.g., e-mail of the reviewer) -> web address of the author in DBLP, current year, white list
+details (as in readAuthorDBLP)
+Output: Dictionary key -> result of fetchSeniority
+"""
+
+
+async def fetchRosterSeniority(roster, cur_year=None, title_venue_dict=None, dblp_url_dict=None):
+
+    white_list = TitleSet(title_venue_dict.keys() if title_venue_dict is not None else ())  # normalized once
+    dblp_url_dict = dblp_url_dict or dict()
+
+    async def fetchOne(key, dblp_url):
+        if not dblp_url:
+            return key, {"error": "No DBLP address"}
+        return key, await fetchSeniority(dblp_url, cur_year, white_list, dblp_url_dict.get(dblp_url, ()))
+
+    results = dict()
+    for key, result in await asyncio.gather(*(fetchOne(key, dblp_url) for key, dblp_url in roster.items())):
+        results[key] = result
+    return results
+
+
+"""
+Desc: Synchronous roster seniority for scripts (see fetchRosterSeniority)
+"""
+
+
+def getRosterSeniority(roster, cur_year=None, title_venue_dict=None, dblp_url_dict=None):
+
+    async def collect():
+        try:
+            return await fetchRosterSeniority(roster, cur_year, title_venue_dict, dblp_url_dict)
+        finally:
+            await fetcher.aclose()
+
+    return asyncio.run(collect())
+
+
+"""
+Desc: Seniority of authors known by their DBLP name (e.g., candidates found in the dump), from the dump index
+Input: DBLP names, current year
+Output: Dictionary name -> dictionary with first_year, last_year, active_years, papers and experience, or with an
+error message
+"""
+
+
+def indexedSeniority(names, cur_year=None, index_path=None):
+
+    if not indexAvailable(index_path):
+        return {name: {"error": "DBLP index not available"} for name in names}
+    seniority_dict = indexedAuthorSeniority(names, index_path)
+    return {name: _entry(SeniorityRecord(*seniority_dict[name]), cur_year) if name in seniority_dict
+            else {"error": "No dated publication in DBLP"} for name in names}
+
+
+"""
+Desc: Read a PC roster (Excel file with the columns NAME, EMAIL and DBLP)
+Input: Path of the file
+Output: Dictionary e-mail -> web address in DBLP (empty if missing), dictionary e-mail -> name (lower case)
+"""
+
+
+def readRoster(conf_pc_file):
+
+    reviewers = pd.read_excel(conf_pc_file, usecols=['NAME', 'EMAIL', 'DBLP'], dtype=str).fillna('')
+    emails = reviewers['EMAIL'].str.strip()
+    urls = reviewers['DBLP'].str.strip()
+    urls = urls.where(urls.str.len() > 5, '')  # too short to be a DBLP address
+    names = reviewers['NAME'].str.strip().str.lower()
+    roster, roster_names = dict(), dict()
+    for email, url, name in zip(emails, urls, names):  # the first row of a reviewer listed twice is kept
+        roster.setdefault(email, url)
+        roster_names.setdefault(email, name)
+    return roster, roster_names
@@ -0,0 +1,106 @@
+"""
+Desc: Matching of paper titles. Titles are normalized once with the rules of the disambiguation pages (lower case,
+without periods and double quotes), white-list titles are looked up by their normalized form, and many keywords are
+searched in one pass over a title with an Aho-Corasick automaton.
+"""
+
+from collections import deque
+
+
+"""
+Desc: Normalized form of a title, shared by the white list, the keyword search and readDisambDBLP
+"""
+
+
+def normalizeTitle(title):
+
+    return title.replace('.', '').replace('"', '').lower() if title else ''
+
+
+"""
+Desc: Set of titles looked up by normalized form, e.g., the white list of readAuthorDBLP
+Input: Iterable of titles
+"""
+
+
+class TitleSet:
+
+    def __init__(self, titles=()):
+        self._titles = dict()  # normalized title -> title as given
+        for title in titles:
+            self._titles.setdefault(normalizeTitle(title), title)
+
+    def __len__(self):
+        return len(self._titles)
+
+    def __contains__(self, title):
+        return normalizeTitle(title) in self._titles
+
+    """
+    Desc: Title as given for a title with the same normalized form, or None
+    """
+
+    def original(self, title):
+
+        return self._titles.get(normalizeTitle(title))
+
+
+"""
+Desc: Aho-Corasick automaton over a set of keywords. A title is scanned once, whatever the number of keywords, and
+every keyword occurring in it (as a substring of the normalized title) is reported.
+Input: Iterable of keywords
+"""
+
+
+class KeywordMatcher:
+
+    def __init__(self, keywords):
+        self.keywords = list(dict.fromkeys(keyword for keyword in keywords if normalizeTitle(keyword)))
+        goto = [dict()]  # state -> character -> next state of the keyword trie
+        out = [()]  # state -> keywords ending in the state
+        for keyword in self.keywords:
+            state = 0
+            for ch in normalizeTitle(keyword):
+                if ch not in goto[state]:
+                    goto.append(dict())
+                    out.append(())
+                    goto[state][ch] = len(goto) - 1
+                state = goto[state][ch]
+            out[state] = out[state] + (keyword,)
+
+        # Breadth-first completion of the trie into an automaton with a transition for every character of the
+        # keywords: a missing transition follows the failure link (longest proper suffix that is a trie prefix)
+        delta = [dict(goto[0])]
+        fail = [0] * len(goto)
+        delta.extend(dict() for _ in range(len(goto) - 1))
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            out[state] = out[state] + out[fail[state]]
+            delta[state] = dict(delta[fail[state]])
+            for ch, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(ch, 0) if state != 0 else 0
+                delta[state][ch] = child
+                queue.append(child)
+        self._delta = delta
+        self._out = [frozenset(keywords) for keywords in out]
+
+    def __len__(self):
+        return len(self.keywords)
+
+    """
+    Desc: Keywords occurring in a title
+    Output: Set of keywords (as given), empty if none occurs
+    """
+
+    def matches(self, title):
+
+        delta = self._delta
+        out = self._out
+        hits = set()
+        state = 0
+        for ch in normalizeTitle(title):
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                hits.update(out[state])
+        return hits
@@ -0,0 +1,323 @@
+"""
+Desc: Scoring of candidates by the quality of their recent venues. A venue list (e.g., the Excel file of a conference)
+is compiled once into a table of venue ids, where the DBLP spellings of a venue ("SIGMOD Conference", "ICDE (1)",
+"Proc. VLDB Endow.") resolve to the id of the listed venue. The papers of the authors are kept as venue-by-year count
+arrays in one sparse matrix (one row per author), so thousands of candidates are scored with a single matrix product.
+Rankings are cached per venue-list version.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from unidecode import unidecode
+from CompactProfile import NO_YEAR
+from MemoCache import LRUCache
+
+
+SCORE_WINDOW = int(os.environ.get('DBLP_SCORE_WINDOW', '10'))  # years of publications counted, up to cur_year
+SCORE_HALF_LIFE = float(os.environ.get('DBLP_SCORE_HALF_LIFE', '5'))  # years after which a paper counts half
+SCORE_CACHE_SIZE = int(os.environ.get('DBLP_SCORE_CACHE_SIZE', '32'))  # rankings kept
+VENUE_LIST_CACHE_SIZE = 16  # compiled venue files kept
+
+# Spellings of the same venue in DBLP and in venue lists; a listed venue also matches the other spellings of its group
+VENUE_ALIASES = (('SIGMOD Conference', 'SIGMOD', 'Proc. ACM Manag. Data'),
+                 ('PVLDB', 'Proc. VLDB Endow.', 'VLDB'),
+                 ('VLDB J.', 'VLDB Journal'),
+                 ('IEEE Trans. Knowl. Data Eng.', 'TKDE'),
+                 ('ACM Trans. Database Syst.', 'TODS'))
+
+logger = logging.getLogger(__name__)
+
+
+"""
+Desc: Key of a venue spelling: unidecoded, lower case, without punctuation, volume number of multi-volume proceedings
+("ICDE (1)") and trailing "Conference"
+"""
+
+
+def venueKey(name):
+
+    key = unidecode(str(name)).lower().strip()
+    key = re.sub(r'\(\d+\)$', '', key)
+    words = re.sub(r'[^\w&]+', ' ', key).split()
+    if len(words) > 1 and words[-1] in ('conference', 'conf'):
+        words = words[:-1]
+    return ' '.join(words)
+
+
+"""
+Desc: Venue list compiled to ids. A spelling is matched through its key (see venueKey), the alias groups of
+VENUE_ALIASES and the aliases given with the list, so the list can be used as the venue set of the scans and of
+getQualityVenuePublications.
+Input: Venue names, optional dictionary venue -> weight (1 by default), optional dictionary venue -> list of aliases
+"""
+
+
+class VenueList:
+
+    def __init__(self, venues, weights=None, aliases=None):
+        weights = weights or dict()
+        aliases = aliases or dict()
+        self.names = []  # id -> venue name as listed
+        self.weights = []  # id -> weight
+        self._ids = dict()  # venue key -> id
+        self._spellings = set()  # listed names and aliases
+        for venue in venues:
+            key = venueKey(venue)
+            if key == '' or key in self._ids:
+                continue
+            self._ids[key] = len(self.names)
+            self.names.append(venue)
+            self.weights.append(float(weights.get(venue, 1.0)))
+            self._spellings.add(venue)
+        for venue in list(self.names):
+            venue_id = self._ids[venueKey(venue)]
+            group = list(aliases.get(venue, ()))
+            for spellings in VENUE_ALIASES:
+                if venueKey(venue) in {venueKey(spelling) for spelling in spellings}:
+                    group.extend(spellings)
+            for spelling in group:
+                self._ids.setdefault(venueKey(spelling), venue_id)  # a listed venue keeps its own id
+                self._spellings.add(spelling)
+        self.weights = np.array(self.weights, dtype=np.float64)
+        digest = hashlib.sha256()
+        for key, venue_id in sorted(self._ids.items()):
+            digest.update(('%s\t%d\n' % (key, venue_id)).encode('utf-8'))
+        digest.update(self.weights.tobytes())
+        self.version = digest.hexdigest()[:16]  # changes with the venues, their aliases and their weights
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name is not None and self.venueId(name) is not None
+
+    """
+    Desc: Id of a venue spelling, or None if the venue is not in the list
+    """
+
+    def venueId(self, name):
+
+        if name is None:
+            return None
+        return self._ids.get(venueKey(name))
+
+    """
+    Desc: Ids of many spellings at once
+    Output: numpy array of ids, -1 for the spellings not in the list
+    """
+
+    def venueIds(self, names):
+
+        names = list(names)
+        ids = {name: self.venueId(name) for name in set(names)}  # each distinct spelling is normalized once
+        ids = {name: -1 if venue_id is None else venue_id for name, venue_id in ids.items()}
+        return np.fromiter((ids[name] for name in names), dtype=np.int32, count=len(names))
+
+    """
+    Desc: Listed names and aliases, as exact strings (for the dump index, which compares venues in SQL)
+    """
+
+    def spellings(self):
+
+        return set(self._spellings)
+
+
+_venue_lists = LRUCache(VENUE_LIST_CACHE_SIZE, name='venue_lists')
+
+
+"""
+Desc: Load a venue file (Excel or CSV) with a Venue column and optional Weight and Aliases (separated by ";") columns.
+The compiled list is cached until the file changes.
+Input: Path of the file
+Output: VenueList
+"""
+
+
+def loadVenueList(venue_file):
+
+    status = os.stat(venue_file)
+    key = (os.path.abspath(venue_file), status.st_mtime_ns, status.st_size)
+    venue_list = _venue_lists.get(key)
+    if venue_list is None:
+        venue_df = pd.read_csv(venue_file) if venue_file.endswith('.csv') else pd.read_excel(venue_file)
+        venue_df = venue_df[venue_df['Venue'].notna()]
+        venues = [str(venue).strip() for venue in venue_df['Venue']]
+        weights = dict()
+        aliases = dict()
+        if 'Weight' in venue_df.columns:
+            weights = {venue: weight for venue, weight in zip(venues, venue_df['Weight']) if pd.notna(weight)}
+        if 'Aliases' in venue_df.columns:
+            aliases = {venue: [alias.strip() for alias in str(names).split(';') if alias.strip()]
+                       for venue, names in zip(venues, venue_df['Aliases']) if pd.notna(names)}
+        venue_list = VenueList(venues, weights, aliases)
+        _venue_lists.put(key, venue_list)
+        logger.info("Compiled %d venues of %s (version %s)", len(venue_list), venue_file, venue_list.version)
+    return venue_list
+
+
+def _year(year):
+    year = str(year).strip() if year is not None else ''
+    return int(year) if year.isdigit() else NO_YEAR
+
+
+"""
+Desc: Papers of authors in the venues of a venue list, as venue-by-year counts. Row i of the sparse matrix holds the
+counts of author i, column venue_id * len(years) + (year - first_year) the papers in a venue and year.
+Input: Author names, numpy arrays author index, venue id and year of the papers (one entry per paper or per count),
+VenueList, optional counts (1 per entry by default)
+"""
+
+
+class VenueIndex:
+
+    def __init__(self, authors, author_idx, venue_ids, years, venue_list, counts=None):
+        self.authors = list(authors)
+        self.venue_list = venue_list
+        self._rows = {author: i for i, author in enumerate(self.authors)}
+        author_idx = np.asarray(author_idx, dtype=np.int64)
+        venue_ids = np.asarray(venue_ids, dtype=np.int64)
+        years = np.asarray(years, dtype=np.int64)
+        counts = np.ones(len(author_idx), dtype=np.int32) if counts is None else np.asarray(counts, dtype=np.int32)
+        keep = (venue_ids >= 0) & (years != NO_YEAR)
+        author_idx, venue_ids, years, counts = author_idx[keep], venue_ids[keep], years[keep], counts[keep]
+        self.first_year = int(years.min()) if len(years) > 0 else 0
+        self.n_years = int(years.max()) - self.first_year + 1 if len(years) > 0 else 0
+        columns = venue_ids * self.n_years + (years - self.first_year)
+        self.matrix = sparse.csr_matrix((counts, (author_idx, columns)),
+                                        shape=(len(self.authors), len(venue_list) * self.n_years), dtype=np.int32)
+        self.matrix.sum_duplicates()
+        digest = hashlib.sha256(venue_list.version.encode('ascii'))
+        digest.update('\n'.join(self.authors).encode('utf-8'))
+        for array in (self.matrix.indptr, self.matrix.indices, self.matrix.data):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        digest.update(b'%d' % self.first_year)
+        self.version = digest.hexdigest()[:16]
+
+    def __len__(self):
+        return len(self.authors)
+
+    def rows(self, authors):
+        # Sorted row numbers of the authors present in the index
+        return np.array(sorted({self._rows[author] for author in authors if author in self._rows}), dtype=np.int64)
+
+    """
+    Desc: Index of the venue statistics of the dump
+    Input: Dictionary author -> list of (venue, year) (see generateVenueBasedAuthorStats), VenueList
+    """
+
+    @classmethod
+    def fromHistories(cls, author_hist_dict, venue_list):
+
+        authors = list(author_hist_dict.keys())
+        lengths = np.fromiter((len(author_hist_dict[author]) for author in authors), dtype=np.int64,
+                              count=len(authors))
+        venue_ids = venue_list.venueIds([venue for author in authors for venue, _ in author_hist_dict[author]])
+        years = np.fromiter((_year(year) for author in authors for _, year in author_hist_dict[author]),
+                            dtype=np.int64, count=int(lengths.sum()))
+        return cls(authors, np.repeat(np.arange(len(authors)), lengths), venue_ids, years, venue_list)
+
+    """
+    Desc: Index of the quality venue publications read from person pages
+    Input: Dictionary author -> venue history (venue -> list of (year, count), see getQualityVenuePublications),
+    VenueList
+    """
+
+    @classmethod
+    def fromVenueHistories(cls, author_venue_hist_dict, venue_list):
+
+        authors = list(author_venue_hist_dict.keys())
+        author_idx, venues, years, counts = [], [], [], []
+        for i, author in enumerate(authors):
+            for venue, hist in author_venue_hist_dict[author].items():
+                for year, count in hist:
+                    author_idx.append(i)
+                    venues.append(venue)
+                    years.append(_year(year))
+                    counts.append(count)
+        return cls(authors, author_idx, venue_list.venueIds(venues), years, venue_list, counts)
+
+    """
+    Desc: Index of a venue statistics table (see venueStatsTable in ColumnarExport.py). Only the dictionary of the
+    venue column is matched against the venue list.
+    Input: Arrow table with the columns author, venue (dictionary encoded) and year, VenueList
+    """
+
+    @classmethod
+    def fromTable(cls, table, venue_list):
+
+        if table.num_rows == 0:
+            return cls([], [], [], [], venue_list)
+        table = table.unify_dictionaries().combine_chunks()
+        author_column = table.column('author').chunk(0)
+        venue_column = table.column('venue').chunk(0)
+        venue_map = venue_list.venueIds(venue_column.dictionary.to_pylist())
+        venue_ids = venue_map[venue_column.indices.to_numpy(zero_copy_only=False)]
+        return cls(author_column.dictionary.to_pylist(), author_column.indices.to_numpy(zero_copy_only=False),
+                   venue_ids, table.column('year').to_numpy(), venue_list)
+
+    """
+    Desc: Venue-by-year counts of an author
+    Output: numpy array (venues x years, from first_year), None if the author is not in the index
+    """
+
+    def counts(self, author):
+
+        i = self._rows.get(author)
+        if i is None:
+            return None
+        return self.matrix.getrow(i).toarray().reshape(len(self.venue_list), self.n_years)
+
+    def _yearWeights(self, cur_year, window, half_life):
+        # Recency weight of every year column: 0.5 ** (age / half_life) within the window, 0 outside
+        ages = cur_year - (self.first_year + np.arange(self.n_years))
+        return np.where((ages >= 0) & (ages < window), np.power(0.5, ages / half_life), 0.0)
+
+    """
+    Desc: Weighted recent quality output of all authors: sum over their papers in the window of the venue weight
+    times the recency weight
+    Input: Current year, years counted, half-life of the recency weight
+    Output: numpy arrays of scores and of numbers of papers in the window, in the order of authors
+    """
+
+    def scores(self, cur_year, window=SCORE_WINDOW, half_life=SCORE_HALF_LIFE):
+
+        recency = self._yearWeights(cur_year, window, half_life)
+        weights = np.outer(self.venue_list.weights, recency).ravel()
+        in_window = np.tile(recency > 0, len(self.venue_list)).astype(np.float64)
+        return self.matrix @ weights, self.matrix @ in_window
+
+
+score_cache = LRUCache(SCORE_CACHE_SIZE, name='venue_scores')
+
+
+"""
+Desc: Rank authors by their weighted recent quality output. The scores of an index are computed once per venue-list
+version and scoring parameters.
+Input: VenueIndex, current year, optional candidate names (all authors of the index by default), maximum number of
+results, years counted, half-life of the recency weight
+Output: List of dictionaries author, score, papers (in the window), best first; candidates without papers are left out
+"""
+
+
+def rankCandidates(index, cur_year, candidates=None, top=None, window=SCORE_WINDOW, half_life=SCORE_HALF_LIFE):
+
+    key = (index.venue_list.version, index.version, int(cur_year), window, half_life)
+    cached = score_cache.get(key)
+    if cached is None:
+        scores, papers = index.scores(int(cur_year), window, half_life)
+        order = np.lexsort((-papers, -scores))  # by score, then papers, descending
+        cached = (scores, papers, order)
+        score_cache.put(key, cached)
+    scores, papers, order = cached
+    if candidates is not None:
+        order = order[np.isin(order, index.rows(candidates))]
+    order = order[scores[order] > 0]
+    if top is not None:
+        order = order[:top]
+    return [{'author': index.authors[i], 'score': round(float(scores[i]), 4), 'papers': int(papers[i])}
+            for i in order]
@@ -0,0 +1,264 @@
+"""
+Desc: Benchmark suite of the hot paths: parsing of person pages (readAuthorDBLP, getQualityVenuePublications,
+readDisambDBLP) with 10, 1k and 10k papers, the dump scans of DBLP.py over a synthetic dump, and the /dblp/{dblp_url}
+route of main.py with DBLP replaced by a local stub server. Every case runs in its own process on generated data
+(see synthetic.py) and reports its throughput, p50/p99 latency and peak RSS, which are compared with a stored
+baseline: a case slower or larger than the baseline by more than the tolerance is reported as a regression and the
+suite exits with status 1.
+Usage: python benchmarks/bench.py [--cases name,...] [--baseline path] [--save-baseline] [--output path]
+Environment: BENCH_DUMP_RECORDS (default 100000), BENCH_MIN_TIME (seconds per case, default 2), BENCH_TOLERANCE
+(default 0.25), BENCH_RSS_TOLERANCE (default 0.25)
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from synthetic import personXML, writeDump, VENUES  # noqa: E402
+
+
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+DUMP_RECORDS = int(os.environ.get('BENCH_DUMP_RECORDS', '100000'))
+MIN_TIME = float(os.environ.get('BENCH_MIN_TIME', '2'))  # seconds spent timing a case (after one warm-up call)
+TOLERANCE = float(os.environ.get('BENCH_TOLERANCE', '0.25'))  # allowed slowdown of p50 and throughput
+RSS_TOLERANCE = float(os.environ.get('BENCH_RSS_TOLERANCE', '0.25'))  # allowed growth of the peak RSS
+PAGE_SIZES = (10, 1000, 10000)
+VENUE_SET = {venue for _, _, venue in VENUES[:3]}
+
+
+def _parseCase(function_name, records):
+    def setup():
+        import DBLP
+        xml_file = personXML(records)
+        calls = {'readAuthorDBLP': lambda: DBLP.readAuthorDBLP(xml_file, dict(), dict(), dict(), 'bench'),
+                 'getQualityVenuePublications': lambda: DBLP.getQualityVenuePublications(xml_file, VENUE_SET),
+                 'readDisambDBLP': lambda: DBLP.readDisambDBLP(xml_file)}
+        return calls[function_name], records, None
+    return setup
+
+
+def _scanCase(function_name):
+    def setup():
+        import DBLP
+        calls = {'getDBLPAuthors': lambda: DBLP.getDBLPAuthors(),
+                 'searchDBLPAuthors': lambda: DBLP.searchDBLPAuthors('graph', VENUE_SET),
+                 'searchDBLPAuthorsByKeywords': lambda: DBLP.searchDBLPAuthorsByKeywords(['graph', 'privacy', 'index'],
+                                                                                         VENUE_SET),
+                 'retrieveDBLPHomonymousAuthors': lambda: DBLP.retrieveDBLPHomonymousAuthors(),
+                 'retrieveProceedingsFromDBLP': lambda: DBLP.retrieveProceedingsFromDBLP('VLDB', '2010'),
+                 'generateVenueBasedAuthorStats': lambda: DBLP.generateVenueBasedAuthorStats(VENUE_SET)}
+        return calls[function_name], DUMP_RECORDS, None
+    return setup
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    # Serves the same person page for every .xml address, like dblp.org/pid/....xml
+    page = b''
+
+    def do_GET(self):
+        if not self.path.endswith('.xml'):
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/xml')
+        self.send_header('Content-Length', str(len(self.page)))
+        self.end_headers()
+        self.wfile.write(self.page)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _routeCase(records):
+    def setup():
+        from fastapi.testclient import TestClient
+        import main
+        from DBLPFetcher import fetcher
+        _StubHandler.page = personXML(records)
+        server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        fetcher.cache = None  # every request reaches the stub
+        client = TestClient(main.app)
+        client.__enter__()
+        path = '/dblp/http://127.0.0.1:%d/pid/d/JQD.html' % server.server_address[1]
+
+        def call():
+            response = client.get(path)
+            if response.status_code != 200 or 'error' in response.json():
+                raise RuntimeError('Route failed: %s' % response.text[:200])
+
+        def close():
+            client.__exit__(None, None, None)
+            server.shutdown()
+
+        return call, records, close
+    return setup
+
+
+# Name of the case -> setup function returning (function to time, records per call, cleanup function or None)
+CASES = dict()
+DUMP_CASES = set()  # cases reading the synthetic dump
+for size in PAGE_SIZES:
+    for name in ('readAuthorDBLP', 'getQualityVenuePublications', 'readDisambDBLP'):
+        CASES['%s[%d]' % (name, size)] = _parseCase(name, size)
+for name in ('getDBLPAuthors', 'searchDBLPAuthors', 'searchDBLPAuthorsByKeywords', 'retrieveDBLPHomonymousAuthors',
+             'retrieveProceedingsFromDBLP', 'generateVenueBasedAuthorStats'):
+    CASES[name] = _scanCase(name)
+    DUMP_CASES.add(name)
+for size in PAGE_SIZES[:2]:
+    CASES['route /dblp[%d]' % size] = _routeCase(size)
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def _peakRSS():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024  # MB
+
+
+"""
+Desc: Time one case in the current process (called in the process started by runCase)
+Output: Dictionary of the measures of the case
+"""
+
+
+def measureCase(name):
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):  # the procedures print progress
+        call, records, close = CASES[name]()
+        call()  # warm-up
+        latencies = []
+        started = time.perf_counter()
+        while time.perf_counter() - started < MIN_TIME or len(latencies) < 3:
+            start = time.perf_counter()
+            call()
+            latencies.append(time.perf_counter() - start)
+        if close is not None:
+            close()
+    total = sum(latencies)
+    return {'iterations': len(latencies), 'records': records, 'throughput': records * len(latencies) / total,
+            'p50': _percentile(latencies, 0.5), 'p99': _percentile(latencies, 0.99), 'peak_rss_mb': _peakRSS()}
+
+
+"""
+Desc: Run a case in a new process, with an isolated working directory holding the synthetic dump, no index, no
+caches of profiles or pages and no rate limit
+Output: Dictionary of the measures of the case
+"""
+
+
+def runCase(name, workdir):
+
+    env = dict(os.environ, DBLP_INDEX_PATH=os.path.join(workdir, 'no-index.sqlite'), DBLP_PROFILE_CACHE_SIZE='0',
+               DBLP_CACHE_DIR=os.path.join(workdir, 'cache'), DBLP_RATE='1000000', DBLP_BURST='1000000',
+               DBLP_RATE_STATE=os.path.join(workdir, 'ratelimit.json'), DBLP_SCAN_WORKERS='1', DB_NAME='')
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), '--measure', name], cwd=workdir, env=env,
+                            capture_output=True, text=True)
+    if output.returncode != 0:
+        raise RuntimeError('Case %s failed:\n%s' % (name, output.stderr[-2000:]))
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+"""
+Desc: Compare measures with a baseline
+Output: List of (case, measure, baseline value, value) of the regressions
+"""
+
+
+def compareResults(results, baseline):
+
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        if result['p50'] > reference['p50'] * (1 + TOLERANCE):
+            regressions.append((name, 'p50', reference['p50'], result['p50']))
+        if result['throughput'] < reference['throughput'] / (1 + TOLERANCE):
+            regressions.append((name, 'throughput', reference['throughput'], result['throughput']))
+        if result['peak_rss_mb'] > reference['peak_rss_mb'] * (1 + RSS_TOLERANCE):
+            regressions.append((name, 'peak_rss_mb', reference['peak_rss_mb'], result['peak_rss_mb']))
+    return regressions
+
+
+def _printResults(results, baseline):
+    print('%-42s %6s %14s %11s %11s %9s %9s' % ('case', 'iter', 'records/s', 'p50 (ms)', 'p99 (ms)', 'RSS (MB)',
+                                               'p50 vs base'))
+    for name, result in results.items():
+        reference = baseline.get(name)
+        change = '%+.0f%%' % (100.0 * (result['p50'] / reference['p50'] - 1)) if reference else 'new'
+        print('%-42s %6d %14.0f %11.2f %11.2f %9.1f %9s' % (name, result['iterations'], result['throughput'],
+                                                          1000 * result['p50'], 1000 * result['p99'],
+                                                          result['peak_rss_mb'], change))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks of DBLP parsing, dump scans and the /dblp route')
+    parser.add_argument('--cases', help='comma separated names of cases (prefixes allowed), all by default')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help='store the results as the new baseline')
+    parser.add_argument('--output', help='also write the results to this JSON file')
+    parser.add_argument('--measure', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measureCase(args.measure)))
+        sys.exit(0)
+
+    names = list(CASES)
+    if args.cases:
+        prefixes = args.cases.split(',')
+        names = [name for name in names if any(name.startswith(prefix) for prefix in prefixes)]
+    baseline = dict()
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)['cases']
+
+    results = dict()
+    with tempfile.TemporaryDirectory(prefix='dblp-bench-') as workdir:
+        os.makedirs(os.path.join(workdir, 'DataStore'))
+        if DUMP_CASES.intersection(names):
+            print('Generating a dump of %d publications..' % DUMP_RECORDS)
+            writeDump(os.path.join(workdir, 'DataStore', 'dblp.xml'), DUMP_RECORDS)
+        for name in names:
+            print('Running', name, '..')
+            results[name] = runCase(name, workdir)
+
+    print()
+    _printResults(results, baseline)
+    report = {'machine': {'platform': platform.platform(), 'python': platform.python_version(),
+                          'cpus': os.cpu_count()},
+              'settings': {'dump_records': DUMP_RECORDS, 'min_time': MIN_TIME}, 'cases': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        report['cases'] = dict(baseline, **results)
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print('\nBaseline saved to', args.baseline)
+        sys.exit(0)
+
+    regressions = compareResults(results, baseline)
+    if regressions:
+        print('\nRegressions (tolerance %d%%, RSS %d%%):' % (100 * TOLERANCE, 100 * RSS_TOLERANCE))
+        for name, measure, reference, value in regressions:
+            print('  %s: %s %.4g -> %.4g' % (name, measure, reference, value))
+        sys.exit(1)
+    print('\nNo regression against the baseline' if baseline else '\nNo baseline to compare with')
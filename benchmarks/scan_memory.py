@@ -0,0 +1,74 @@
+"""
+Desc: Memory benchmark of a full scan of the DBLP dump. Reports the resident set size (RSS) of the process while
+the dump is streamed, to show that iterDBLPRecords runs in bounded memory. The 'legacy' mode reproduces the former
+context_iter loop (no element clearing) for comparison.
+Usage: python benchmarks/scan_memory.py [path of dblp.xml] [records|legacy] [sample interval]
+"""
+
+import os
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lxml import etree  # noqa: E402
+from DBLPDump import PUB_TYPES, defaultDBLPPath, iterDBLPRecords  # noqa: E402
+
+
+"""
+Desc: Current resident set size of the process in MB
+"""
+
+
+def currentRSS():
+
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except OSError:  # no procfs: fall back to the peak RSS (kilobytes on Linux, bytes on macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def legacyRecords(dblp_path):
+    # The former context_iter loop of the dump scans, before iterDBLPRecords: every element stays in the tree
+    for _, elem in etree.iterparse(source=dblp_path, dtd_validation=True, load_dtd=True):
+        if elem.tag in PUB_TYPES:
+            yield elem
+
+
+"""
+Desc: Stream the dump and sample the RSS every interval publications
+Output: List of (publications read, RSS in MB)
+"""
+
+
+def measureScan(dblp_path, mode='records', interval=100000):
+
+    records = iterDBLPRecords(dblp_path) if mode == 'records' else legacyRecords(dblp_path)
+    samples = [(0, currentRSS())]
+    count = 0
+    for _ in records:
+        count = count + 1
+        if count % interval == 0:
+            samples.append((count, currentRSS()))
+    samples.append((count, currentRSS()))
+    return samples
+
+
+if __name__ == '__main__':
+    dblp_path = sys.argv[1] if len(sys.argv) > 1 else defaultDBLPPath()
+    mode = sys.argv[2] if len(sys.argv) > 2 else 'records'
+    interval = int(sys.argv[3]) if len(sys.argv) > 3 else 100000
+
+    start_time = time.time()
+    samples = measureScan(dblp_path, mode, interval)
+    elapsed = time.time() - start_time
+    print('%12s %10s' % ('records', 'RSS (MB)'))
+    for count, rss in samples:
+        print('%12d %10.1f' % (count, rss))
+    warm = samples[1] if len(samples) > 2 else samples[0]  # first sample after the DTD and buffers are loaded
+    print('\nmode: %s, %d publications in %.1f seconds (%.0f/s)' % (mode, samples[-1][0], elapsed,
+                                                                     samples[-1][0] / max(elapsed, 1e-9)))
+    print('RSS growth after the first %d publications: %.1f MB' % (warm[0], samples[-1][1] - warm[1]))
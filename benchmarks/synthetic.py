@@ -0,0 +1,99 @@
+"""
+Desc: Synthetic DBLP data for the benchmarks: person pages (as returned by dblp.org/pid/....xml) and dumps (dblp.xml
+with its DTD and entities). The data is generated from a seed, so every run of a benchmark parses the same input.
+Usage: python benchmarks/synthetic.py person [records] > page.xml
+       python benchmarks/synthetic.py dump [records] [path of dblp.xml]
+"""
+
+import os
+import random
+import sys
+
+
+PUB_FIELDS = ('author', 'title', 'booktitle', 'pages', 'year', 'journal', 'volume', 'url', 'ee')
+PUB_TAGS = ('article', 'inproceedings', 'proceedings', 'book', 'incollection', 'phdthesis', 'mastersthesis', 'www')
+VENUES = (('inproceedings', 'booktitle', 'SIGMOD Conference'), ('inproceedings', 'booktitle', 'VLDB'),
+          ('inproceedings', 'booktitle', 'ICDE'), ('article', 'journal', 'PVLDB'), ('article', 'journal', 'VLDB J.'))
+TOPIC_WORDS = ('graph', 'query', 'database', 'learning', 'index', 'stream', 'privacy', 'systems')
+FIRST_YEAR = 2000
+YEARS = 24
+
+
+def _dtd():
+    lines = ['<!ELEMENT dblp (%s)*>' % '|'.join(PUB_TAGS)]
+    for tag in PUB_TAGS:
+        lines.append('<!ELEMENT %s (%s)*>' % (tag, '|'.join(PUB_FIELDS)))
+        lines.append('<!ATTLIST %s key CDATA #REQUIRED mdate CDATA #IMPLIED>' % tag)
+    lines.extend('<!ELEMENT %s (#PCDATA)>' % field for field in PUB_FIELDS)
+    lines.extend(['<!ENTITY eacute "&#233;">', '<!ENTITY uuml "&#252;">'])
+    return '\n'.join(lines) + '\n'
+
+
+def _authorNames(count):
+    # Distinct names, some homonymous (ending with a DBLP number) and some with entities
+    names = ['Author %s%s %d' % (chr(65 + i % 26), chr(65 + i // 26 % 26), i // 676) if i % 40 == 0 else
+             'Author %s%s%dx' % (chr(65 + i % 26), chr(65 + i // 26 % 26), i // 676) for i in range(count)]
+    return names + ['Wei Wang 0001', 'Wei Wang 0002', 'Ren&eacute; M&uuml;ller']
+
+
+"""
+Desc: Person page of a DBLP author
+Input: Number of papers, seed, name of the author
+Output: XML page (bytes)
+"""
+
+
+def personXML(records, seed=1, name='Jane Q. Doe'):
+
+    rnd = random.Random(seed)
+    coauthors = ['Coauthor %d' % i for i in range(max(10, records // 5))] + ['Bob Smith 0001', 'José Müller']
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+             '<dblpperson name="%s" pid="d/JQD" n="%d">' % (name, records),
+             '<person key="homepages/d/JQD" mdate="2020-01-01"><author pid="d/JQD">%s</author>'
+             '<author pid="d/JQD">Jane Doe</author><note type="affiliation">NTU, Singapore</note></person>' % name]
+    for i in range(records):
+        tag, field, venue = rnd.choice(VENUES)
+        authors = ''.join('<author>%s</author>' % coauthor for coauthor in rnd.sample(coauthors, rnd.randint(1, 4)))
+        title = ' '.join(rnd.sample(TOPIC_WORDS, 3)).capitalize()
+        lines.append('<r><%s key="x/k%d" mdate="2021-01-01">%s<author>%s</author><title>%s %d.</title><year>%d</year>'
+                     '<%s>%s</%s><url>db/x.html#k%d</url></%s></r>'
+                     % (tag, i, authors, name, title, i, FIRST_YEAR + i % YEARS, field, venue, field, i, tag))
+    lines.append('<coauthors n="2"><co><na>Coauthor 0</na></co><co><na>Coauthor 1</na></co></coauthors></dblpperson>')
+    return '\n'.join(lines).encode('utf-8')
+
+
+"""
+Desc: Write a dump and its DTD (dblp.dtd in the same directory)
+Input: Path of the dump, number of publications, seed
+Output: Path of the dump
+"""
+
+
+def writeDump(dblp_path, records, seed=1):
+
+    rnd = random.Random(seed)
+    with open(os.path.join(os.path.dirname(os.path.abspath(dblp_path)), 'dblp.dtd'), 'w') as f:
+        f.write(_dtd())
+    names = _authorNames(records // 3 + 5)
+    with open(dblp_path, 'w', encoding='ISO-8859-1') as f:
+        f.write('<?xml version="1.0" encoding="ISO-8859-1"?>\n<!DOCTYPE dblp SYSTEM "dblp.dtd">\n<dblp>\n')
+        for i in range(records):
+            tag, field, venue = rnd.choice(VENUES)
+            authors = ''.join('<author>%s</author>' % name for name in rnd.sample(names, rnd.randint(1, 4)))
+            title = ' '.join(rnd.sample(TOPIC_WORDS, 3)).capitalize()
+            f.write('<%s key="k/%d" mdate="2020-01-01">%s<title>%s.</title><year>%d</year><%s>%s</%s><url>db/%d</url>'
+                    '</%s>\n' % (tag, i, authors, title, FIRST_YEAR + i % YEARS, field, venue, field, i, tag))
+            if i % 50 == 0:
+                f.write('<www key="homepages/%d" mdate="2020-01-01"><author>%s</author><title>Home Page</title></www>\n'
+                        % (i, rnd.choice(names)))
+        f.write('</dblp>\n')
+    return dblp_path
+
+
+if __name__ == '__main__':
+    kind = sys.argv[1] if len(sys.argv) > 1 else 'person'
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    if kind == 'dump':
+        print('Wrote', writeDump(sys.argv[3] if len(sys.argv) > 3 else 'dblp.xml', count))
+    else:
+        sys.stdout.buffer.write(personXML(count))
@@ -1,20 +1,346 @@
-from fastapi import FastAPI
-from DBLP import connectToDBLPPage, xmlifyAdd, readAuthorDBLP
+import asyncio
+import json
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
+from DBLP import profile_cache
+from DBLPCache import cache as page_cache
+from DBLPFetcher import fetcher
+from DBLPProfiles import fetchDBLPProfile, fetchDBLPProfiles, fetchAuthorProfile
+from ConflictMatrix import conflictMatrix, conflictLists
+from PCSelection import selection
+from Jobs import job_manager, candidateSearchWork, venueStatsWork, profileBatchWork, ndjsonEvent, sseEvent
+from RateLimit import limiter
+from ScanQueue import scan_queue
+from ProfileStore import profile_store
+from NameNormalizer import nameCacheStats
+from CompactProfile import name_table
+from VenueScoring import score_cache
+from Seniority import fetchRosterSeniority, indexedSeniority
+from Metrics import configureLogging, metrics, http_requests, http_seconds, SamplingProfiler
 
-app = FastAPI()
+configureLogging()
+logger = logging.getLogger("main")
+PROFILING_ENABLED = os.environ.get("DBLP_PROFILING", "0") == "1"  # honour the X-Profile header (exposes stacks)
+
+
+def cacheMetrics():
+    # Gauges read from the caches and the rate limiter at scrape time
+    gauges = []
+    for cache_name, stats in (("pages", page_cache.stats()), ("profiles", profile_cache.stats()),
+                              ("venue_scores", score_cache.stats())):
+        for field in ("hits", "misses", "revalidations", "entries", "bytes"):
+            if field in stats:
+                gauges.append(("dblp_cache_%s" % field, "Cache %s" % field, {"cache": cache_name}, stats[field]))
+    for field in ("unchanged", "merged", "papers_added", "papers_removed"):
+        gauges.append(("dblp_profile_store_%s" % field, "Incremental profile refreshes: %s" % field, {},
+                       getattr(profile_store, field)))
+    for field, value in limiter.stats().items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            gauges.append(("dblp_ratelimit_%s" % field, "DBLP rate limiter: %s" % field, {}, value))
+    gauges.append(("dblp_name_table_entries", "Names interned in the shared name table", {}, len(name_table)))
+    for function_name, stats in nameCacheStats().items():
+        for field in ("hits", "misses", "entries"):
+            gauges.append(("dblp_name_cache_%s" % field, "Memoized name normalization %s" % field,
+                           {"function": function_name}, stats[field]))
+    return gauges
+
+
+metrics.addCollector(cacheMetrics)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    await asyncio.to_thread(scan_queue.resume)
+    yield
+    await fetcher.aclose()
+    scan_queue.shutdown()
+
+app = FastAPI(lifespan=lifespan)
+
+
+@app.middleware("http")
+async def instrument_requests(request: Request, call_next):
+    # Request counters and latency per route; with the X-Profile header, the response is replaced by the collapsed
+    # stacks sampled while the request was handled (original status in X-Profile-Status)
+    profiler = SamplingProfiler().start() if PROFILING_ENABLED and request.headers.get("X-Profile") else None
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+        if profiler is not None:  # streamed responses (e.g., /dblp/batch) do their work while the body is consumed
+            async for _ in response.body_iterator:
+                pass
+    finally:
+        if profiler is not None:
+            profiler.stop()
+    route = request.scope.get("route")
+    route_path = route.path if route is not None else "unmatched"
+    http_seconds.observe(time.perf_counter() - start, route=route_path)
+    http_requests.inc(route=route_path, status=response.status_code)
+    if profiler is None:
+        return response
+    return PlainTextResponse(profiler.collapsed(), headers={"X-Profile-Status": str(response.status_code),
+                                                           "X-Profile-Samples": str(profiler.samples),
+                                                           "X-Profile-Seconds": "%.3f" % (time.perf_counter() - start)})
+
+
+class DBLPBatchRequest(BaseModel):
+    dblp_urls: list[str]
+
+
+class ConflictRequest(BaseModel):
+    dblp_urls: list[str]
+    names: list[str] | None = None
+    first_year: int | None = None
+    last_year: int | None = None
+    min_papers: int = 1
+
+
+class SelectionCandidate(BaseModel):
+    name: str
+    dblp_url: str | None = None
+    decision: str | None = None
+
+
+class SelectionCandidatesRequest(BaseModel):
+    candidates: list[SelectionCandidate]
+
+
+class SelectionDecisionsRequest(BaseModel):
+    decisions: dict[str, str | None]
+
+
+class SelectionRunRequest(BaseModel):
+    pc_size: int
+
+
+class CandidateSearchJobRequest(BaseModel):
+    key_words: list[str]
+    venues: list[str]
+
+
+class VenueStatsJobRequest(BaseModel):
+    venues: list[str]
+
+
+class ScanJobRequest(BaseModel):
+    kind: str
+    params: dict = {}
+
+
+class SeniorityRequest(BaseModel):
+    roster: dict[str, str] = {}
+    dblp_names: list[str] = []
+    cur_year: int | None = None
+
+
+@app.post("/dblp/batch")
+async def get_dblp_batch(request: DBLPBatchRequest):
+    logger.info("Received %d DBLP URLs", len(request.dblp_urls))
+
+    async def stream():
+        async for result in fetchDBLPProfiles(request.dblp_urls):
+            yield json.dumps(result) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@app.post("/conflicts")
+async def get_conflicts(request: ConflictRequest):
+    logger.info("Computing conflicts of %d candidates", len(request.dblp_urls))
+    fetched = await asyncio.gather(*[fetchAuthorProfile(dblp_url) for dblp_url in request.dblp_urls],
+                                   return_exceptions=True)
+    candidates = []
+    profiles = []
+    names = []
+    errors = {}
+    for i, (dblp_url, profile) in enumerate(zip(request.dblp_urls, fetched)):
+        if profile is None or isinstance(profile, Exception):
+            errors[dblp_url] = "Could not retrieve DBLP data" if profile is None else str(profile)
+            continue
+        candidates.append(dblp_url)
+        profiles.append(profile)
+        names.append(request.names[i] if request.names is not None and i < len(request.names) else None)
+
+    matrix = await asyncio.to_thread(conflictMatrix, profiles, names, request.first_year, request.last_year,
+                                     request.min_papers)
+    return {
+        "conflicts": {
+            candidates[i]: [{"dblp_url": candidates[j], "papers": papers} for j, papers in conflicts]
+            for i, conflicts in enumerate(conflictLists(matrix))
+        },
+        "errors": errors
+    }
+
+@app.post("/seniority")
+async def get_seniority(request: SeniorityRequest):
+    logger.info("Computing seniority of %d reviewers and %d DBLP names", len(request.roster), len(request.dblp_names))
+    seniority = await fetchRosterSeniority(request.roster, request.cur_year)
+    names = {}
+    if request.dblp_names:
+        names = await asyncio.to_thread(indexedSeniority, request.dblp_names, request.cur_year)
+    return {"roster": seniority, "dblp_names": names}
+
+@app.post("/selection/candidates")
+async def add_selection_candidates(request: SelectionCandidatesRequest):
+    logger.info("Adding %d candidates to the selection graph", len(request.candidates))
+
+    async def noProfile():
+        return None
+
+    fetched = await asyncio.gather(*[fetchAuthorProfile(candidate.dblp_url) if candidate.dblp_url else noProfile()
+                                     for candidate in request.candidates], return_exceptions=True)
+    errors = {}
+    for candidate, profile in zip(request.candidates, fetched):
+        if isinstance(profile, Exception) or (profile is None and candidate.dblp_url):
+            errors[candidate.name] = "Could not retrieve DBLP data"
+            profile = None  # still a candidate, connected through the names of the others' coauthors
+        selection.addCandidate(candidate.name, profile, candidate.decision)
+    return {"graph": selection.stats(), "errors": errors}
+
+
+@app.post("/selection/decisions")
+async def set_selection_decisions(request: SelectionDecisionsRequest):
+    unknown = [name for name, decision in request.decisions.items() if not selection.setDecision(name, decision)]
+    return {"graph": selection.stats(), "unknown": unknown}
+
+
+@app.delete("/selection/candidates/{name}")
+async def remove_selection_candidate(name: str):
+    return {"removed": selection.removeCandidate(name)}
+
+
+@app.post("/selection/run")
+async def run_selection(request: SelectionRunRequest):
+    selected = selection.select(request.pc_size)
+    return {
+        "message": f"Selected least connected graph with {request.pc_size} candidates.",
+        "selectedCandidates": selected
+    }
+
+
+@app.get("/selection/stats")
+async def get_selection_stats():
+    return selection.stats()
+
+@app.post("/jobs/candidates", status_code=202)
+async def start_candidate_search_job(request: CandidateSearchJobRequest):
+    job = job_manager.startThread("candidates", request.model_dump(),
+                                  candidateSearchWork(request.key_words, set(request.venues)))
+    return job.summary()
+
+
+@app.post("/jobs/venue-stats", status_code=202)
+async def start_venue_stats_job(request: VenueStatsJobRequest):
+    job = job_manager.startThread("venue-stats", request.model_dump(), venueStatsWork(set(request.venues)))
+    return job.summary()
+
+
+@app.post("/jobs/profiles", status_code=202)
+async def start_profile_batch_job(request: DBLPBatchRequest):
+    job = job_manager.startTask("profiles", request.model_dump(), profileBatchWork(request.dblp_urls))
+    return job.summary()
+
+
+@app.get("/jobs")
+async def list_jobs():
+    return job_manager.list()
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return job.summary()
+
+
+@app.get("/jobs/{job_id}/events")
+async def get_job_events(job_id: str, format: str = "ndjson", since: int = 0):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    encode, media_type = (sseEvent, "text/event-stream") if format == "sse" else \
+        (ndjsonEvent, "application/x-ndjson")
+
+    async def stream():
+        async for event in job.follow(since):
+            yield encode(event)
+
+    return StreamingResponse(stream(), media_type=media_type)
+
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    if not job_manager.cancel(job_id):
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return job_manager.get(job_id).summary()
+
+
+@app.post("/scans", status_code=202)
+async def submit_scan(request: ScanJobRequest):
+    try:
+        return await asyncio.to_thread(scan_queue.submit, request.kind, request.params)
+    except ValueError as err:
+        raise HTTPException(status_code=400, detail=str(err))
+
+
+@app.get("/scans")
+async def list_scans():
+    return await asyncio.to_thread(scan_queue.list)
+
+
+@app.get("/scans/{job_id}")
+async def get_scan(job_id: str):
+    job = await asyncio.to_thread(scan_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown scan job")
+    return job
+
+
+@app.get("/scans/{job_id}/result")
+async def get_scan_result(job_id: str):
+    result_path = await asyncio.to_thread(scan_queue.resultPath, job_id)
+    if result_path is None:
+        raise HTTPException(status_code=404, detail="No result for this scan job")
+
+    def stream():
+        with open(result_path, "rb") as f:
+            while chunk := f.read(65536):
+                yield chunk
+
+    return StreamingResponse(stream(), media_type="application/json", headers={"Content-Encoding": "gzip"})
+
+
+@app.delete("/scans/{job_id}")
+async def cancel_scan(job_id: str):
+    job = await asyncio.to_thread(scan_queue.cancel, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown scan job")
+    return job
 
 @app.get("/dblp/{dblp_url:path}")
 async def get_dblp_data(dblp_url: str):
-    print(f"Received DBLP URL: {dblp_url}")
-    xml_url = xmlifyAdd(dblp_url)
-    xml_data = connectToDBLPPage(xml_url)
-    if not xml_data:
-        return {"error": "Could not retrieve DBLP data"}
-    
-    person, _, coauthor_hist, _, years_of_pub, coauthor_set, _ = readAuthorDBLP(xml_data, {}, {}, {}, dblp_url)
+    logger.debug("Received DBLP URL: %s", dblp_url)
+    return await fetchDBLPProfile(dblp_url)
+
+
+@app.get("/cache/stats")
+async def get_cache_stats():
     return {
-        "person_name": person,
-        "coauthor_hist": coauthor_hist,
-        "years_of_publication": list(years_of_pub),
-        "coauthors": list(coauthor_set)
+        "pages": page_cache.stats(),
+        "profiles": profile_cache.stats()
     }
+
+
+@app.get("/metrics")
+async def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/ratelimit/stats")
+async def get_ratelimit_stats():
+    return limiter.stats()
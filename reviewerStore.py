@@ -0,0 +1,244 @@
+"""
+Desc: Bulk loading of DBLP authors and candidates into the MySQL database of the app (schema of the README). Rows are
+streamed from the dump scans in chunks; every chunk is written in its own transaction, either with a batched
+executemany (rewritten by the connector into multi-row INSERTs) or with LOAD DATA LOCAL INFILE into a staging table,
+and upserted on the key of the table. Connections come from a pool configured like the one of server.ts
+(DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, DB_PORT, read from .env when the pool is created). Nothing is written unless
+the caller asks for it (see getDBLPAuthors and searchDBLPforPC, or run this module).
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from itertools import islice
+from dotenv import load_dotenv
+
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '4'))
+LOAD_BATCH_SIZE = int(os.environ.get('DB_LOAD_BATCH_SIZE', '10000'))  # rows per transaction
+LOAD_METHOD = os.environ.get('DB_LOAD_METHOD', 'executemany')  # executemany or infile
+
+DBLP_AUTHORS_TABLE = 'dblp_authors'
+CANDIDATE_TABLE = 'Candidate_Rec'
+DBLP_AUTHORS_SCHEMA = ('CREATE TABLE IF NOT EXISTS dblp_authors (id INT(11) NOT NULL AUTO_INCREMENT PRIMARY KEY, '
+                       'name VARCHAR(255) CHARACTER SET utf8mb4 NOT NULL, UNIQUE KEY dblp_authors_name (name))')
+CANDIDATE_COLUMNS = ('NAME', 'EMAIL', 'INSTITUTE', 'COUNTRY', 'COUNTRYOFORIGIN', 'GENDER', 'LEVEL', 'EXPERTISE',
+                     'DBLP', 'ITERATION', 'DECISION', 'coauthor_hist', 'years_of_pub', 'coauthors')
+CANDIDATE_JSON_COLUMNS = ('coauthor_hist', 'years_of_pub', 'coauthors')
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+"""
+Desc: Whether a database is configured (DB_NAME is set, in the environment or in .env)
+"""
+
+
+def databaseConfigured():
+
+    load_dotenv()
+    return bool(os.environ.get('DB_NAME'))
+
+
+"""
+Desc: Connection pool of the loader, created on first use
+"""
+
+
+def getPool():
+
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            if not databaseConfigured():
+                raise ValueError('No database configured: set DB_NAME (and DB_HOST, DB_USER, DB_PASSWORD, DB_PORT)')
+            from mysql.connector import pooling
+            _pool = pooling.MySQLConnectionPool(pool_name='sancusdb', pool_size=DB_POOL_SIZE,
+                                                host=os.environ.get('DB_HOST', 'localhost'),
+                                                user=os.environ.get('DB_USER'),
+                                                password=os.environ.get('DB_PASSWORD'),
+                                                database=os.environ.get('DB_NAME'),
+                                                port=int(os.environ.get('DB_PORT', '3306')),
+                                                charset='utf8mb4', autocommit=False, allow_local_infile=True)
+        return _pool
+
+
+def _chunks(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _infileValue(value):
+    # Field of a LOAD DATA file: tab separated, backslash escaped, \N for NULL
+    if value is None:
+        return '\\N'
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+def _upsertClause(columns, key_columns):
+    # A NULL value does not overwrite a stored one
+    updates = ['%s = COALESCE(VALUES(%s), %s)' % (column, column, column) for column in columns
+               if column not in key_columns]
+    if not updates:  # rows made of their key only: keep the stored row
+        updates = ['%s = %s' % (key_columns[0], key_columns[0])]
+    return ' ON DUPLICATE KEY UPDATE ' + ', '.join(updates)
+
+
+def _executemanyChunk(cursor, table, columns, key_columns, chunk):
+    placeholders = ', '.join(['%s'] * len(columns))
+    cursor.executemany('INSERT INTO %s (%s) VALUES (%s)%s' % (table, ', '.join(columns), placeholders,
+                                                             _upsertClause(columns, key_columns)), chunk)
+
+
+def _stage(cursor, table, columns, chunk, method):
+    # Load the chunk into an empty temporary copy of the table
+    staging = '%s_staging' % table
+    cursor.execute('CREATE TEMPORARY TABLE IF NOT EXISTS %s LIKE %s' % (staging, table))
+    cursor.execute('TRUNCATE TABLE %s' % staging)
+    if method != 'infile':
+        cursor.executemany('INSERT INTO %s (%s) VALUES (%s)' % (staging, ', '.join(columns),
+                                                               ', '.join(['%s'] * len(columns))), chunk)
+        return staging
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', newline='\n', suffix='.tsv', delete=False) as f:
+        for row in chunk:
+            f.write('\t'.join(_infileValue(value) for value in row) + '\n')
+    try:
+        cursor.execute("LOAD DATA LOCAL INFILE %%s INTO TABLE %s CHARACTER SET utf8mb4 FIELDS TERMINATED BY '\\t' "
+                       "ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' (%s)" % (staging, ', '.join(columns)), (f.name,))
+    finally:
+        os.remove(f.name)
+    return staging
+
+
+def _infileChunk(cursor, table, columns, key_columns, chunk):
+    # Load the chunk into a temporary copy of the table, then upsert it in one statement
+    staging = _stage(cursor, table, columns, chunk, 'infile')
+    cursor.execute('INSERT INTO %s (%s) SELECT %s FROM %s%s' % (table, ', '.join(columns), ', '.join(columns), staging,
+                                                              _upsertClause(columns, key_columns)))
+
+
+def _mergeChunk(cursor, table, columns, key_columns, chunk, method):
+    # Upsert on columns that are not a unique key of the table: rows matching the key of a staged row are updated (a
+    # NULL value does not overwrite a stored one), the other staged rows are inserted
+    staging = _stage(cursor, table, columns, chunk, method)
+    join = ' AND '.join('t.%s = s.%s' % (column, column) for column in key_columns)
+    updates = ['t.%s = COALESCE(s.%s, t.%s)' % (column, column, column) for column in columns
+               if column not in key_columns]
+    if updates:
+        cursor.execute('UPDATE %s t JOIN %s s ON %s SET %s' % (table, staging, join, ', '.join(updates)))
+    cursor.execute('INSERT INTO %s (%s) SELECT %s FROM %s s LEFT JOIN %s t ON %s WHERE t.%s IS NULL'
+                   % (table, ', '.join(columns), ', '.join('s.%s' % column for column in columns), staging, table,
+                      join, key_columns[0]))
+
+
+"""
+Desc: Upsert rows into a table, one transaction per chunk
+Input: Table, column names, iterable of rows (tuples in the order of the columns), columns identifying a row, load
+method (executemany or infile), rows per chunk, whether the key columns are a unique key of the table (conflicts are
+then detected by MySQL; otherwise rows are matched through a staging table, and a key must not repeat in a chunk)
+Output: Number of rows written
+"""
+
+
+def upsertRows(table, columns, rows, key_columns, method=None, batch_size=None, unique_key=True):
+
+    method = method or LOAD_METHOD
+    batch_size = batch_size or LOAD_BATCH_SIZE
+    if not unique_key:
+        def write_chunk(cursor, table, columns, key_columns, chunk):
+            _mergeChunk(cursor, table, columns, key_columns, chunk, method)
+    else:
+        write_chunk = _infileChunk if method == 'infile' else _executemanyChunk
+    start_time = time.time()
+    written = 0
+    connection = getPool().get_connection()
+    try:
+        cursor = connection.cursor()
+        for chunk in _chunks(rows, batch_size):
+            try:
+                write_chunk(cursor, table, columns, key_columns, chunk)
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                logger.error("Loading into %s failed after %d rows", table, written)
+                raise
+            written = written + len(chunk)
+            rate = written / max(time.time() - start_time, 1e-6)
+            logger.info("Loaded %d rows into %s (%.0f rows/s)", written, table, rate)
+        cursor.close()
+    finally:
+        connection.close()  # back to the pool
+    return written
+
+
+"""
+Desc: Insert the names of DBLP authors (see getDBLPAuthors) into the dblp_authors table, created if needed; names
+already stored are kept
+Input: Iterable of author names, load method
+Output: Number of names written
+"""
+
+
+def insertDBLPAuthors(author_set, method=None):
+
+    connection = getPool().get_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(DBLP_AUTHORS_SCHEMA)
+        cursor.close()
+        connection.commit()
+    finally:
+        connection.close()
+    return upsertRows(DBLP_AUTHORS_TABLE, ('name',), ((name,) for name in author_set), ('name',), method)
+
+
+"""
+Desc: Rows of Candidate_Rec for the candidates of a topic search (see aggregateCandidates)
+Input: Dictionaries author -> set of venues and author -> number of papers, key words of the search, iteration
+Output: Generator of dictionaries column -> value (columns of CANDIDATE_COLUMNS, missing values are None)
+"""
+
+
+def candidateRows(author_venue_dict, author_count_dict, key_words, iteration):
+
+    expertise = ', '.join(key_words)
+    for author in sorted(author_count_dict, key=lambda author: -author_count_dict[author]):
+        yield {'NAME': author, 'EXPERTISE': expertise, 'ITERATION': iteration}
+
+
+"""
+Desc: Upsert candidates into Candidate_Rec, matched on NAME and ITERATION. This is not a unique key of the table, as the
+web app moves undecided candidates to the next iteration (see server.ts). The decision and selection of a candidate
+already stored are kept.
+Input: Iterable of dictionaries column -> value (e.g., candidateRows), load method
+Output: Number of candidates written
+"""
+
+
+def upsertCandidates(candidates, method=None):
+
+    columns = tuple(column for column in CANDIDATE_COLUMNS if column != 'DECISION')
+
+    def row(candidate):
+        return tuple(json.dumps(candidate[column]) if column in CANDIDATE_JSON_COLUMNS and
+                     candidate.get(column) is not None else candidate.get(column) for column in columns)
+
+    return upsertRows(CANDIDATE_TABLE, columns, (row(candidate) for candidate in candidates), ('NAME', 'ITERATION'),
+                      method, unique_key=False)
+
+
+if __name__ == '__main__':
+    # python reviewerStore.py: load all DBLP authors of the dump (or index) into dblp_authors (see getDBLPAuthors)
+    import DBLP
+    from Metrics import configureLogging
+    configureLogging()
+    DBLP.getDBLPAuthors(load_database=True)
@@ -0,0 +1,113 @@
+"""
+Desc: Tests of the single-pass parser of DBLP person pages (parsePersonDBLP) through the functions built on it:
+coauthor profiles with the white list and the false positives, quality venues, disambiguation and paper records
+"""
+
+import pytest
+import DBLP
+
+
+PERSON = '<person key="homepages/s/Smith"><author>Ann Smith</author><author>Ann Smith 0001</author>' \
+         '<note type="affiliation">Uni A, Dept. B</note></person>'
+
+
+def paper(key, title, year, authors, url, venue='VLDB', tag='inproceedings'):
+    venue_tag = 'journal' if tag == 'article' else 'booktitle'
+    return '<r><%s key="%s" mdate="2020-01-01">%s<title>%s</title><year>%s</year><%s>%s</%s><url>%s</url></%s></r>' \
+        % (tag, key, ''.join('<author>%s</author>' % author for author in authors), title, year, venue_tag, venue,
+           venue_tag, url, tag)
+
+
+def page(*papers, person=PERSON):
+    return ('<?xml version="1.0"?><dblpperson name="Ann Smith" n="%d">%s%s</dblpperson>'
+            % (len(papers), person, ''.join(papers))).encode('utf-8')
+
+
+PAPERS = [
+    paper('conf/vldb/S19', 'Graph queries.', '2019', ['Ann Smith', 'Bob Jones', 'Zoë Ng'],
+          'db/conf/vldb/v19.html#S19'),
+    paper('conf/vldb/S20', 'Graph "indexes".', '2020', ['Ann Smith', 'Bob Jones'], 'db/conf/vldb/v20.html#S20'),
+    paper('journals/tods/S20', 'Stream joins.', '2020', ['Ann Smith', 'Carl Li'], 'db/journals/tods/t20.html#S20',
+          venue='TODS', tag='article'),
+]
+
+
+def test_no_record():
+    name, names, hist, freq, years, coauthors, affiliations = DBLP.parseAuthorDBLP(page(), {}, {}, 'u')
+    assert name == 'ann smith'
+    assert names == {'ann smith', 'ann smith 0001'}
+    assert hist == {} and freq == {} and years == set() and coauthors == set()
+    assert affiliations == {'uni a'}
+    assert DBLP.readRecordsDBLP(page())[2] == []
+
+
+def test_one_record():
+    name, names, hist, freq, years, coauthors, _ = DBLP.parseAuthorDBLP(page(PAPERS[0]), {}, {}, 'u')
+    assert hist == {'ann smith': [('2019', 1)], 'bob jones': [('2019', 1)], 'zoe ng': [('2019', 1)]}
+    assert freq == {'ann smith': 1, 'bob jones': 1, 'zoe ng': 1}
+    assert years == {'2019'}
+    assert coauthors == {'ann smith', 'bob jones', 'zoe ng'}  # names are lower case and unidecoded
+
+
+def test_many_records():
+    _, _, hist, freq, years, coauthors, _ = DBLP.parseAuthorDBLP(page(*PAPERS), {}, {}, 'u')
+    assert sorted(hist['bob jones']) == [('2019', 1), ('2020', 1)]
+    assert hist['ann smith'] == [('2019', 1), ('2020', 2)]
+    assert freq == {'ann smith': 3, 'bob jones': 2, 'zoe ng': 1, 'carl li': 1}
+    assert years == {'2019', '2020'}
+    assert coauthors == {'ann smith', 'bob jones', 'zoe ng', 'carl li'}
+
+
+def test_white_list_matches_normalized_titles():
+    # The white list is matched on normalized titles: periods and double quotes are ignored, case too
+    title_venue_dict = {'graph indexes': 'VLDB', 'STREAM JOINS': 'TODS'}
+    _, _, hist, freq, years, coauthors, _ = DBLP.parseAuthorDBLP(page(*PAPERS), title_venue_dict, {}, 'u')
+    assert freq == {'ann smith': 1, 'bob jones': 1, 'zoe ng': 1}
+    assert years == {'2019'}
+    assert 'carl li' not in coauthors
+
+
+def test_false_positives_of_the_author_only():
+    dblp_url_dict = {'u': {'db/journals/tods/t20.html#S20'}, 'other': {'db/conf/vldb/v19.html#S19'}}
+    _, _, hist, freq, _, coauthors, _ = DBLP.parseAuthorDBLP(page(*PAPERS), {}, dblp_url_dict, 'u')
+    assert 'carl li' not in coauthors
+    assert freq['bob jones'] == 2  # the false positives of other authors are not applied
+
+
+def test_cached_profile_matches_the_parse():
+    xml_file = page(*PAPERS)
+    parsed = DBLP.parseAuthorDBLP(xml_file, {'graph indexes': 'VLDB'}, {}, 'u')
+    for _ in range(2):  # miss, then hit of the profile cache
+        profile = DBLP.readAuthorDBLP(xml_file, {}, {'graph indexes': 'VLDB'}, {}, 'u')
+        assert profile[0] == parsed[0] and profile[1] == parsed[1] and profile[4:] == parsed[4:]
+        assert {k: sorted(v) for k, v in profile[2].items()} == {k: sorted(v) for k, v in parsed[2].items()}
+        assert profile[3] == parsed[3]
+
+
+@pytest.mark.parametrize('count, freq, years', [(0, {}, set()), (1, {'VLDB': 1}, {'2019'}),
+                                                 (3, {'VLDB': 2}, {'2019', '2020'})])
+def test_quality_venues(count, freq, years):
+    name, venue_hist, venue_freq, venue_years = DBLP.getQualityVenuePublications(page(*PAPERS[:count]), {'VLDB'})
+    assert venue_freq == freq
+    assert venue_years == years
+
+
+def test_disambiguation_page():
+    name, names, coauthors, affiliations, title_year, title_coauthor = DBLP.readDisambDBLP(page(*PAPERS))
+    assert affiliations == {'Uni A, Dept. B'}
+    assert title_year == {'graph queries': {'2019'}, 'graph indexes': {'2020'}, 'stream joins': {'2020'}}
+    assert title_coauthor['stream joins'] == {'ann smith', 'carl li'}
+    assert coauthors == {'ann smith', 'bob jones', 'zoe ng', 'carl li'}
+
+
+def test_records_in_page_order():
+    _, _, records, affiliations = DBLP.readRecordsDBLP(page(*PAPERS))
+    assert [record[4] for record in records] == ['conf/vldb/S19', 'conf/vldb/S20', 'journals/tods/S20']
+    assert records[1] == ('db/conf/vldb/v20.html#S20', 'Graph "indexes".', '2020',
+                          frozenset({'ann smith', 'bob jones'}), 'conf/vldb/S20', '2020-01-01')
+    assert affiliations == {'uni a'}
+
+
+def test_missing_person_element():
+    assert DBLP.parseAuthorDBLP(page(person=''), {}, {}, 'u') == ('ann smith', set(), dict(), dict(), set(), set(),
+                                                                  set())
@@ -0,0 +1,103 @@
+"""
+Desc: Tests of the pooled DBLP fetcher (DBLPFetcher.py) against a stub server (httpx.MockTransport): downloads, 304
+revalidation through the page cache, 429 backoff through the rate limiter, retries and the error path
+"""
+
+import asyncio
+import time
+import httpx
+import pytest
+from DBLPCache import DBLPCache
+from DBLPFetcher import DBLPFetcher
+from RateLimit import TokenBucket
+
+
+ADD = 'https://dblp.org/pid/00/1.xml'
+BODY = b'<dblpperson name="Ann Smith"/>'
+
+
+class StubServer:
+
+    def __init__(self, *responses):
+        self.responses = list(responses)  # answers in order; the last one is repeated
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        response = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def fetcher(server, cache=None, retries=2):
+    return DBLPFetcher(transport=httpx.MockTransport(server), cache=cache, retries=retries, backoff=0.01,
+                       limiter=TokenBucket(rate=1000, burst=1000))
+
+
+def run(fetcher_, coroutine):
+    async def main():
+        try:
+            return await coroutine
+        finally:
+            await fetcher_.aclose()
+
+    return asyncio.run(main())
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DBLPCache(str(tmp_path / 'cache'), ttl=0)  # every entry must be revalidated
+
+
+def test_download_is_stored_in_the_cache(cache):
+    server = StubServer(httpx.Response(200, content=BODY, headers={'ETag': '"v1"'}))
+    f = fetcher(server, cache)
+    assert run(f, f.fetch(ADD)) == BODY
+    assert len(server.requests) == 1 and 'If-None-Match' not in server.requests[0].headers
+    assert cache.misses == 1
+
+
+def test_not_modified_is_served_from_the_cache(cache):
+    server = StubServer(httpx.Response(200, content=BODY, headers={'ETag': '"v1"'}), httpx.Response(304))
+    f = fetcher(server, cache)
+
+    async def twice():
+        return await f.fetch(ADD), await f.fetch(ADD)
+
+    assert run(f, twice()) == (BODY, BODY)
+    assert server.requests[1].headers['If-None-Match'] == '"v1"'
+    assert cache.revalidations == 1 and cache.misses == 1
+
+
+def test_rate_limited_request_waits_for_retry_after():
+    server = StubServer(httpx.Response(429, headers={'Retry-After': '0.3'}), httpx.Response(200, content=BODY))
+    f = fetcher(server)
+    start = time.monotonic()
+    assert run(f, f.fetch(ADD)) == BODY
+    assert time.monotonic() - start >= 0.3
+    assert len(server.requests) == 2
+    assert f.limiter.rate_limited == 1 and f.limiter.stats()['rate_factor'] < 1.0  # the rate is reduced
+
+
+def test_transient_errors_are_retried():
+    server = StubServer(httpx.Response(503), httpx.ConnectError('reset'), httpx.Response(200, content=BODY))
+    f = fetcher(server)
+    assert run(f, f.fetch(ADD)) == BODY
+    assert len(server.requests) == 3
+
+
+def test_unreachable_page_returns_none():
+    server = StubServer(httpx.ConnectError('refused'))
+    f = fetcher(server, retries=1)
+    assert run(f, f.request(ADD)) is None
+    assert len(server.requests) == 2  # first attempt and one retry
+    f = fetcher(server, retries=0)
+    assert run(f, f.fetch(ADD)) == b''
+
+
+def test_missing_page_is_not_retried():
+    server = StubServer(httpx.Response(404))
+    f = fetcher(server)
+    assert run(f, f.fetch(ADD)) == b''
+    assert len(server.requests) == 1
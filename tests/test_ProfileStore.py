@@ -0,0 +1,90 @@
+"""
+Desc: Tests of the incremental profile store (ProfileStore.py): every merge must give the profile a full parse of the
+same page gives (see parseAuthorDBLP), whatever the versions of the page and the filters merged before
+"""
+
+import hashlib
+import pytest
+import DBLP
+from ProfileStore import ProfileStore, filterFingerprint
+
+
+URL = 'https://dblp.org/pid/00/1.xml'
+
+
+def paper(key, mdate, title, year, authors):
+    return '<r><inproceedings key="%s" mdate="%s">%s<title>%s</title><year>%s</year><booktitle>VLDB</booktitle>' \
+        '<url>db/%s</url></inproceedings></r>' % (key, mdate, ''.join('<author>%s</author>' % author
+                                                                     for author in authors), title, year, key)
+
+
+def page(*papers):
+    return ('<?xml version="1.0"?><dblpperson name="Ann Smith" n="%d"><person key="homepages/s/Smith">'
+            '<author>Ann Smith</author><note type="affiliation">Uni A</note></person>%s</dblpperson>'
+            % (len(papers), ''.join(papers))).encode('utf-8')
+
+
+A = paper('conf/vldb/A', '2019-01-01', 'Graph queries.', '2019', ['Ann Smith', 'Bob Jones'])
+B = paper('conf/vldb/B', '2019-01-01', 'Graph indexes.', '2020', ['Ann Smith', 'Bob Jones', 'Carl Li'])
+B2 = paper('conf/vldb/B', '2021-05-01', 'Graph indexes.', '2021', ['Ann Smith', 'Dan Wu'])  # modified
+C = paper('conf/vldb/C', '2019-01-01', 'Stream joins.', '2020', ['Ann Smith', 'Carl Li'])
+D = paper('conf/vldb/D', '2021-05-01', 'Stream windows.', '2021', ['Ann Smith', 'Eve Ko'])
+
+
+def normalized(profile):
+    # Histograms compared as sets of (year, count): their order is not part of the profile
+    name, names, hist, freq, years, coauthors, affiliations = profile
+    return name, names, {coauthor: sorted(h) for coauthor, h in hist.items()}, freq, years, coauthors, affiliations
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ProfileStore(str(tmp_path / 'profiles.sqlite'))
+
+
+def merge(store, xml_file, title_venue_dict=None, false_positives=()):
+    title_venue_dict = title_venue_dict or dict()
+    profile = store.merge(URL, hashlib.sha256(xml_file).hexdigest(), DBLP.readRecordsDBLP(xml_file),
+                          title_venue_dict, false_positives)
+    parsed = DBLP.parseAuthorDBLP(xml_file, title_venue_dict, {URL: set(false_positives)}, URL)
+    assert normalized(profile) == normalized(parsed)
+    assert store.state(URL) == (hashlib.sha256(xml_file).hexdigest(),
+                                filterFingerprint(title_venue_dict, false_positives))
+    return profile
+
+
+def test_first_merge_matches_the_parse(store):
+    profile = merge(store, page(A, B, C))
+    assert profile[3] == {'ann smith': 3, 'bob jones': 2, 'carl li': 2}
+    assert store.papers_added == 3 and store.papers_removed == 0
+
+
+def test_added_removed_and_modified_papers(store):
+    merge(store, page(A, B, C))
+    profile = merge(store, page(A, B2, D))  # C removed, B modified, D added
+    assert 'carl li' not in profile[5]
+    assert profile[2]['dan wu'] == [('2021', 1)]
+    assert store.papers_added == 3 + 2 and store.papers_removed == 2  # a modified paper is removed and added
+    assert normalized(store.profile(URL)) == normalized(profile)
+
+
+def test_filter_change_on_an_unchanged_page(store):
+    merge(store, page(A, B, C))
+    profile = merge(store, page(A, B, C), {'graph indexes': 'VLDB'}, {'db/conf/vldb/C'})
+    assert profile[3] == {'ann smith': 1, 'bob jones': 1}
+    assert store.papers_added == 3  # the papers are kept, only their counted flag changes
+    profile = merge(store, page(A, B, C), {'GRAPH QUERIES': 'VLDB'})
+    assert profile[3] == {'ann smith': 2, 'bob jones': 1, 'carl li': 2}
+
+
+def test_revert_to_an_earlier_page(store):
+    first = merge(store, page(A, B, C))
+    merge(store, page(A, B2, D), {'stream windows': 'VLDB'}, {'db/conf/vldb/A'})
+    reverted = merge(store, page(A, B, C))
+    assert normalized(reverted) == normalized(first)
+
+
+def test_empty_page(store):
+    merge(store, page(A, B))
+    profile = merge(store, page())
+    assert profile[2] == {} and profile[4] == set()
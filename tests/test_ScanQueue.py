@@ -0,0 +1,57 @@
+"""
+Desc: Tests of the scan job queue (ScanQueue.py) with a slow job kind run in the worker processes
+"""
+
+import os
+import time
+import pytest
+import ScanQueue
+
+
+def _sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def wait(queue, job_id, status, timeout=10):
+    deadline = time.time() + timeout
+    while queue.get(job_id)['status'] != status and time.time() < deadline:
+        time.sleep(0.05)
+    return queue.get(job_id)
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    monkeypatch.setitem(ScanQueue.SCAN_KINDS, 'sleep', _sleep)  # inherited by the forked workers
+    scan_queue = ScanQueue.ScanQueue(str(tmp_path / 'scans.sqlite'), str(tmp_path / 'results'), workers=1)
+    yield scan_queue
+    scan_queue.shutdown()
+
+
+def test_identical_jobs_share_one_run(queue):
+    first = queue.submit('sleep', {'seconds': 0.1})
+    assert queue.submit('sleep', {'seconds': 0.1})['id'] == first['id']
+    assert wait(queue, first['id'], 'done')['status'] == 'done'
+    assert queue.resultPath(first['id']) is not None
+
+
+def test_cancelled_running_job_keeps_its_worker(queue):
+    running = queue.submit('sleep', {'seconds': 1.0})
+    wait(queue, running['id'], 'running')
+    queued = queue.submit('sleep', {'seconds': 0.1})
+    assert queue.cancel(running['id'])['status'] == 'cancelled'
+    assert queue.get(queued['id'])['status'] == 'queued'  # the abandoned worker is still busy
+
+    assert wait(queue, queued['id'], 'done')['status'] == 'done'
+    cancelled = queue.get(running['id'])
+    assert cancelled['status'] == 'cancelled'  # the late result is not recorded
+    assert queue.get(queued['id'])['started'] >= cancelled['finished']
+    assert queue.resultPath(running['id']) is None and not os.path.exists(cancelled['result_path'])
+
+
+def test_cancelled_queued_job_is_dropped(queue):
+    running = queue.submit('sleep', {'seconds': 0.5})
+    queued = queue.submit('sleep', {'seconds': 0.1})
+    assert queue.cancel(queued['id'])['status'] == 'cancelled'
+    assert wait(queue, running['id'], 'done')['status'] == 'done'
+    assert queue.get(queued['id'])['started'] is None
@@ -0,0 +1,64 @@
+"""
+Desc: Tests of the title matching (TitleMatcher.py): normalized titles, the white-list title set and the
+Aho-Corasick keyword matcher, checked against a naive substring search
+"""
+
+import pytest
+from TitleMatcher import KeywordMatcher, TitleSet, normalizeTitle
+
+
+def naive(keywords, title):
+    return {keyword for keyword in keywords if normalizeTitle(keyword) and normalizeTitle(keyword) in
+            normalizeTitle(title)}
+
+
+def test_normalized_title():
+    assert normalizeTitle('On "Graph" Queries.') == 'on graph queries'
+    assert normalizeTitle(None) == '' and normalizeTitle('') == ''
+
+
+def test_title_set():
+    titles = TitleSet(['Graph Queries.', 'graph queries', 'Stream "Joins"'])
+    assert len(titles) == 2  # same normalized form
+    assert 'GRAPH QUERIES' in titles and 'stream joins.' in titles and 'graph' not in titles
+    assert titles.original('graph queries.') == 'Graph Queries.'
+    assert titles.original('missing') is None
+
+
+def test_single_word_keys():
+    matcher = KeywordMatcher(['graph', 'Stream', 'graph'])
+    assert len(matcher) == 2  # duplicates are dropped
+    assert matcher.matches('Graph Neural Networks.') == {'graph'}
+    assert matcher.matches('Data STREAMS') == {'Stream'}  # reported as given
+    assert matcher.matches('Relational algebra') == set()
+    assert matcher.matches(None) == set()
+
+
+def test_overlapping_keywords():
+    keywords = ['graph', 'graph neural', 'neural network', 'network', 'work', 'he', 'she', 'hers']
+    matcher = KeywordMatcher(keywords)
+    assert matcher.matches('Graph neural networks') == {'graph', 'graph neural', 'neural network', 'network', 'work'}
+    assert matcher.matches('ushers') == {'he', 'she', 'hers'}  # keywords ending inside another one
+    assert matcher.matches('aaaa') == set()
+
+
+def test_keywords_match_inside_words():
+    # As the substring search the matcher replaces, keywords are not bound to word boundaries
+    matcher = KeywordMatcher(['learn', 'data base', 'e.g.'])
+    assert matcher.matches('Learning to rank') == {'learn'}
+    assert matcher.matches('Big data bases') == {'data base'}
+    assert matcher.matches('Database design') == set()  # the space is part of the keyword
+    assert matcher.matches('Indexes, eg for graphs') == {'e.g.'}  # periods are dropped on both sides
+
+
+def test_empty_keywords_are_ignored():
+    matcher = KeywordMatcher(['', '..', None, 'x'])
+    assert matcher.keywords == ['x']
+    assert matcher.matches('xyz') == {'x'}
+
+
+@pytest.mark.parametrize('title', ['Graph neural networks for data streams.', 'Networking "he said"', 'abababab',
+                                   'A survey of stream processing systems', ''])
+def test_same_result_as_a_substring_search(title):
+    keywords = ['graph', 'stream', 'network', 'work', 'he', 'aba', 'bab', 'ab', 'survey of', 'systems.', 'e s']
+    assert KeywordMatcher(keywords).matches(title) == naive(keywords, title)
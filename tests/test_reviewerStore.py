@@ -0,0 +1,119 @@
+"""
+Desc: Tests of the MySQL loader (reviewerStore.py) against a stub connection pool recording the statements, and of
+the opt-in loading of getDBLPAuthors
+"""
+
+import pytest
+import reviewerStore
+import DBLP
+
+
+class StubCursor:
+
+    def __init__(self, log, fail_on=None):
+        self.log = log
+        self.fail_on = fail_on
+
+    def execute(self, statement, params=None):
+        if self.fail_on is not None and self.fail_on in statement:
+            raise RuntimeError('stub failure')
+        self.log.append(('execute', statement, params))
+
+    def executemany(self, statement, rows):
+        self.log.append(('executemany', statement, list(rows)))
+
+    def close(self):
+        pass
+
+
+class StubConnection:
+
+    def __init__(self, log, fail_on=None):
+        self.log = log
+        self.fail_on = fail_on
+
+    def cursor(self):
+        return StubCursor(self.log, self.fail_on)
+
+    def commit(self):
+        self.log.append(('commit',))
+
+    def rollback(self):
+        self.log.append(('rollback',))
+
+    def close(self):
+        pass
+
+
+class StubPool:
+
+    def __init__(self, fail_on=None):
+        self.log = []
+        self.fail_on = fail_on
+
+    def get_connection(self):
+        return StubConnection(self.log, self.fail_on)
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    stub = StubPool()
+    monkeypatch.setattr(reviewerStore, '_pool', stub)
+    return stub
+
+
+def test_candidates_are_merged_on_name_and_iteration(pool, monkeypatch):
+    candidates = reviewerStore.candidateRows({'a': {'VLDB'}, 'b': {'ICDE'}, 'c': {'VLDB'}}, {'a': 3, 'b': 1, 'c': 2},
+                                             ['graph'], 2)
+    monkeypatch.setattr(reviewerStore, 'LOAD_BATCH_SIZE', 2)
+    written = reviewerStore.upsertCandidates(candidates, method='executemany')
+
+    assert written == 3
+    assert [entry[0] for entry in pool.log].count('commit') == 2  # one transaction per chunk
+    staged = [entry[2] for entry in pool.log if entry[0] == 'executemany']
+    assert [[row[0] for row in rows] for rows in staged] == [['a', 'c'], ['b']]  # most papers first
+    statements = [entry[1] for entry in pool.log if entry[0] == 'execute']
+    assert not any('ON DUPLICATE KEY' in statement for statement in statements)
+    updates = [statement for statement in statements if statement.startswith('UPDATE Candidate_Rec t JOIN')]
+    assert len(updates) == 2
+    assert 't.NAME = s.NAME AND t.ITERATION = s.ITERATION' in updates[0]
+    assert 't.EXPERTISE = COALESCE(s.EXPERTISE, t.EXPERTISE)' in updates[0]
+    assert 'DECISION' not in updates[0]  # the decision of a stored candidate is kept
+    inserts = [statement for statement in statements if statement.startswith('INSERT INTO Candidate_Rec')]
+    assert len(inserts) == 2 and 'LEFT JOIN Candidate_Rec t' in inserts[0] and 'WHERE t.NAME IS NULL' in inserts[0]
+
+
+def test_failed_chunk_is_rolled_back(monkeypatch):
+    stub = StubPool(fail_on='UPDATE Candidate_Rec')
+    monkeypatch.setattr(reviewerStore, '_pool', stub)
+    with pytest.raises(RuntimeError):
+        reviewerStore.upsertCandidates([{'NAME': 'a', 'ITERATION': 1}], method='executemany')
+    assert ('rollback',) in stub.log and ('commit',) not in stub.log
+
+
+def test_authors_are_upserted_on_their_unique_name(pool):
+    assert reviewerStore.insertDBLPAuthors(['x', 'y'], method='executemany') == 2
+    statement, rows = [entry[1:] for entry in pool.log if entry[0] == 'executemany'][0]
+    assert statement.startswith('INSERT INTO dblp_authors (name) VALUES (%s) ON DUPLICATE KEY UPDATE name = name')
+    assert rows == [('x',), ('y',)]
+
+
+def test_getDBLPAuthors_writes_only_when_asked(monkeypatch):
+    inserted = []
+    monkeypatch.setattr(DBLP, 'indexAvailable', lambda **kwargs: True)
+    monkeypatch.setattr(DBLP, 'indexedDBLPAuthors', lambda: {'x', 'y'})
+    monkeypatch.setattr(DBLP.SancusDB, 'insertDBLPAuthors', lambda author_set: inserted.append(set(author_set)))
+    monkeypatch.setenv('DB_NAME', 'fyp-pc')
+
+    assert DBLP.getDBLPAuthors() == {'x', 'y'}
+    assert inserted == []
+    DBLP.getDBLPAuthors(load_database=True)
+    assert inserted == [{'x', 'y'}]
+
+
+def test_pool_requires_a_configured_database(monkeypatch):
+    monkeypatch.setattr(reviewerStore, '_pool', None)
+    monkeypatch.setattr(reviewerStore, 'load_dotenv', lambda: None)
+    monkeypatch.delenv('DB_NAME', raising=False)
+    with pytest.raises(ValueError):
+        reviewerStore.getPool()